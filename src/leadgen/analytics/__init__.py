@@ -0,0 +1 @@
+"""Channel analytics: collect stats from every channel into a local store."""
@@ -0,0 +1,215 @@
+"""Poll each channel and write what changed into the analytics store.
+
+Every source keeps a cursor in the store so a poll only asks for new data:
+
+* Dev.to: the article list is fetched with ``If-None-Match``; an unchanged
+  page costs one 304 and no writes.
+* Hashnode: per-post views and reactions are cumulative, so every page is
+  read but only totals that moved are written.
+* Postiz: per-channel daily analytics from the last polled day onwards.
+* ConvertKit: subscribers updated since the last poll day; each subscriber
+  counts once as a lead on the day it was created, attributed to the post in
+  its ``source`` field (set by ``serve-leads`` from the form's ``source``).
+"""
+
+import asyncio
+import re
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from leadgen.analytics.store import AnalyticsStore
+from leadgen.config import Config
+from leadgen.http import session
+from leadgen.publishers.devto import DEVTO_API
+from leadgen.publishers.hashnode import HASHNODE_API
+from leadgen.publishers.hugo import HugoPublisher
+
+
+DEVTO_PAGE_SIZE = 1000
+MAX_POSTIZ_DAYS = 90
+
+_POST_PATH = re.compile(r"/posts/([^/?#]+)")
+
+HASHNODE_STATS = """
+query Stats($id: ObjectId!, $after: String) {
+    publication(id: $id) {
+        posts(first: 50, after: $after) {
+            edges { node { id slug views reactionCount responseCount } }
+            pageInfo { hasNextPage endCursor }
+        }
+    }
+}
+"""
+
+
+def slug_from(value: str, known: set[str]) -> str:
+    """The post a URL or bare slug refers to, or ``''``."""
+    value = (value or "").strip()
+    match = _POST_PATH.search(value)
+    slug = match.group(1) if match else value.strip("/")
+    return slug if slug in known else ""
+
+
+class AnalyticsCollector:
+    """Poll every configured channel into an :class:`AnalyticsStore`."""
+
+    def __init__(self, store: AnalyticsStore, config: Config, today: date | None = None):
+        self.store = store
+        self.config = config
+        self.today = today or datetime.now(timezone.utc).date()
+        self.slugs: set[str] = set()
+        self.remote_slugs: dict[str, dict[str, str]] = {}
+
+    def sources(self) -> dict:
+        config = self.config
+        sources = {}
+        if config.devto_api_key:
+            sources["devto"] = self.collect_devto
+        if config.hashnode_api_token and config.hashnode_publication_id:
+            sources["hashnode"] = self.collect_hashnode
+        if config.postiz_api_key:
+            sources["postiz"] = self.collect_postiz
+        if config.convertkit_api_secret:
+            sources["convertkit"] = self.collect_convertkit
+        return sources
+
+    def load_posts(self) -> None:
+        """Register live Hugo posts (with niches) and cross-post IDs for attribution."""
+        hugo = HugoPublisher(self.config.hugo_blog_dir)
+        posts = {slug: hugo.load(slug) for slug in hugo.slugs()}
+        niches = {slug: post.get("niche", "") for slug, post in posts.items() if not post.get("draft")}
+        self.store.set_posts(niches)
+        self.slugs = set(niches)
+
+        crosspost_db = Path(self.config.data_dir) / "crosspost.db"
+        if crosspost_db.exists():
+            from leadgen.publishers.sync import SyncStore
+
+            with SyncStore(crosspost_db) as sync:
+                for platform in ("devto", "hashnode"):
+                    self.remote_slugs[platform] = {
+                        record.remote_id: slug for slug, record in sync.records(platform).items()
+                    }
+
+    def _slug(self, platform: str, remote_id, *urls: str) -> str:
+        for url in urls:
+            slug = slug_from(url, self.slugs)
+            if slug:
+                return slug
+        return self.remote_slugs.get(platform, {}).get(str(remote_id), "")
+
+    async def collect(self, only: list[str] | None = None) -> dict:
+        """Run every source concurrently; returns ``{source: rows or error}``."""
+        self.load_posts()
+        sources = {k: v for k, v in self.sources().items() if not only or k in only}
+        results = await asyncio.gather(*(f() for f in sources.values()), return_exceptions=True)
+        return {
+            name: f"{type(r).__name__}: {r}" if isinstance(r, Exception) else r
+            for name, r in zip(sources, results)
+        }
+
+    async def collect_devto(self) -> int:
+        rows, page, etags = [], 1, {}
+        async with session() as client:
+            while True:
+                key = f"devto:page:{page}"
+                etag, _, count = self.store.cursor(key).rpartition("|")
+                headers = {"api-key": self.config.devto_api_key}
+                if etag:
+                    headers["If-None-Match"] = etag
+                resp = await client.get(
+                    f"{DEVTO_API}/me/all",
+                    params={"page": page, "per_page": DEVTO_PAGE_SIZE},
+                    headers=headers,
+                )
+                if resp.status_code == 304:
+                    size = int(count or 0)
+                else:
+                    resp.raise_for_status()
+                    articles = resp.json()
+                    size = len(articles)
+                    for a in articles:
+                        slug = self._slug("devto", a["id"], a.get("canonical_url") or "")
+                        if not slug:
+                            continue
+                        rows += [
+                            (slug, "views", a.get("page_views_count") or 0),
+                            (slug, "reactions", a.get("public_reactions_count") or 0),
+                            (slug, "comments", a.get("comments_count") or 0),
+                        ]
+                    etags[key] = f"{resp.headers.get('etag', '')}|{size}"
+                if size < DEVTO_PAGE_SIZE:
+                    break
+                page += 1
+        # ETags are saved with the rows: a page whose stats were never stored
+        # must not be answered with a 304 next time.
+        return self.store.observe_totals(self.today.isoformat(), "devto", rows, cursors=etags)
+
+    async def collect_hashnode(self) -> int:
+        rows, after = [], None
+        async with session() as client:
+            while True:
+                resp = await client.post(
+                    HASHNODE_API,
+                    json={
+                        "query": HASHNODE_STATS,
+                        "variables": {"id": self.config.hashnode_publication_id, "after": after},
+                    },
+                    headers={"Authorization": self.config.hashnode_api_token},
+                )
+                resp.raise_for_status()
+                page = resp.json()["data"]["publication"]["posts"]
+                for edge in page["edges"]:
+                    node = edge["node"]
+                    slug = self._slug("hashnode", node["id"], node.get("slug") or "")
+                    if slug:
+                        rows += [
+                            (slug, "views", node.get("views") or 0),
+                            (slug, "reactions", node.get("reactionCount") or 0),
+                            (slug, "comments", node.get("responseCount") or 0),
+                        ]
+                if not page["pageInfo"]["hasNextPage"]:
+                    break
+                after = page["pageInfo"]["endCursor"]
+        return self.store.observe_totals(self.today.isoformat(), "hashnode", rows)
+
+    async def collect_postiz(self) -> int:
+        from leadgen.distributors.postiz import PostizDistributor
+
+        last = self.store.cursor("postiz:last_day")
+        # Re-read the last polled day too: it was still filling in.
+        days = (self.today - date.fromisoformat(last)).days + 1 if last else MAX_POSTIZ_DAYS
+        days = max(1, min(days, MAX_POSTIZ_DAYS))
+        postiz = PostizDistributor(self.config.postiz_api_key, self.config.postiz_base_url)
+        written = 0
+        for integration in await postiz.get_integrations():
+            series = await postiz.get_analytics(integration["id"], days)
+            rows = [
+                (point["date"][:10], "", _metric_name(s["label"]), int(float(point["total"] or 0)))
+                for s in series
+                for point in s.get("data", [])
+            ]
+            written += self.store.set_daily(f"postiz:{integration['providerIdentifier']}", rows)
+        self.store.set_cursor("postiz:last_day", self.today.isoformat())
+        return written
+
+    async def collect_convertkit(self) -> int:
+        from leadgen.email.convertkit import ConvertKitClient
+
+        client = ConvertKitClient(self.config.convertkit_api_key, self.config.convertkit_api_secret)
+        last = self.store.cursor("convertkit:updated_from")
+        events = []
+        async for subscriber in client.iter_subscribers(
+            updated_from=date.fromisoformat(last) if last else None
+        ):
+            source = (subscriber.get("fields") or {}).get("source") or ""
+            events.append(
+                (subscriber["id"], subscriber["created_at"][:10], slug_from(source, self.slugs))
+            )
+        added = self.store.add_events("convertkit", "leads", events)
+        self.store.set_cursor("convertkit:updated_from", self.today.isoformat())
+        return added
+
+
+def _metric_name(label: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", label.lower()).strip("_")
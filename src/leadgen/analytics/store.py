@@ -0,0 +1,322 @@
+"""SQLite store for channel metrics with pre-aggregated daily rollups.
+
+Everything lands in ``daily`` as one row per (day, post, channel, metric),
+stored ``WITHOUT ROWID`` so rows are clustered by day and a date-range scan
+reads contiguous pages. ``daily_niche`` holds the same values summed per
+niche (channel-wide figures not tied to a post use niche ``''``); every write refreshes it for the days it touched, in the same
+transaction, so report queries never scan per-post rows.
+
+Sources report three shapes of data, each with its own write method:
+
+* cumulative per-post totals (Dev.to views, Hashnode views):
+  :meth:`AnalyticsStore.observe_totals` keeps the last total seen and books
+  the increase against the day it was observed;
+* per-day values (Postiz analytics): :meth:`AnalyticsStore.set_daily`;
+* individual events (new subscribers): :meth:`AnalyticsStore.add_events`
+  counts each event ID once, however often it is re-fetched.
+
+Social posts carry an A/B variant; :meth:`AnalyticsStore.set_variants` notes
+which variant went out on which channel and day, and
+:meth:`AnalyticsStore.variant_totals` credits that channel-day's metrics to it.
+"""
+
+import sqlite3
+from collections.abc import Iterable
+from datetime import date, timedelta
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    slug TEXT PRIMARY KEY,
+    niche TEXT NOT NULL DEFAULT ''
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (day, slug, channel, metric)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS daily_slug ON daily (slug, metric, day);
+CREATE TABLE IF NOT EXISTS daily_niche (
+    day TEXT NOT NULL,
+    niche TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (day, metric, niche, channel)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS totals (
+    slug TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (slug, channel, metric)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    channel TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    PRIMARY KEY (channel, event_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS variants (
+    channel TEXT NOT NULL,
+    day TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    PRIMARY KEY (channel, day, slug)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cursors (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+UNKNOWN_NICHE = "unknown"
+
+
+class AnalyticsStore:
+    """Daily metrics per post and channel, rolled up per niche."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "AnalyticsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # -- cursors -----------------------------------------------------------
+
+    def cursor(self, key: str, default: str = "") -> str:
+        row = self.conn.execute("SELECT value FROM cursors WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_cursor(self, key: str, value: str) -> None:
+        with self.conn:
+            self._set_cursor(key, value)
+
+    def _set_cursor(self, key: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT INTO cursors (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    # -- writes ------------------------------------------------------------
+
+    def set_posts(self, niches: dict[str, str]) -> None:
+        """Register posts and their niches; re-rolls everything if a niche moved."""
+        before = dict(self.conn.execute("SELECT slug, niche FROM posts"))
+        changed = any(before.get(slug) not in (None, niche) for slug, niche in niches.items())
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO posts (slug, niche) VALUES (?, ?) "
+                "ON CONFLICT (slug) DO UPDATE SET niche = excluded.niche",
+                niches.items(),
+            )
+            if changed or any(slug not in before for slug in niches):
+                self._refresh(
+                    day for (day,) in self.conn.execute("SELECT DISTINCT day FROM daily")
+                )
+
+    def _add(self, day: str, slug: str, channel: str, metric: str, delta: int) -> None:
+        self.conn.execute(
+            "INSERT INTO daily (day, slug, channel, metric, value) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (day, slug, channel, metric) DO UPDATE SET value = value + excluded.value",
+            (day, slug, channel, metric, delta),
+        )
+
+    def observe_totals(
+        self,
+        day: str,
+        channel: str,
+        rows: Iterable[tuple[str, str, int]],
+        cursors: dict[str, str] | None = None,
+    ) -> int:
+        """Record cumulative ``(slug, metric, total)`` readings; returns rows that moved.
+
+        ``cursors`` are saved in the same transaction, so a cursor never
+        points past readings that were not stored.
+        """
+        moved = 0
+        with self.conn:
+            for slug, metric, total in rows:
+                row = self.conn.execute(
+                    "SELECT value FROM totals WHERE slug = ? AND channel = ? AND metric = ?",
+                    (slug, channel, metric),
+                ).fetchone()
+                previous = row[0] if row else 0
+                if total == previous:
+                    continue
+                self.conn.execute(
+                    "INSERT INTO totals (slug, channel, metric, value) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (slug, channel, metric) DO UPDATE SET value = excluded.value",
+                    (slug, channel, metric, total),
+                )
+                # A platform recount can lower a total; never book negative days.
+                if total > previous:
+                    self._add(day, slug, channel, metric, total - previous)
+                moved += 1
+            if moved:
+                self._refresh([day])
+            for key, value in (cursors or {}).items():
+                self._set_cursor(key, value)
+        return moved
+
+    def set_daily(self, channel: str, rows: Iterable[tuple[str, str, str, int]]) -> int:
+        """Overwrite per-day ``(day, slug, metric, value)`` readings; returns days written."""
+        days = set()
+        with self.conn:
+            for day, slug, metric, value in rows:
+                self.conn.execute(
+                    "INSERT INTO daily (day, slug, channel, metric, value) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (day, slug, channel, metric) DO UPDATE SET value = excluded.value",
+                    (day, slug, channel, metric, value),
+                )
+                days.add(day)
+            self._refresh(days)
+        return len(days)
+
+    def add_events(self, channel: str, metric: str, events: Iterable[tuple[str, str, str]]) -> int:
+        """Count ``(event_id, day, slug)`` events not seen before; returns new ones."""
+        added, days = 0, set()
+        with self.conn:
+            for event_id, day, slug in events:
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO events (channel, event_id) VALUES (?, ?)",
+                    (channel, str(event_id)),
+                )
+                if cur.rowcount:
+                    self._add(day, slug, channel, metric, 1)
+                    added += 1
+                    days.add(day)
+            self._refresh(days)
+        return added
+
+    def set_variants(self, slug: str, rows: Iterable[tuple[str, str, str]]) -> None:
+        """Record ``(channel, day, variant)`` for social posts of ``slug``."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO variants (channel, day, slug, variant) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (channel, day, slug) DO UPDATE SET variant = excluded.variant",
+                ((channel, day, slug, variant) for channel, day, variant in rows),
+            )
+
+    def _refresh(self, days: Iterable[str]) -> None:
+        """Recompute ``daily_niche`` for ``days`` (call inside a transaction)."""
+        for day in set(days):
+            self.conn.execute("DELETE FROM daily_niche WHERE day = ?", (day,))
+            self.conn.execute(
+                """
+                INSERT INTO daily_niche (day, niche, channel, metric, value)
+                SELECT d.day,
+                       CASE WHEN d.slug = '' THEN '' ELSE COALESCE(NULLIF(p.niche, ''), ?) END,
+                       d.channel, d.metric, SUM(d.value)
+                FROM daily d LEFT JOIN posts p ON p.slug = d.slug
+                WHERE d.day = ?
+                GROUP BY 1, 2, 3, 4
+                """,
+                (UNKNOWN_NICHE, day),
+            )
+
+    # -- queries -----------------------------------------------------------
+
+    @staticmethod
+    def since(days: int, today: date | None = None) -> str:
+        return ((today or date.today()) - timedelta(days=days - 1)).isoformat()
+
+    def top_niches(
+        self, metric: str = "leads", days: int = 90, limit: int = 10, today: date | None = None
+    ) -> list[dict]:
+        """Niches ranked by ``metric`` per post over the last ``days``."""
+        rows = self.conn.execute(
+            """
+            WITH counts AS (
+                SELECT COALESCE(NULLIF(niche, ''), ?) AS niche, COUNT(*) AS posts
+                FROM posts GROUP BY 1
+            )
+            SELECT r.niche, SUM(r.value) AS total, COALESCE(c.posts, 0) AS posts
+            FROM daily_niche r LEFT JOIN counts c ON c.niche = r.niche
+            WHERE r.metric = ? AND r.day >= ? AND r.niche != ''
+            GROUP BY r.niche
+            ORDER BY CAST(SUM(r.value) AS REAL) / MAX(COALESCE(c.posts, 0), 1) DESC, total DESC
+            LIMIT ?
+            """,
+            (UNKNOWN_NICHE, metric, self.since(days, today), limit),
+        ).fetchall()
+        return [
+            {"niche": niche, metric: total, "posts": posts, "per_post": total / max(posts, 1)}
+            for niche, total, posts in rows
+        ]
+
+    def top_posts(
+        self,
+        metric: str = "views",
+        days: int = 90,
+        channel: str | None = None,
+        limit: int = 10,
+        today: date | None = None,
+    ) -> list[dict]:
+        query = "SELECT slug, SUM(value) FROM daily WHERE metric = ? AND day >= ? AND slug != ''"
+        params: tuple = (metric, self.since(days, today))
+        if channel is not None:
+            query += " AND channel = ?"
+            params += (channel,)
+        query += " GROUP BY slug ORDER BY 2 DESC LIMIT ?"
+        rows = self.conn.execute(query, params + (limit,)).fetchall()
+        return [{"slug": slug, metric: total} for slug, total in rows]
+
+    def post_totals(self, days: int = 90, today: date | None = None) -> dict[str, dict[str, int]]:
+        """``{slug: {metric: total}}`` over the last ``days``, all channels summed."""
+        totals: dict[str, dict[str, int]] = {}
+        for slug, metric, total in self.conn.execute(
+            "SELECT slug, metric, SUM(value) FROM daily WHERE day >= ? AND slug != '' GROUP BY 1, 2",
+            (self.since(days, today),),
+        ):
+            totals.setdefault(slug, {})[metric] = total
+        return totals
+
+    def variant_totals(
+        self, metric: str = "impressions", days: int = 90, slug: str | None = None,
+        today: date | None = None,
+    ) -> list[dict]:
+        """Per (post, variant): ``metric`` summed over the channel-days it ran.
+
+        Channel metrics are not per post, so a day on which several posts
+        went out on one channel is credited to each of them.
+        """
+        query = """
+            SELECT v.slug, v.variant, COUNT(DISTINCT v.channel || v.day), COALESCE(SUM(d.value), 0)
+            FROM variants v
+            LEFT JOIN daily d
+              ON d.channel = v.channel AND d.day = v.day AND d.slug = '' AND d.metric = ?
+            WHERE v.day >= ?
+        """
+        params: tuple = (metric, self.since(days, today))
+        if slug is not None:
+            query += " AND v.slug = ?"
+            params += (slug,)
+        query += " GROUP BY 1, 2 ORDER BY 1, 4 DESC"
+        return [
+            {"slug": s, "variant": v, "slots": slots, metric: total, "per_slot": total / slots}
+            for s, v, slots, total in self.conn.execute(query, params)
+        ]
+
+    def channel_totals(self, days: int = 90, today: date | None = None) -> dict[str, dict[str, int]]:
+        """``{channel: {metric: total}}`` over the last ``days``."""
+        totals: dict[str, dict[str, int]] = {}
+        for channel, metric, total in self.conn.execute(
+            "SELECT channel, metric, SUM(value) FROM daily_niche WHERE day >= ? GROUP BY 1, 2",
+            (self.since(days, today),),
+        ):
+            totals.setdefault(channel, {})[metric] = total
+        return totals
@@ -0,0 +1 @@
+"""Offline benchmark: the real pipeline against local service stand-ins."""
@@ -0,0 +1,210 @@
+"""Record and replay HTTP exchanges at the httpx transport level.
+
+Unlike method-level ``AsyncMock`` patches, a replayed exchange still goes
+through the wrappers' real request building, ``httpx`` encoding, response
+parsing and (for DataForSEO) the streaming JSON parser, so timings measured
+under replay include that work. A cassette is JSON lines: a header, then
+one exchange per line. Credentials are redacted before anything is written.
+
+Use :func:`recording` or :func:`replaying`; both install their client with
+:func:`leadgen.http.use_client`, so every API wrapper picks it up.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from collections import Counter, defaultdict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+from leadgen.http import TIMEOUT, use_client
+
+
+CASSETTE_VERSION = 1
+REDACTED = "<redacted>"
+SECRET_HEADERS = {"authorization", "api-key", "cookie"}
+SECRET_FIELDS = {"api_key", "api_secret", "password", "login"}
+# Replayed bodies are fed back in chunks so streaming parsers see real chunking.
+CHUNK_SIZE = 16 * 1024
+
+
+class CassetteMiss(LookupError):
+    """A replayed request has no (remaining) recorded exchange."""
+
+
+def _redact_url(url: httpx.URL) -> str:
+    query = [
+        (k, REDACTED if k in SECRET_FIELDS else v)
+        for k, v in parse_qsl(url.query.decode(), keep_blank_values=True)
+    ]
+    base = str(url.copy_with(query=None))
+    return f"{base}?{urlencode(query)}" if query else base
+
+
+def _redact_json(data):
+    if isinstance(data, dict):
+        return {
+            k: REDACTED if k in SECRET_FIELDS else _redact_json(v) for k, v in data.items()
+        }
+    if isinstance(data, list):
+        return [_redact_json(v) for v in data]
+    return data
+
+
+def _redact_body(body: bytes) -> bytes:
+    try:
+        return json.dumps(_redact_json(json.loads(body)), sort_keys=True).encode()
+    except (ValueError, UnicodeDecodeError):
+        return body
+
+
+def _encode(body: bytes) -> dict:
+    try:
+        return {"text": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(body).decode()}
+
+
+def _decode(data: dict) -> bytes:
+    if "base64" in data:
+        return base64.b64decode(data["base64"])
+    return data.get("text", "").encode("utf-8")
+
+
+def request_key(method: str, url: str, body: bytes, match_body: bool = True) -> str:
+    key = f"{method} {url}"
+    if match_body and body:
+        key += " " + hashlib.sha256(body).hexdigest()[:16]
+    return key
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forward to ``inner`` and append every exchange to a cassette file."""
+
+    def __init__(self, path: str | Path, inner: httpx.AsyncBaseTransport | None = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        self._file = self.path.open("w")
+        self._file.write(json.dumps({"cassette": CASSETTE_VERSION}) + "\n")
+        self._start = time.perf_counter()
+        self.recorded = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        method, url = request.method, _redact_url(request.url)
+        body = _redact_body(await request.aread())
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()
+        elapsed = time.perf_counter() - started
+        await response.aclose()
+
+        self._file.write(json.dumps({
+            "at": round(started - self._start, 6),
+            "elapsed": round(elapsed, 6),
+            "request": {"method": method, "url": url, "body": _encode(body)},
+            "response": {
+                "status": response.status_code,
+                "headers": [
+                    [k, v] for k, v in response.headers.multi_items()
+                    if k.lower() not in ("content-length", "content-encoding", "transfer-encoding")
+                ],
+                "body": _encode(content),
+            },
+        }) + "\n")
+        self.recorded += 1
+        return httpx.Response(
+            response.status_code,
+            headers=[(k, v) for k, v in response.headers.multi_items()
+                     if k.lower() not in ("content-encoding", "transfer-encoding")],
+            content=content,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        self._file.close()
+        await self.inner.aclose()
+
+
+class _ChunkedStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for i in range(0, len(self.body), CHUNK_SIZE):
+            yield self.body[i:i + CHUNK_SIZE]
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Answer requests from a cassette instead of the network.
+
+    Requests are matched on method, redacted URL and (unless
+    ``match_body=False``) a hash of the redacted body. Identical requests
+    get their recorded responses in order. With ``realtime`` each response
+    is delayed by the time the original took, otherwise replay is as fast
+    as the code under test can go.
+    """
+
+    def __init__(self, path: str | Path, realtime: bool = False, match_body: bool = True):
+        self.realtime = realtime
+        self.match_body = match_body
+        self.played: Counter[str] = Counter()
+        self._exchanges: dict[str, deque] = defaultdict(deque)
+        with Path(path).open() as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("cassette") != CASSETTE_VERSION:
+                raise ValueError(f"{path}: not a version {CASSETTE_VERSION} cassette")
+            for line in f:
+                exchange = json.loads(line)
+                req = exchange["request"]
+                key = request_key(
+                    req["method"], req["url"], _decode(req["body"]), match_body
+                )
+                self._exchanges[key].append(exchange)
+
+    @property
+    def remaining(self) -> int:
+        return sum(len(q) for q in self._exchanges.values())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = _redact_url(request.url)
+        body = _redact_body(await request.aread())
+        key = request_key(request.method, url, body, self.match_body)
+        queue = self._exchanges.get(key)
+        if not queue:
+            raise CassetteMiss(f"No recorded response for {request.method} {url}")
+        exchange = queue.popleft()
+        self.played[request.url.host] += 1
+        if self.realtime:
+            await asyncio.sleep(exchange["elapsed"])
+        recorded = exchange["response"]
+        return httpx.Response(
+            recorded["status"],
+            headers=recorded["headers"],
+            stream=_ChunkedStream(_decode(recorded["body"])),
+            request=request,
+        )
+
+
+@asynccontextmanager
+async def recording(path: str | Path, inner: httpx.AsyncBaseTransport | None = None):
+    """Record every API call made inside the block to ``path``."""
+    transport = RecordingTransport(path, inner)
+    async with httpx.AsyncClient(transport=transport, timeout=TIMEOUT) as client:
+        with use_client(client):
+            yield transport
+
+
+@asynccontextmanager
+async def replaying(path: str | Path, realtime: bool = False, match_body: bool = True):
+    """Serve every API call made inside the block from ``path``."""
+    transport = ReplayTransport(path, realtime=realtime, match_body=match_body)
+    async with httpx.AsyncClient(transport=transport, timeout=TIMEOUT) as client:
+        with use_client(client):
+            yield transport
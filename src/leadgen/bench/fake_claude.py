@@ -0,0 +1,75 @@
+"""Stand-in for the ``claude`` CLI: emits schema-valid structured output.
+
+Accepts the same flags ``ContentGenerator`` passes (``--json-schema`` and a
+trailing prompt) and prints ``{"structured_output": ...}``. Latency and
+body length come from ``BENCH_CLAUDE_LATENCY_MS`` and
+``BENCH_CLAUDE_WORDS`` so a bench run can model a slow or verbose model.
+"""
+
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+
+WORDS = (
+    "ai agents automate bookings invoices follow-ups reviews customers staff "
+    "schedule costs hours missed calls revenue owners workflows chat phone"
+).split()
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _body(rng: random.Random, words: int) -> str:
+    sections = []
+    remaining = words
+    n = 1
+    while remaining > 0:
+        chunk = min(remaining, 120)
+        sections.append(
+            f"## Section {n}\n\n{_paragraph(rng, chunk)}\n\n"
+            f"- **Point {n}:** see [the guide](https://example.com/guide-{n})\n"
+            f"- Save `{n * 3}` hours a week\n"
+        )
+        remaining -= chunk
+        n += 1
+    return "\n".join(sections)
+
+
+def fake_output(schema: dict, words: int, rng: random.Random) -> dict:
+    post_id = uuid.uuid4().hex[:12]
+    output = {}
+    for name, spec in schema.get("properties", {}).items():
+        if spec.get("type") == "array" and spec.get("items", {}).get("type") == "object":
+            count = spec.get("minItems", 2)
+            output[name] = [fake_output(spec["items"], words, rng) for _ in range(count)]
+        elif spec.get("type") == "array":
+            output[name] = ["ai", "automation", "small-business"]
+        elif name == "slug":
+            output[name] = f"bench-{post_id}"
+        elif name == "body":
+            output[name] = _body(rng, words)
+        elif name == "title":
+            output[name] = f"Bench Post {post_id}"
+        else:
+            output[name] = _paragraph(rng, 30)
+    return output
+
+
+def main(argv: list[str]) -> int:
+    schema = json.loads(argv[argv.index("--json-schema") + 1])
+    prompt = argv[-1]
+    time.sleep(float(os.getenv("BENCH_CLAUDE_LATENCY_MS", "0")) / 1000)
+    words = int(os.getenv("BENCH_CLAUDE_WORDS", "1200"))
+    rng = random.Random(prompt)
+    json.dump({"structured_output": fake_output(schema, words, rng)}, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,247 @@
+"""Drive the pipeline at scale against stand-ins and report throughput.
+
+Each simulated post runs the same stages as production: keyword research,
+generation (fake ``claude`` + Hugo write), cross-posting to Dev.to and
+Hashnode, social distribution through Postiz, and a few ConvertKit
+subscribes. The report is plain JSON so runs can be diffed against a
+baseline with :func:`compare`.
+"""
+
+import asyncio
+import os
+import platform
+import resource
+import stat
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import httpx
+
+from leadgen.bench.cassette import RecordingTransport, ReplayTransport
+from leadgen.bench.standins import SERVICES, RedirectTransport, ServiceProfile, StandInServices
+from leadgen.distributors.postiz import PostizDistributor
+from leadgen.email.convertkit import ConvertKitClient
+from leadgen.http import use_client
+from leadgen.pipeline import LeadgenPipeline
+from leadgen.publishers.devto import DevtoPublisher
+from leadgen.publishers.hashnode import HashnodePublisher
+from leadgen.seo.keywords import KeywordResearcher
+from leadgen.tracing import percentile
+
+
+REPORT_VERSION = 1
+STAGES = ("keywords", "generate", "cross_post", "distribute", "subscribe")
+
+
+@dataclass
+class BenchParams:
+    posts: int = 20
+    concurrency: int = 4
+    llm_concurrency: int = 4
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    rate_limit: float = 0.0
+    claude_latency_ms: float = 200.0
+    claude_words: int = 1200
+    keywords_per_post: int = 100
+    leads_per_post: int = 3
+    seed: int = 0
+    services: dict[str, ServiceProfile] = field(default_factory=dict)
+
+    def profiles(self) -> dict[str, ServiceProfile]:
+        default = ServiceProfile(
+            self.latency_ms, self.jitter_ms, self.error_rate, self.rate_limit
+        )
+        names = ("devto", "hashnode", "postiz", "convertkit", "dataforseo")
+        return {name: self.services.get(name, default) for name in names}
+
+
+@contextmanager
+def fake_claude_on_path(latency_ms: float, words: int):
+    """Put a ``claude`` that runs :mod:`leadgen.bench.fake_claude` first on PATH."""
+    saved = {k: os.environ.get(k) for k in ("PATH", "BENCH_CLAUDE_LATENCY_MS", "BENCH_CLAUDE_WORDS")}
+    with tempfile.TemporaryDirectory(prefix="leadgen-bench-bin-") as bin_dir:
+        script = Path(bin_dir) / "claude"
+        script.write_text(f'#!/bin/sh\nexec "{sys.executable}" -m leadgen.bench.fake_claude "$@"\n')
+        script.chmod(script.stat().st_mode | stat.S_IXUSR)
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+        os.environ["BENCH_CLAUDE_LATENCY_MS"] = str(latency_ms)
+        os.environ["BENCH_CLAUDE_WORDS"] = str(words)
+        try:
+            yield script
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+class _Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def time(self, stage: str, coro):
+        start = time.perf_counter()
+        try:
+            return await coro
+        except Exception:
+            self.errors[stage] += 1
+            raise
+        finally:
+            self.latencies[stage].append((time.perf_counter() - start) * 1000)
+
+    def summary(self) -> dict:
+        return {
+            stage: {
+                "count": len(self.latencies[stage]),
+                "errors": self.errors[stage],
+                "mean_ms": round(sum(self.latencies[stage]) / max(1, len(self.latencies[stage])), 2),
+                "p50_ms": round(percentile(self.latencies[stage], 50), 2),
+                "p95_ms": round(percentile(self.latencies[stage], 95), 2),
+                "p99_ms": round(percentile(self.latencies[stage], 99), 2),
+            }
+            for stage in STAGES
+        }
+
+
+async def _run_post(n: int, pipeline: LeadgenPipeline, params: BenchParams, rec: _Recorder) -> None:
+    researcher = KeywordResearcher("bench", "bench")
+    convertkit = ConvertKitClient("bench", "bench")
+    publishers = {
+        "devto": DevtoPublisher(api_key="bench"),
+        "hashnode": HashnodePublisher(api_token="bench", publication_id="bench"),
+    }
+    distributor = PostizDistributor(api_key="bench")
+
+    async def keywords():
+        return [r async for r in researcher.iter_suggestions(
+            f"ai agents bench {n}", limit=params.keywords_per_post
+        )]
+
+    await rec.time("keywords", keywords())
+    result = await rec.time(
+        "generate", pipeline.generate_and_publish(niche="bench", topic=f"topic {n}")
+    )
+    post_data = pipeline.load_post(result["slug"])
+    await rec.time("cross_post", pipeline.cross_post(post_data, publishers))
+    await rec.time(
+        "distribute", pipeline.distribute(post_data, distributor, "2026-01-01T09:00:00.000Z")
+    )
+
+    async def subscribe():
+        for i in range(params.leads_per_post):
+            await convertkit.add_subscriber_to_form("bench", f"lead{n}-{i}@bench.test")
+
+    await rec.time("subscribe", subscribe())
+
+
+def _peak_rss_mb() -> dict[str, float]:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+async def run_bench(
+    params: BenchParams,
+    record: str | Path | None = None,
+    replay: str | Path | None = None,
+    realtime: bool = False,
+) -> dict:
+    """Run the benchmark and return the JSON-ready report.
+
+    ``record`` saves every stand-in exchange to a cassette; ``replay`` serves
+    the run from one instead of starting the stand-ins (``realtime`` keeps
+    the recorded response times). Generated slugs differ between runs, so
+    replay matches on method and URL only.
+    """
+    services = None
+    limits = httpx.Limits(max_connections=params.concurrency * 4)
+    if replay:
+        transport = ReplayTransport(replay, realtime=realtime, match_body=False)
+    else:
+        services = StandInServices(params.profiles(), seed=params.seed)
+        await services.start()
+        transport = RedirectTransport(services.port, limits=limits)
+        if record:
+            transport = RecordingTransport(record, transport)
+    rec = _Recorder()
+    failed = 0
+    try:
+        with tempfile.TemporaryDirectory(prefix="leadgen-bench-blog-") as blog_dir, \
+                fake_claude_on_path(params.claude_latency_ms, params.claude_words):
+            pipeline = LeadgenPipeline(
+                content_model="bench",
+                hugo_blog_dir=blog_dir,
+                site_url="https://bench.example",
+                llm_slots=asyncio.Semaphore(params.llm_concurrency),
+            )
+            async with httpx.AsyncClient(transport=transport, timeout=30) as client:
+                with use_client(client):
+                    queue: asyncio.Queue = asyncio.Queue()
+                    for n in range(params.posts):
+                        queue.put_nowait(n)
+
+                    async def worker():
+                        nonlocal failed
+                        while not queue.empty():
+                            n = queue.get_nowait()
+                            try:
+                                await _run_post(n, pipeline, params, rec)
+                            except Exception:
+                                failed += 1
+
+                    start = time.perf_counter()
+                    await asyncio.gather(*(worker() for _ in range(params.concurrency)))
+                    elapsed = time.perf_counter() - start
+    finally:
+        if services is not None:
+            await services.close()
+
+    if services is not None:
+        requests = dict(services.requests)
+    else:
+        requests = {SERVICES.get(host, host): n for host, n in transport.played.items()}
+    completed = params.posts - failed
+    return {
+        "version": REPORT_VERSION,
+        "mode": "replay" if replay else "standins",
+        "params": {k: v for k, v in asdict(params).items() if k != "services"},
+        "python": platform.python_version(),
+        "posts": params.posts,
+        "completed": completed,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "posts_per_min": round(completed / elapsed * 60, 2) if elapsed else 0.0,
+        "stages": rec.summary(),
+        "requests": requests,
+        "throttled": services.throttled if services else 0,
+        "injected_errors": services.errors if services else 0,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.10) -> list[str]:
+    """Regressions of ``report`` against ``baseline`` beyond ``tolerance``."""
+    regressions = []
+    base_rate, rate = baseline.get("posts_per_min", 0), report.get("posts_per_min", 0)
+    if base_rate and rate < base_rate * (1 - tolerance):
+        regressions.append(f"posts_per_min {base_rate} -> {rate}")
+    for stage, stats in report.get("stages", {}).items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base or not base.get("count"):
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if stats[key] > base[key] * (1 + tolerance) and stats[key] - base[key] > 1.0:
+                regressions.append(f"{stage} {key} {base[key]} -> {stats[key]}")
+    return regressions
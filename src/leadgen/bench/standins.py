@@ -0,0 +1,183 @@
+"""Local stand-ins for every external API the pipeline calls.
+
+One :class:`~leadgen.server.HttpServer` answers for Dev.to, Hashnode,
+Postiz, ConvertKit and DataForSEO. :class:`RedirectTransport` sends the
+wrappers' real absolute URLs to it, tagging each request with the host it
+was meant for, so nothing in the code under test needs a bench-only URL.
+"""
+
+import asyncio
+import itertools
+import random
+import time
+from dataclasses import dataclass
+
+import httpx
+
+from leadgen.server import HttpServer, Request, Response
+
+
+HOST_HEADER = "x-bench-host"
+
+SERVICES = {
+    "dev.to": "devto",
+    "gql.hashnode.com": "hashnode",
+    "api.postiz.com": "postiz",
+    "api.convertkit.com": "convertkit",
+    "api.dataforseo.com": "dataforseo",
+}
+
+POSTIZ_PLATFORMS = ("linkedin", "x", "facebook", "instagram", "threads")
+
+
+@dataclass
+class ServiceProfile:
+    """How a stand-in misbehaves: latency, random 5xx and a 429 rate limit."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    # Requests per second before answering 429 (0 = unlimited).
+    rate_limit: float = 0.0
+
+
+class _Bucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class StandInServices:
+    """Serve fake API responses with per-service latency and failures."""
+
+    def __init__(self, profiles: dict[str, ServiceProfile] | None = None, seed: int = 0):
+        self.profiles = profiles or {}
+        self.random = random.Random(seed)
+        self.requests: dict[str, int] = {name: 0 for name in SERVICES.values()}
+        self.throttled = 0
+        self.errors = 0
+        self._buckets = {
+            name: _Bucket(p.rate_limit) for name, p in self.profiles.items() if p.rate_limit
+        }
+        self._ids = itertools.count(1)
+        self.server = HttpServer(self.handle)
+
+    @property
+    def port(self) -> int:
+        return self.server.port
+
+    async def start(self) -> None:
+        await self.server.start()
+
+    async def close(self) -> None:
+        await self.server.close()
+
+    async def handle(self, request: Request) -> Response:
+        service = SERVICES.get(request.headers.get(HOST_HEADER, ""))
+        if service is None:
+            return Response.json({"error": "unknown host"}, status=404)
+        self.requests[service] += 1
+
+        profile = self.profiles.get(service, ServiceProfile())
+        bucket = self._buckets.get(service)
+        if bucket is not None and not bucket.take():
+            self.throttled += 1
+            return Response.json({"error": "rate limited"}, status=429, headers={"Retry-After": "1"})
+        delay = profile.latency_ms + self.random.uniform(0, profile.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if profile.error_rate and self.random.random() < profile.error_rate:
+            self.errors += 1
+            return Response.json({"error": "injected failure"}, status=503)
+
+        return getattr(self, f"_{service}")(request)
+
+    def _devto(self, request: Request) -> Response:
+        article_id = next(self._ids)
+        title = request.json()["article"]["title"]
+        slug = title.lower().replace(" ", "-")[:40]
+        return Response.json(
+            {"id": article_id, "url": f"https://dev.to/bench/{slug}-{article_id}"}, status=201
+        )
+
+    def _hashnode(self, request: Request) -> Response:
+        post_id = next(self._ids)
+        post = {"id": f"hn{post_id}", "url": f"https://bench.hashnode.dev/post-{post_id}"}
+        return Response.json({"data": {"publishPost": {"post": post}}})
+
+    def _postiz(self, request: Request) -> Response:
+        if request.path.endswith("/integrations"):
+            return Response.json(
+                [
+                    {"id": f"int-{p}", "providerIdentifier": p, "name": f"Bench {p}"}
+                    for p in POSTIZ_PLATFORMS
+                ]
+            )
+        if request.path.endswith("/posts"):
+            posts = request.json()["posts"]
+            return Response.json(
+                [
+                    {"postId": f"p{next(self._ids)}", "integration": p["integration"]["id"]}
+                    for p in posts
+                ]
+            )
+        return Response.json({"connected": True})
+
+    def _convertkit(self, request: Request) -> Response:
+        if request.method == "POST":
+            email = request.json()["email"]
+            return Response.json({"subscription": {"subscriber": {"email_address": email}}})
+        page = int(request.query.get("page", 1))
+        return Response.json(
+            {
+                "total_pages": 1,
+                "page": page,
+                "subscribers": [
+                    {"id": i, "email_address": f"lead{i}@bench.test", "state": "active"}
+                    for i in range(50)
+                ],
+            }
+        )
+
+    def _dataforseo(self, request: Request) -> Response:
+        task = request.json()[0]
+        limit, offset = task.get("limit", 100), task.get("offset", 0)
+        items = [
+            {
+                "keyword": f"{task['keyword']} idea {offset + i}",
+                "search_volume": 1000 - (offset + i) % 1000,
+                "keyword_difficulty": (offset + i) * 7 % 100,
+            }
+            for i in range(limit)
+        ]
+        result = {"total_count": 10_000, "items_count": limit, "offset": offset, "items": items}
+        return Response.json(
+            {"status_code": 20000, "tasks": [{"status_code": 20000, "result": [result]}]}
+        )
+
+
+class RedirectTransport(httpx.AsyncBaseTransport):
+    """Send every request to ``127.0.0.1:port``, remembering the real host."""
+
+    def __init__(self, port: int, **kwargs):
+        self.port = port
+        self._inner = httpx.AsyncHTTPTransport(**kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.headers[HOST_HEADER] = request.url.host
+        request.url = request.url.copy_with(scheme="http", host="127.0.0.1", port=self.port)
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
@@ -0,0 +1,65 @@
+"""Look-ahead buffer of drafted posts for scheduled publishing.
+
+Off-peak, :meth:`ContentBuffer.fill` writes the next few picks of the
+selection engine as Hugo drafts (``draft: true``), social copy included.
+At publish time :meth:`ContentBuffer.promote` flips the oldest draft live,
+which is a file rewrite with no LLM call; only an empty buffer falls back to
+generating inline.
+"""
+
+import asyncio
+
+from leadgen.config import Config
+from leadgen.pipeline import LeadgenPipeline
+
+
+class ContentBuffer:
+    """Drafts waiting in a Hugo blog, filled and drained in order."""
+
+    def __init__(self, pipeline: LeadgenPipeline, config: Config, size: int | None = None):
+        self.pipeline = pipeline
+        self.config = config
+        self.size = config.buffer_size if size is None else size
+        self.hugo = pipeline.hugo_publisher
+
+    def drafts(self) -> list[dict]:
+        """Buffered posts, oldest (next to publish) first."""
+        return [self.hugo.load(slug) for slug in self.hugo.drafts()]
+
+    async def fill(self, size: int | None = None) -> list[dict]:
+        """Draft posts until the buffer holds ``size``; returns the new ones."""
+        from leadgen.seo.selection import next_topics
+
+        size = self.size if size is None else size
+        drafts = await asyncio.to_thread(self.drafts)
+        missing = size - len(drafts)
+        if missing <= 0:
+            return []
+
+        queued = {(d["niche"], d["topic"]) for d in drafts}
+        choices = await asyncio.to_thread(next_topics, self.config, missing + len(queued))
+        choices = [c for c in choices if (c.niche, c.topic) not in queued][:missing]
+        return list(
+            await asyncio.gather(
+                *(
+                    self.pipeline.generate_and_publish(
+                        niche=c.niche, topic=c.topic, keyword=c.keyword, draft=True
+                    )
+                    for c in choices
+                )
+            )
+        )
+
+    def promote(self, niche: str | None = None, topic: str | None = None) -> dict | None:
+        """Publish the oldest draft (matching ``niche``/``topic`` if given).
+
+        Returns its ``post_data``, or ``None`` when nothing suitable is buffered.
+        """
+        for slug in self.hugo.drafts():
+            post = self.hugo.load(slug)
+            if (niche and post["niche"] != niche) or (topic and post["topic"] != topic):
+                continue
+            post["local_path"] = self.hugo.promote(slug)
+            post["draft"] = False
+            return post
+        return None
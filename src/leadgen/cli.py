@@ -1,29 +1,65 @@
-"""CLI entry point for the leadgen tool."""
+"""CLI entry point for the leadgen tool.
+
+Keep module-level imports to click and config: every command imports what it
+needs itself, so ``leadgen status`` or ``--help`` never pays for asyncio,
+httpx, yaml or the pipeline. ``tests/test_cli.py`` enforces this.
+"""
 
-import asyncio
-import os
-import subprocess
-from datetime import date
 from pathlib import Path
 
 import click
 
 from leadgen.config import load_config
-from leadgen.pipeline import LeadgenPipeline
 
-NICHES = ["restaurants", "law firms", "real estate", "dental offices", "hvac", "accounting"]
-TOPICS = [
-    "how AI agents save money",
-    "automating customer service",
-    "reducing missed appointments",
-    "streamlining operations",
-]
+PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+def _next_topics(config, count=1, niche=None, topic=None) -> list[tuple[str, str, str]]:
+    """``count`` (niche, topic, keyword) picks from the selection engine; given values are kept."""
+    if niche and topic:
+        return [(niche, topic, "")] * count
+    from itertools import cycle, islice
+
+    from leadgen.seo.selection import next_topics
+
+    choices = next_topics(
+        config, count, niches=[niche] if niche else None, topics=[topic] if topic else None
+    )
+    # Fewer distinct pairs than posts wanted: go round them again.
+    return [(c.niche, c.topic, c.keyword) for c in islice(cycle(choices), count)]
+
+
+def _trace(config, name: str):
+    from leadgen import tracing
+
+    return tracing.trace(name, config.data_dir, config.metrics_textfile or None)
 
 
 @click.group()
-def main():
+@click.option("--profile", is_flag=True, help="Profile the command (CPU + tracemalloc)")
+@click.option("--profile-mode", type=click.Choice(["sample", "cprofile"]), default="sample",
+              help="sample: collapsed stacks for flamegraphs; cprofile: .prof + top list")
+@click.option("--profile-dir", default=None, help="Report directory (default: <data_dir>/profiles)")
+@click.option("--deadline", "deadline_s", type=float, default=None, envvar="LEADGEN_DEADLINE",
+              help="Give up on the whole run after this many seconds (env LEADGEN_DEADLINE)")
+@click.pass_context
+def main(ctx, profile, profile_mode, profile_dir, deadline_s):
     """Organic lead generation automation."""
-    pass
+    if deadline_s is not None:
+        from leadgen.deadline import deadline
+
+        ctx.with_resource(deadline(deadline_s))
+    if not profile:
+        return
+    from leadgen.profiling import Profiler
+
+    out_dir = profile_dir or Path(load_config().data_dir) / "profiles"
+    profiler = Profiler(ctx.invoked_subcommand, out_dir, mode=profile_mode)
+    # Close callbacks run last-in first-out: report after the profiler has exited.
+    ctx.call_on_close(
+        lambda: [click.echo(f"Profile: {path}", err=True) for path in profiler.outputs]
+    )
+    ctx.with_resource(profiler)
 
 
 @main.command()
@@ -41,26 +77,142 @@ def status():
 
 
 @main.command()
-@click.option("--niche", required=True, help="Target niche (e.g., restaurants)")
-@click.option("--topic", required=True, help="Blog topic")
-def generate(niche, topic):
+@click.option("--startup", is_flag=True, help="Profile CLI cold start with -X importtime")
+@click.option("--top", default=10, help="Number of slowest imports to list")
+def doctor(startup, top):
+    """Check external tools, or report CLI startup cost."""
+    from leadgen import doctor as diagnostics
+
+    if not startup:
+        for tool, ok, detail in diagnostics.check_environment():
+            click.echo(f"  [{'ok' if ok else '!!'}] {tool}: {detail}")
+        return
+
+    report = diagnostics.measure_startup(["status"])
+    verdict = "within" if report.within_budget else "OVER"
+    click.echo(
+        f"Cold start of 'leadgen status': {report.elapsed_ms:.1f} ms "
+        f"({verdict} {diagnostics.STARTUP_BUDGET_MS} ms budget)"
+    )
+    if report.heavy_modules:
+        click.echo(f"  Heavy modules imported: {', '.join(report.heavy_modules)}")
+    click.echo("  Slowest imports (cumulative):")
+    for record in report.top_imports(top):
+        click.echo(
+            f"    {record.cumulative_us / 1000:7.1f} ms  "
+            f"{'  ' * record.depth}{record.module}"
+        )
+
+
+@main.command()
+@click.option("--posts", default=20, help="Posts to push through the pipeline")
+@click.option("--concurrency", default=4, help="Posts in flight at once")
+@click.option("--llm-concurrency", default=4, help="Concurrent fake claude processes")
+@click.option("--latency", default=20.0, help="Stand-in API latency (ms)")
+@click.option("--jitter", default=10.0, help="Random extra latency (ms)")
+@click.option("--error-rate", default=0.0, help="Fraction of API calls answered with 503")
+@click.option("--rate-limit", default=0.0, help="Per-service requests/sec before 429 (0 = off)")
+@click.option("--claude-latency", default=200.0, help="Fake claude run time (ms)")
+@click.option("--claude-words", default=1200, help="Words per generated post")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Write the JSON report here")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Earlier report to compare against (exit 1 on regression)")
+@click.option("--tolerance", default=0.10, help="Allowed slowdown vs. baseline")
+@click.option("--record", type=click.Path(dir_okay=False), default=None,
+              help="Save every HTTP exchange to this cassette")
+@click.option("--replay", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Serve HTTP from this cassette instead of the stand-ins")
+@click.option("--realtime", is_flag=True, help="Replay with the recorded response times")
+def bench(posts, concurrency, llm_concurrency, latency, jitter, error_rate, rate_limit,
+          claude_latency, claude_words, output, baseline, tolerance, record, replay, realtime):
+    """Benchmark the pipeline offline against local service stand-ins."""
+    import asyncio
+    import json
+
+    from leadgen.bench.runner import BenchParams, compare, run_bench
+
+    params = BenchParams(
+        posts=posts,
+        concurrency=concurrency,
+        llm_concurrency=llm_concurrency,
+        latency_ms=latency,
+        jitter_ms=jitter,
+        error_rate=error_rate,
+        rate_limit=rate_limit,
+        claude_latency_ms=claude_latency,
+        claude_words=claude_words,
+    )
+    report = asyncio.run(run_bench(params, record=record, replay=replay, realtime=realtime))
+    text = json.dumps(report, indent=2)
+    if output:
+        Path(output).write_text(text + "\n")
+    click.echo(text)
+
+    if baseline:
+        regressions = compare(report, json.loads(Path(baseline).read_text()), tolerance)
+        for regression in regressions:
+            click.echo(f"REGRESSION: {regression}", err=True)
+        if regressions:
+            raise SystemExit(1)
+
+
+@main.command()
+@click.option("--niche", default=None, help="Target niche (default: selection engine)")
+@click.option("--topic", default=None, help="Blog topic (default: selection engine)")
+@click.option("--keyword", default="", help="Primary keyword (default: from the selection engine)")
+def generate(niche, topic, keyword):
     """Generate a blog post and publish locally."""
+    import asyncio
+
+    from leadgen.pipeline import LeadgenPipeline
+
     config = load_config()
+    [(niche, topic, picked)] = _next_topics(config, 1, niche, topic)
+    keyword = keyword or picked
+    click.echo(f"Generating: niche={niche}, topic={topic}" + (f", keyword={keyword}" if keyword else ""))
     pipeline = LeadgenPipeline(
         content_model=config.content_model,
         hugo_blog_dir=config.hugo_blog_dir,
+        variants=config.ab_variants,
     )
 
-    result = asyncio.run(pipeline.generate_and_publish(niche=niche, topic=topic))
+    with _trace(config, "cli:generate"):
+        result = asyncio.run(
+            pipeline.generate_and_publish(niche=niche, topic=topic, keyword=keyword)
+        )
     click.echo(f"Published: {result['title']}")
     click.echo(f"  Path: {result['local_path']}")
 
 
+@main.command("next-topic")
+@click.option("--count", default=1, help="How many picks to show")
+@click.option("--niche", "niches", multiple=True, help="Restrict to these niches")
+@click.option("--seed", type=int, default=None, help="Fix the random draw (reproducible picks)")
+@click.option("--json", "as_json", is_flag=True, help="Print picks as JSON")
+def next_topic(count, niches, seed, as_json):
+    """Show what the selection engine would write about next."""
+    from leadgen.seo.selection import next_topics
+
+    config = load_config()
+    choices = next_topics(config, count=count, niches=list(niches) or None, seed=seed)
+    if as_json:
+        import json
+
+        click.echo(json.dumps([c.as_dict() for c in choices], indent=2))
+        return
+    for c in choices:
+        click.echo(f"{c.score:>8.3f}  {c.niche} | {c.topic}" + (f" | {c.keyword}" if c.keyword else ""))
+
+
 @main.command()
 @click.option("--niche", required=True, help="Target niche for keywords")
 @click.option("--max-difficulty", default=50, help="Max keyword difficulty (0-100)")
-def keywords(niche, max_difficulty):
+@click.option("--crawl", is_flag=True, help="Fetch every result page into the local keyword store")
+@click.option("--concurrency", default=4, help="Concurrent page requests when crawling")
+def keywords(niche, max_difficulty, crawl, concurrency):
     """Research keywords for a niche."""
+    import asyncio
+
     config = load_config()
 
     if not config.dataforseo_login:
@@ -73,32 +225,534 @@ def keywords(niche, max_difficulty):
         login=config.dataforseo_login,
         password=config.dataforseo_password,
     )
+    seed = f"ai agents for {niche}"
+
+    if crawl:
+        from leadgen.seo.crawler import KeywordCrawler
+        from leadgen.seo.keyword_store import KeywordStore
+
+        crawler = KeywordCrawler(researcher, max_concurrency=concurrency)
+        with KeywordStore(Path(config.data_dir) / "keywords.db") as store:
+            written = asyncio.run(crawler.crawl_into(store, niche, seed))
+            top = store.top(niche, max_difficulty)
+            matched = store.count(niche, max_difficulty)
+        click.echo(f"Crawled {written} keywords (of {crawler.total_count or 0} reported).")
+        if crawler.failed_offsets:
+            click.echo(f"  Failed pages at offsets: {crawler.failed_offsets}")
+    else:
+        matched, top = asyncio.run(
+            researcher.top_low_competition(
+                researcher.iter_suggestions(seed),
+                max_difficulty,
+            )
+        )
 
-    results = asyncio.run(
-        researcher.get_suggestions(f"ai agents for {niche}")
-    )
-    filtered = researcher.filter_low_competition(results, max_difficulty)
-
-    click.echo(f"Found {len(filtered)} low-competition keywords for '{niche}':")
-    for kw in sorted(filtered, key=lambda x: x["search_volume"], reverse=True)[:20]:
+    click.echo(f"Found {matched} low-competition keywords for '{niche}':")
+    for kw in top:
         click.echo(
             f"  [{kw['keyword_difficulty']:2d}] {kw['keyword']} "
             f"({kw['search_volume']:,} searches/mo)"
         )
 
 
+@main.group()
+def subscribers():
+    """Manage ConvertKit subscribers."""
+    pass
+
+
+@subscribers.command("import")
+@click.argument("csv_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--form-id", default=None, help="ConvertKit form (default: CONVERTKIT_FORM_ID)")
+@click.option("--concurrency", default=8, help="Concurrent requests")
+@click.option("--rate", default=110.0, help="Max requests per minute")
+@click.option("--progress-file", default=None, help="Resume file (default: <csv>.progress.jsonl)")
+def import_subscribers(csv_path, form_id, concurrency, rate, progress_file):
+    """Bulk import leads from a CSV file (resumable)."""
+    import asyncio
+
+    config = load_config()
+    form_id = form_id or config.convertkit_form_id
+
+    if not config.convertkit_api_key:
+        click.echo("Error: CONVERTKIT_API_KEY not configured. See .env.example")
+        return
+    if not form_id:
+        click.echo("Error: pass --form-id or set CONVERTKIT_FORM_ID")
+        return
+
+    from leadgen.email.bulk import BulkImporter, ImportProgress, iter_csv_leads
+    from leadgen.email.convertkit import ConvertKitClient
+
+    client = ConvertKitClient(
+        api_key=config.convertkit_api_key,
+        api_secret=config.convertkit_api_secret,
+    )
+    progress = ImportProgress(progress_file or f"{csv_path}.progress.jsonl")
+    with _dedupe_index(config) as dedupe:
+        importer = BulkImporter(
+            client, form_id, concurrency=concurrency, requests_per_minute=rate, dedupe=dedupe
+        )
+        try:
+            result = asyncio.run(importer.run(iter_csv_leads(csv_path), progress))
+        finally:
+            progress.close()
+
+    click.echo(f"Imported {result.imported} subscribers into form {form_id}")
+    click.echo(f"  Already done: {result.already_done}")
+    click.echo(f"  Duplicates: {result.duplicates}")
+    click.echo(f"  Already subscribed: {result.known}")
+    click.echo(f"  Invalid: {result.invalid}")
+    click.echo(f"  Failed: {result.failed} (re-run to retry)")
+
+
+def _dedupe_index(config):
+    from leadgen.email.dedupe import DedupeIndex
+
+    return DedupeIndex(Path(config.data_dir) / "dedupe")
+
+
+def _subscriber_mirror(config):
+    from leadgen.email.mirror import SubscriberMirror
+
+    return SubscriberMirror(Path(config.data_dir) / "subscribers.db")
+
+
+@subscribers.command("sync")
+@click.option("--full", is_flag=True, help="Re-download the whole list instead of recent changes")
+def sync_subscribers(full):
+    """Refresh the local subscriber mirror from ConvertKit."""
+    import asyncio
+
+    config = load_config()
+    if not config.convertkit_api_secret:
+        click.echo("Error: CONVERTKIT_API_SECRET not configured. See .env.example")
+        return
+
+    from leadgen.email.convertkit import ConvertKitClient
+
+    client = ConvertKitClient(
+        api_key=config.convertkit_api_key,
+        api_secret=config.convertkit_api_secret,
+    )
+    with _subscriber_mirror(config) as mirror, _dedupe_index(config) as dedupe:
+        written = asyncio.run(mirror.sync(client, full=full))
+        added = dedupe.add_many(mirror.emails())
+        click.echo(f"Synced {written} changed subscribers ({len(mirror)} in mirror).")
+        click.echo(f"  {added} new addresses added to the dedupe index.")
+
+
+@subscribers.command("check")
+@click.argument("email")
+def check_subscriber(email):
+    """Check the local mirror for an email address."""
+    config = load_config()
+    with _subscriber_mirror(config) as mirror:
+        if mirror.last_sync is None:
+            click.echo("Mirror is empty. Run: leadgen subscribers sync")
+            return
+        found = mirror.contains(email)
+        click.echo(f"{email}: {'subscribed' if found else 'not subscribed'}")
+        click.echo(f"  (mirror synced {mirror.last_sync:%Y-%m-%d %H:%M} UTC)")
+
+
+@main.command("serve-leads")
+@click.option("--host", default="127.0.0.1", help="Interface to listen on")
+@click.option("--port", default=8787, help="Port to listen on")
+@click.option("--form-id", default=None, help="ConvertKit form (default: CONVERTKIT_FORM_ID)")
+@click.option("--allowed-origin", default="*", help="CORS origin allowed to post leads")
+def serve_leads(host, port, form_id, allowed_origin):
+    """Accept lead form posts and forward them to ConvertKit in the background."""
+    import asyncio
+
+    config = load_config()
+    form_id = form_id or config.convertkit_form_id
+    if not config.convertkit_api_key or not form_id:
+        click.echo("Error: CONVERTKIT_API_KEY and a form id are required. See .env.example")
+        return
+
+    from leadgen.email.convertkit import ConvertKitClient
+    from leadgen.email.intake import LeadFlusher, LeadJournal, serve_leads as run_server
+
+    client = ConvertKitClient(
+        api_key=config.convertkit_api_key,
+        api_secret=config.convertkit_api_secret,
+    )
+    journal = LeadJournal(Path(config.data_dir) / "leads")
+
+    click.echo(f"Accepting leads on http://{host}:{port}/leads ({journal.pending} pending)")
+    with _dedupe_index(config) as dedupe:
+        flusher = LeadFlusher(journal, client, form_id, dedupe=dedupe)
+        try:
+            asyncio.run(run_server(journal, flusher, host, port, allowed_origin))
+        except KeyboardInterrupt:
+            click.echo("Stopped.")
+
+
+def _job_queue(config):
+    from leadgen.jobs import JobQueue
+
+    return JobQueue(Path(config.data_dir) / "jobs.db")
+
+
+@main.command()
+@click.option("--concurrency", default=4, help="Jobs processed at once")
+@click.option("--subprocess-slots", default=1, help="Concurrent Claude CLI processes")
+@click.option("--visibility-timeout", default=900.0, help="Seconds a claimed job stays leased")
+@click.option("--job-deadline", type=float, default=None,
+              help="Seconds each job may run before it is cancelled and retried")
+@click.option("--drain", is_flag=True, help="Exit once no jobs are ready instead of polling")
+def worker(concurrency, subprocess_slots, visibility_timeout, job_deadline, drain):
+    """Run queued jobs (generate, cross-post, distribute, sync)."""
+    import asyncio
+
+    from leadgen.worker import Worker
+
+    config = load_config()
+    with _job_queue(config) as queue:
+        runner = Worker(
+            queue,
+            config,
+            project_dir=PROJECT_DIR,
+            concurrency=concurrency,
+            subprocess_slots=subprocess_slots,
+            visibility_timeout=visibility_timeout,
+            job_deadline=job_deadline,
+            echo=click.echo,
+        )
+        click.echo(f"Worker started ({queue.ready_count()} jobs ready)")
+        try:
+            asyncio.run(runner.run(drain=drain))
+        except KeyboardInterrupt:
+            pass
+        lost = f", {runner.lost} lost leases" if runner.lost else ""
+        click.echo(f"Stopped: {runner.completed} done, {runner.failed} failed attempts{lost}.")
+
+
+@main.command()
+@click.argument("kind", type=click.Choice(["generate", "fill-buffer", "cross-post", "distribute", "sync"]))
+@click.option("--niche", default=None, help="generate: niche (default: selection engine)")
+@click.option("--topic", default=None, help="generate: topic (default: selection engine)")
+@click.option("--slug", default=None, help="cross-post/distribute: post slug")
+@click.option("--push", is_flag=True, help="generate: commit and push the new post")
+@click.option("--target", type=click.Choice(["subscribers", "cross-posts", "analytics"]),
+              default="subscribers",
+              help="sync: what to refresh")
+@click.option("--delay", default=0.0, help="Seconds before the job becomes ready")
+def enqueue(kind, niche, topic, slug, push, target, delay):
+    """Add a job to the worker queue."""
+    payload = {}
+    if kind == "generate":
+        # Without --niche/--topic the worker picks them when the job runs.
+        payload = {"niche": niche, "topic": topic, "push": push}
+        payload = {k: v for k, v in payload.items() if v is not None}
+    elif kind in ("cross-post", "distribute"):
+        if not slug:
+            raise click.UsageError(f"{kind} needs --slug")
+        payload = {"slug": slug}
+    elif kind == "sync":
+        payload = {"target": target}
+
+    config = load_config()
+    with _job_queue(config) as queue:
+        job_id = queue.enqueue(kind, payload, delay=delay)
+    click.echo(f"Queued job {job_id}: {kind} {payload}")
+
+
+@main.command()
+def jobs():
+    """Show queue depth and recent failures."""
+    config = load_config()
+    with _job_queue(config) as queue:
+        counts = queue.counts()
+        click.echo("  ".join(f"{status}: {n}" for status, n in counts.items()))
+        for failure in queue.recent_failures():
+            click.echo(
+                f"  [job {failure['id']}] {failure['kind']} after "
+                f"{failure['attempts']} attempts: {failure['error']}"
+            )
+
+
+@main.command("sync-posts")
+@click.option("--slug", "slugs", multiple=True, help="Only these posts (default: the whole archive)")
+@click.option("--platform", "platforms", multiple=True, type=click.Choice(["devto", "hashnode"]),
+              help="Only these platforms (default: every configured one)")
+@click.option("--force", is_flag=True, help="Push every post even if its hash is unchanged")
+@click.option("--dry-run", is_flag=True, help="Show what would be created or updated")
+def sync_posts(slugs, platforms, force, dry_run):
+    """Push new and edited blog posts to Dev.to and Hashnode."""
+    import asyncio
+
+    from leadgen import cpu
+    from leadgen.pipeline import LeadgenPipeline, cross_post_publishers
+    from leadgen.publishers.sync import CrossPostSync, SyncStore
+
+    config = load_config()
+    publishers = cross_post_publishers(config, list(platforms) or None)
+    if not publishers:
+        raise click.ClickException("No cross-post platforms configured")
+    pipeline = LeadgenPipeline(
+        content_model=config.content_model,
+        hugo_blog_dir=config.hugo_blog_dir,
+        site_url=config.site_url,
+    )
+
+    async def sync(store):
+        # Loading and hashing the whole archive is CPU work; spread it over the cores.
+        async with cpu.CpuPool(config.cpu_workers) as pool:
+            with cpu.use_pool(pool):
+                return await CrossPostSync(store, publishers, pipeline).run(
+                    list(slugs) or None, force, dry_run
+                )
+
+    with _trace(config, "cli:sync-posts"), SyncStore(Path(config.data_dir) / "crosspost.db") as store:
+        report = asyncio.run(sync(store))
+
+    verb = "Would create" if dry_run else "Created"
+    for key in report.created:
+        click.echo(f"  {verb}: {key}")
+    for key in report.updated:
+        click.echo(f"  {'Would update' if dry_run else 'Updated'}: {key}")
+    for key, error in report.failed.items():
+        click.echo(f"  Failed: {key}: {error}")
+    click.echo(
+        f"{len(report.created)} created, {len(report.updated)} updated, "
+        f"{report.unchanged} unchanged, {len(report.failed)} failed"
+    )
+    if report.failed:
+        raise SystemExit(1)
+
+
+@main.group()
+def analytics():
+    """Collect and report channel stats (views, reactions, leads)."""
+    pass
+
+
+def _analytics_store(config):
+    from leadgen.analytics.store import AnalyticsStore
+
+    return AnalyticsStore(Path(config.data_dir) / "analytics.db")
+
+
+@analytics.command("collect")
+@click.option("--source", "sources", multiple=True,
+              type=click.Choice(["devto", "hashnode", "postiz", "convertkit"]),
+              help="Only these sources (default: every configured one)")
+def collect_analytics(sources):
+    """Poll every configured channel for new stats."""
+    import asyncio
+
+    from leadgen.analytics.collectors import AnalyticsCollector
+
+    config = load_config()
+    with _trace(config, "cli:analytics"), _analytics_store(config) as store:
+        results = asyncio.run(AnalyticsCollector(store, config).collect(list(sources) or None))
+    if not results:
+        click.echo("No analytics sources configured.")
+    for name, result in results.items():
+        click.echo(f"  {name}: {result if isinstance(result, str) else f'{result} updated'}")
+    if any(isinstance(r, str) for r in results.values()):
+        raise SystemExit(1)
+
+
+@analytics.command("report")
+@click.option("--days", default=90, help="Window in days")
+@click.option("--metric", default="leads", help="Metric to rank niches by (leads, views, ...)")
+@click.option("--limit", default=10, help="Rows per table")
+def analytics_report(days, metric, limit):
+    """Top niches and posts over the last --days."""
+    config = load_config()
+    with _analytics_store(config) as store:
+        niches = store.top_niches(metric, days, limit)
+        posts = store.top_posts(metric, days, limit=limit)
+        channels = store.channel_totals(days)
+
+    click.echo(f"Top niches by {metric} per post ({days} days):")
+    for row in niches:
+        click.echo(f"  {row['niche']:<24} {row['per_post']:>8.2f}  ({row[metric]} over {row['posts']} posts)")
+    click.echo(f"Top posts by {metric}:")
+    for row in posts:
+        click.echo(f"  {row[metric]:>8}  {row['slug']}")
+    click.echo("Channels:")
+    for channel, metrics in sorted(channels.items()):
+        click.echo(f"  {channel}: " + ", ".join(f"{m} {v}" for m, v in sorted(metrics.items())))
+
+
+@analytics.command("variants")
+@click.option("--slug", default=None, help="Only this post")
+@click.option("--days", default=90, help="Window in days")
+@click.option("--metric", default="impressions", help="Channel metric to compare variants by")
+def analytics_variants(slug, days, metric):
+    """Compare A/B headline and social variants by channel performance."""
+    config = load_config()
+    with _analytics_store(config) as store:
+        rows = store.variant_totals(metric, days, slug)
+    if not rows:
+        click.echo("No variants scheduled in this window.")
+    for row in rows:
+        click.echo(
+            f"  {row['slug']:<40} {row['variant']}  {row['per_slot']:>8.1f} {metric}/slot"
+            f"  ({row[metric]} over {row['slots']} slots)"
+        )
+
+
+@main.group()
+def media():
+    """Branded social cards (rendered locally, uploaded once per image)."""
+    pass
+
+
+@media.command("render")
+@click.option("--slug", "slugs", multiple=True, help="Only these posts (default: all)")
+@click.option("--workers", type=int, default=None,
+              help="Render processes (default: LEADGEN_CPU_WORKERS, else one per core)")
+def render_media(slugs, workers):
+    """Render cards for posts and their variants into the media store."""
+    import asyncio
+    from urllib.parse import urlparse
+
+    from leadgen import cpu
+    from leadgen.media.cards import CardSpec
+    from leadgen.media.library import MediaLibrary
+    from leadgen.publishers.hugo import HugoPublisher
+
+    config = load_config()
+    hugo = HugoPublisher(config.hugo_blog_dir)
+    footer = urlparse(config.site_url).netloc
+    specs = []
+    for slug in slugs or hugo.slugs():
+        post = hugo.load(slug)
+        titles = [post["title"]] + [v["title"] for v in post["variants"] if v.get("title")]
+        specs += [CardSpec(title, post["niche"], footer) for title in titles]
+
+    async def render(library):
+        async with cpu.CpuPool(workers or config.cpu_workers) as pool:
+            with cpu.use_pool(pool):
+                return await library.cards(specs)
+
+    with _trace(config, "cli:media-render"), MediaLibrary(Path(config.data_dir) / "media") as library:
+        hashes = asyncio.run(render(library))
+    click.echo(f"{len(set(hashes.values()))} card(s) for {len(specs)} title(s) in {library.root}")
+
+
+@main.group()
+def sites():
+    """Run several client sites from one sites file (LEADGEN_SITES)."""
+    pass
+
+
+def _load_sites(config, sites_file):
+    from leadgen.sites import load_sites
+
+    path = Path(sites_file or config.sites_file)
+    if not path.exists():
+        raise click.ClickException(f"Sites file not found: {path}")
+    try:
+        return load_sites(path, config)
+    except ValueError as exc:
+        raise click.ClickException(str(exc))
+
+
+@sites.command("list")
+@click.option("--file", "sites_file", default=None, help="Sites file (default: LEADGEN_SITES)")
+def list_sites(sites_file):
+    """Show configured sites and their channels."""
+    config = load_config()
+    for site in _load_sites(config, sites_file):
+        channels = [
+            name
+            for name, key in (
+                ("devto", site.config.devto_api_key),
+                ("hashnode", site.config.hashnode_api_token),
+                ("postiz", site.config.postiz_api_key),
+                ("convertkit", site.config.convertkit_api_key),
+            )
+            if key
+        ]
+        click.echo(f"{site.name}: {site.config.hugo_blog_dir}")
+        click.echo(f"  Niches: {', '.join(site.niches)}")
+        click.echo(f"  Channels: {', '.join(channels) or 'blog only'}")
+
+
+@sites.command("run")
+@click.option("--file", "sites_file", default=None, help="Sites file (default: LEADGEN_SITES)")
+@click.option("--posts", default=1, help="Posts to generate per site")
+@click.option("--llm-concurrency", default=2, help="Claude CLI processes shared by all sites")
+@click.option("--per-site", default=1, help="Max concurrent jobs for any one site")
+@click.option("--push", is_flag=True, help="Commit and push each site's blog")
+def run_sites(sites_file, posts, llm_concurrency, per_site, push):
+    """Generate and cross-post for every site in one process."""
+    import asyncio
+
+    from leadgen.sites import SiteOrchestrator
+
+    config = load_config()
+    orchestrator = SiteOrchestrator(
+        _load_sites(config, sites_file),
+        llm_concurrency=llm_concurrency,
+        per_site=per_site,
+        echo=click.echo,
+    )
+    with _trace(config, "cli:sites-run"):
+        runs = asyncio.run(orchestrator.run(posts_per_site=posts, push=push))
+    failed = [run for run in runs if run.error]
+    click.echo(f"Done: {len(runs) - len(failed)} published, {len(failed)} failed.")
+
+
+@main.command()
+@click.option("--runs", default=20, help="Number of recent runs to summarize")
+@click.option("--json", "as_json", is_flag=True, help="Print the summary as JSON")
+def stats(runs, as_json):
+    """Summarize stage latency over recent traced runs."""
+    from datetime import datetime
+
+    from leadgen import tracing
+
+    config = load_config()
+    summary = tracing.summarize(tracing.load_spans(Path(config.data_dir) / "traces"), runs)
+    if as_json:
+        import json
+
+        click.echo(json.dumps(summary, indent=2))
+        return
+    if not summary["runs"]:
+        click.echo("No traced runs yet. Run: leadgen publish")
+        return
+
+    since = datetime.fromtimestamp(summary["since"]).strftime("%Y-%m-%d %H:%M")
+    click.echo(
+        f"Last {summary['runs']} runs since {since}: {summary['failed_runs']} failed"
+    )
+    click.echo(f"  {'span':<28}{'count':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}{'errors':>8}")
+    ordered = sorted(summary["spans"].items(), key=lambda item: -item[1]["p95_ms"])
+    for name, s in ordered:
+        click.echo(
+            f"  {name:<28}{s['count']:>6}"
+            + "".join(f"{s[key] / 1000:>9.2f}s" for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms"))
+            + f"{s['errors']:>8}"
+        )
+
+
 @main.command()
 @click.option("--install", is_flag=True, help="Install the cron job (Mon/Wed/Fri 9am UTC)")
 @click.option("--remove", is_flag=True, help="Remove the cron job")
 def cron(install, remove):
     """Manage the automated publishing cron job."""
-    project_dir = Path(__file__).resolve().parent.parent.parent
+    import subprocess
+
+    project_dir = PROJECT_DIR
     leadgen_bin = subprocess.run(
         ["which", "leadgen"], capture_output=True, text=True
     ).stdout.strip()
 
     cron_comment = "# leadgen auto-publish"
-    cron_line = f"0 9 * * 1,3,5 cd {project_dir} && {leadgen_bin} autopublish >> {project_dir}/cron.log 2>&1 {cron_comment}"
+    cron_lines = [
+        # Off-peak: keep drafts ready so the 9am run only promotes one.
+        # Deadlines stop a slow run from overlapping the next one.
+        f"0 3 * * * cd {project_dir} && {leadgen_bin} --deadline 3600 buffer fill >> {project_dir}/cron.log 2>&1 {cron_comment}",
+        f"0 9 * * 1,3,5 cd {project_dir} && {leadgen_bin} --deadline 1800 autopublish >> {project_dir}/cron.log 2>&1 {cron_comment}",
+    ]
 
     if remove:
         existing = subprocess.run(
@@ -119,9 +773,9 @@ def cron(install, remove):
         if cron_comment in existing:
             click.echo("Cron job already installed.")
             return
-        new_crontab = existing.rstrip() + "\n" + cron_line + "\n"
+        new_crontab = existing.rstrip() + "\n" + "\n".join(cron_lines) + "\n"
         subprocess.run(["crontab", "-"], input=new_crontab, text=True)
-        click.echo(f"Cron job installed: Mon/Wed/Fri 9am UTC")
+        click.echo(f"Cron job installed: Mon/Wed/Fri 9am UTC, buffer fill daily 3am UTC")
         click.echo(f"  Logs: {project_dir}/cron.log")
         return
 
@@ -129,44 +783,125 @@ def cron(install, remove):
 
 
 @main.command()
-@click.option("--niche", default=None, help="Override niche (default: auto-rotate)")
-@click.option("--topic", default=None, help="Override topic (default: auto-rotate)")
-def publish(niche, topic):
-    """Generate a blog post, commit, and push to GitHub now."""
-    if not niche:
-        day = date.today().timetuple().tm_yday
-        niche = NICHES[day % len(NICHES)]
-    if not topic:
-        day = date.today().timetuple().tm_yday
-        topic = TOPICS[day % len(TOPICS)]
-
-    click.echo(f"Publishing: niche={niche}, topic={topic}")
+@click.option("--niche", default=None, help="Override niche (default: selection engine)")
+@click.option("--topic", default=None, help="Override topic (default: selection engine)")
+@click.option("--count", default=1, help="Posts to publish in this run (one commit and push)")
+@click.option("--live", is_flag=True, help="Generate now even if drafts are buffered")
+@click.option("--push/--no-push", default=True, help="Commit and push the posts")
+def publish(niche, topic, count, live, push):
+    """Publish the next buffered drafts (or generate them), commit once, and push."""
+    import asyncio
+
+    from leadgen.buffer import ContentBuffer
+    from leadgen.pipeline import LeadgenPipeline
 
     config = load_config()
     pipeline = LeadgenPipeline(
         content_model=config.content_model,
         hugo_blog_dir=config.hugo_blog_dir,
+        llm_slots=asyncio.Semaphore(2),
+        variants=config.ab_variants,
     )
 
-    result = asyncio.run(pipeline.generate_and_publish(niche=niche, topic=topic))
-    click.echo(f"Published: {result['title']}")
-    click.echo(f"  Path: {result['local_path']}")
+    posts, failed = [], 0
+    with _trace(config, "cli:publish"):
+        buffer = ContentBuffer(pipeline, config)
+        while not live and len(posts) < count:
+            post = buffer.promote(niche, topic)
+            if post is None:
+                break
+            posts.append(post)
+            click.echo(f"Published from buffer: {post['title']}")
+
+        picks = _next_topics(config, count - len(posts), niche, topic) if len(posts) < count else []
+        for n, t, k in picks:
+            click.echo(f"Generating: niche={n}, topic={t}" + (f", keyword={k}" if k else ""))
+
+        async def generate_all():
+            return await asyncio.gather(
+                *(pipeline.generate_and_publish(niche=n, topic=t, keyword=k) for n, t, k in picks),
+                return_exceptions=True,
+            )
+
+        for (n, _, _), result in zip(picks, asyncio.run(generate_all()) if picks else []):
+            if isinstance(result, Exception):
+                failed += 1
+                click.echo(f"Failed ({n}): {type(result).__name__}: {result}", err=True)
+                continue
+            posts.append({**result, "niche": n})
+            click.echo(f"Published: {result['title']}")
+        for post in posts:
+            click.echo(f"  Path: {post['local_path']}")
+
+        if push and posts:
+            from leadgen.publishers.git import GitPublishTransaction
+
+            niches = ", ".join(dict.fromkeys(p["niche"] for p in posts if p.get("niche")))
+            subject = (
+                f"content: auto-generated post ({niches})" if len(posts) == 1
+                else f"content: {len(posts)} auto-generated posts ({niches})"
+            )
+            tx = GitPublishTransaction(PROJECT_DIR, subject)
+            for post in posts:
+                tx.add_post(post)
+            if tx.finish():
+                click.echo("Committed and pushed to GitHub.")
+            else:
+                click.echo("No new content to commit.")
+    if failed:
+        raise SystemExit(1)
+
+
+@main.group()
+def buffer():
+    """Drafts generated ahead of the publishing schedule."""
+    pass
+
 
-    # Git commit and push
-    project_dir = Path(__file__).resolve().parent.parent.parent
-    subprocess.run(["git", "add", "blog/content/"], cwd=project_dir)
-    diff = subprocess.run(
-        ["git", "diff", "--cached", "--quiet"], cwd=project_dir
+@buffer.command("fill")
+@click.option("--size", type=int, default=None, help="Drafts to keep ready (default: LEADGEN_BUFFER_SIZE)")
+@click.option("--push/--no-push", default=False, help="Commit and push the new drafts")
+def fill_buffer(size, push):
+    """Draft posts until the buffer is full (run off-peak)."""
+    import asyncio
+
+    from leadgen.buffer import ContentBuffer
+    from leadgen.pipeline import LeadgenPipeline
+
+    config = load_config()
+    pipeline = LeadgenPipeline(
+        content_model=config.content_model,
+        hugo_blog_dir=config.hugo_blog_dir,
+        variants=config.ab_variants,
     )
-    if diff.returncode != 0:
-        subprocess.run(
-            ["git", "commit", "-m", f"content: auto-generated post ({niche})"],
-            cwd=project_dir,
-        )
-        subprocess.run(["git", "push"], cwd=project_dir)
-        click.echo("Committed and pushed to GitHub.")
-    else:
-        click.echo("No new content to commit.")
+    with _trace(config, "cli:buffer-fill"):
+        drafted = asyncio.run(ContentBuffer(pipeline, config, size).fill())
+    for post in drafted:
+        click.echo(f"Drafted: {post['title']} ({post['slug']})")
+    if not drafted:
+        click.echo("Buffer already full.")
+    elif push:
+        from leadgen.publishers.git import GitPublishTransaction
+
+        tx = GitPublishTransaction(PROJECT_DIR, f"content: {len(drafted)} buffered draft(s)")
+        for post in drafted:
+            tx.add_post(post)
+        if tx.finish():
+            click.echo("Committed and pushed to GitHub.")
+
+
+@buffer.command("status")
+def buffer_status():
+    """List buffered drafts in publishing order."""
+    from leadgen.publishers.hugo import HugoPublisher
+
+    config = load_config()
+    hugo = HugoPublisher(config.hugo_blog_dir)
+    slugs = hugo.drafts() if hugo.content_dir.exists() else []
+    click.echo(f"{len(slugs)} draft(s) buffered (target {config.buffer_size}):")
+    for slug in slugs:
+        post = hugo.load(slug)
+        click.echo(f"  {slug}  [{post['niche']} | {post['topic']}]")
 
 
 @main.command()
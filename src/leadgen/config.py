@@ -11,9 +11,25 @@ from dotenv import load_dotenv
 class Config:
     # Content generation (Claude Code CLI model)
     content_model: str = "sonnet"
+    # Headline + social variants requested with each post (default 0: no A/B tests)
+    ab_variants: int = 0
+    # Drafted posts kept ready for scheduled publishing (see leadgen.buffer)
+    buffer_size: int = 3
+    # Worker processes for local CPU work (see leadgen.cpu); 0 sizes from the cores
+    cpu_workers: int = 0
+
+    # Local state (keyword store, queues, caches)
+    data_dir: str = ""
+
+    # Prometheus textfile for node_exporter (default: <data_dir>/traces/leadgen.prom)
+    metrics_textfile: str = ""
+
+    # Multi-site mode (see leadgen.sites)
+    sites_file: str = ""
 
     # Hugo
     hugo_blog_dir: str = ""
+    site_url: str = ""
 
     # Hashnode
     hashnode_api_token: str = ""
@@ -29,6 +45,7 @@ class Config:
     # ConvertKit
     convertkit_api_key: str = ""
     convertkit_api_secret: str = ""
+    convertkit_form_id: str = ""
 
     # DataForSEO
     dataforseo_login: str = ""
@@ -39,7 +56,14 @@ def load_config() -> Config:
     load_dotenv()
     return Config(
         content_model=os.getenv("CONTENT_MODEL", "sonnet"),
+        ab_variants=int(os.getenv("LEADGEN_AB_VARIANTS") or "0"),
+        buffer_size=int(os.getenv("LEADGEN_BUFFER_SIZE") or "3"),
+        cpu_workers=int(os.getenv("LEADGEN_CPU_WORKERS") or "0"),
+        data_dir=os.getenv("LEADGEN_DATA_DIR") or str(Path.cwd() / ".leadgen"),
+        metrics_textfile=os.getenv("LEADGEN_METRICS_TEXTFILE", ""),
+        sites_file=os.getenv("LEADGEN_SITES") or "sites.yaml",
         hugo_blog_dir=os.getenv("HUGO_BLOG_DIR", str(Path.cwd() / "blog")),
+        site_url=os.getenv("SITE_URL", ""),
         hashnode_api_token=os.getenv("HASHNODE_API_TOKEN", ""),
         hashnode_publication_id=os.getenv("HASHNODE_PUBLICATION_ID", ""),
         devto_api_key=os.getenv("DEVTO_API_KEY", ""),
@@ -47,6 +71,7 @@ def load_config() -> Config:
         postiz_base_url=os.getenv("POSTIZ_BASE_URL", "https://api.postiz.com/public/v1"),
         convertkit_api_key=os.getenv("CONVERTKIT_API_KEY", ""),
         convertkit_api_secret=os.getenv("CONVERTKIT_API_SECRET", ""),
+        convertkit_form_id=os.getenv("CONVERTKIT_FORM_ID", ""),
         dataforseo_login=os.getenv("DATAFORSEO_LOGIN", ""),
         dataforseo_password=os.getenv("DATAFORSEO_PASSWORD", ""),
     )
@@ -2,12 +2,15 @@
 
 import asyncio
 import json
-import subprocess
 from pathlib import Path
 
+from leadgen import deadline, tracing
+
 
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 
+LLM_TIMEOUT = 300  # seconds per Claude CLI call, less if the run deadline is nearer
+
 BLOG_POST_SCHEMA = {
     "type": "object",
     "properties": {
@@ -32,14 +35,55 @@ SOCIAL_POST_SCHEMA = {
     "required": ["linkedin", "x", "facebook", "instagram", "threads"],
 }
 
+VARIANT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "meta_description": {"type": "string"},
+        **SOCIAL_POST_SCHEMA["properties"],
+    },
+    "required": ["title", "meta_description", *SOCIAL_POST_SCHEMA["required"]],
+}
+
+
+def blog_post_schema(variants: int = 0) -> dict:
+    """The blog post schema, plus ``variants`` headline + social variants if asked."""
+    if not variants:
+        return BLOG_POST_SCHEMA
+    return {
+        **BLOG_POST_SCHEMA,
+        "properties": {
+            **BLOG_POST_SCHEMA["properties"],
+            "variants": {
+                "type": "array",
+                "items": VARIANT_SCHEMA,
+                "minItems": variants,
+                "maxItems": variants,
+            },
+        },
+        "required": [*BLOG_POST_SCHEMA["required"], "variants"],
+    }
+
 
 class ContentGenerator:
     """Generate blog and social content via Claude Code CLI."""
 
-    def __init__(self, model: str = "sonnet"):
+    def __init__(self, model: str = "sonnet", slots: asyncio.Semaphore | None = None):
         self.model = model
+        # Shared across generators to cap concurrent Claude CLI processes.
+        self.slots = slots
 
     async def _call_claude(self, prompt: str, schema: dict) -> dict:
+        if self.slots is None:
+            return await self._run_claude(prompt, schema)
+        async with deadline.stage("llm:wait"):
+            await self.slots.acquire()
+        try:
+            return await self._run_claude(prompt, schema)
+        finally:
+            self.slots.release()
+
+    async def _run_claude(self, prompt: str, schema: dict) -> dict:
         cmd = [
             "claude", "--print",
             "--model", self.model,
@@ -48,27 +92,45 @@ class ContentGenerator:
             prompt,
         ]
 
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            lambda: subprocess.run(
-                cmd, capture_output=True, text=True, timeout=300
-            ),
-        )
+        with tracing.span("llm", model=self.model, prompt_chars=len(prompt)) as span:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                async with deadline.stage("llm", LLM_TIMEOUT):
+                    stdout, stderr = await proc.communicate()
+            except BaseException:
+                # Timed out or cancelled: don't leave the CLI running.
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+                raise
+            span.set(returncode=proc.returncode, output_bytes=len(stdout))
 
-        if result.returncode != 0:
-            raise RuntimeError(f"Claude CLI failed: {result.stderr}")
+            if proc.returncode != 0:
+                raise RuntimeError(f"Claude CLI failed: {stderr.decode(errors='replace')}")
 
-        response = json.loads(result.stdout)
+        response = json.loads(stdout)
         return response["structured_output"]
 
     def _load_prompt(self, name: str, **kwargs: str) -> str:
         template = (PROMPTS_DIR / f"{name}.txt").read_text()
         return template.format(**kwargs)
 
-    async def generate_blog_post(self, niche: str, topic: str) -> dict:
-        prompt = self._load_prompt("blog_post", niche=niche, topic=topic)
-        return await self._call_claude(prompt, BLOG_POST_SCHEMA)
+    async def generate_blog_post(
+        self, niche: str, topic: str, keyword: str = "", variants: int = 0
+    ) -> dict:
+        """Write a post; with ``variants`` > 0 the same call also returns that many
+        alternative headlines, each with matching social copy, for A/B tests."""
+        prompt = self._load_prompt("blog_post", niche=niche, topic=topic, keyword=keyword or topic)
+        if variants:
+            prompt += "\n\n" + self._load_prompt("variants", count=str(variants))
+        post = await self._call_claude(prompt, blog_post_schema(variants))
+        if variants:
+            post["variants"] = [
+                {"id": chr(ord("a") + i), **v} for i, v in enumerate(post.get("variants", [])[:variants])
+            ]
+        return post
 
     async def repurpose_to_social(self, blog_title: str, blog_body: str) -> dict:
         prompt = self._load_prompt(
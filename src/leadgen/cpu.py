@@ -0,0 +1,204 @@
+"""Offload CPU-bound steps to a shared pool of warm worker processes.
+
+Local post-processing (drawing cards, parsing and hashing the whole archive
+for a backfill) is pure Python CPU work. On the event loop it stalls every
+request and LLM call in flight. :class:`CpuPool` keeps a
+``ProcessPoolExecutor`` sized from the cores this process may use, with its
+workers started and their imports done up front, so no task pays for
+process start-up. Inside :func:`use_pool` (the worker and the batch CLI
+commands) :func:`run` and :func:`map` send tasks there. Elsewhere they run
+in a thread, which for one small task is cheaper than starting processes.
+
+Tasks cross a process boundary, so keep them cheap to pickle: a module-level
+function (or a ``functools.partial`` of one) and small arguments such as a
+spec, a path or a slug. Let the worker read files itself. :func:`map` sends
+items in chunks, so a backfill of thousands of posts is a few dozen
+round-trips, not thousands.
+
+Each task is recorded as a ``cpu:<function>`` span (time running in a
+worker), with its ``wait_ms`` for a free worker and the pool's ``workers``.
+The pool's start-up is recorded as ``cpu:pool``. Both show in
+``leadgen stats`` and the Prometheus textfile.
+"""
+
+import asyncio
+import importlib
+import multiprocessing
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+from leadgen import tracing
+
+
+# Imported by every worker before its first task.
+WARM_MODULES = ("yaml", "leadgen.media.cards", "leadgen.publishers.hugo", "leadgen.publishers.transform")
+CHUNKS_PER_WORKER = 4  # map() batches: enough to balance load, few enough to stay cheap
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def default_workers() -> int:
+    """One worker per core this process may run on, less one for the event loop."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:  # not on Linux
+        cores = os.cpu_count() or 1
+    return max(1, cores - 1)
+
+
+def _warm(modules: tuple[str, ...]) -> None:
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _noop() -> None:
+    pass
+
+
+def _timed(func: Callable, args: tuple) -> tuple:
+    """Run ``func(*args)`` in a worker; also return when it started and took."""
+    started = time.time()
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, started, (time.perf_counter() - t0) * 1000
+
+
+def _each(func: Callable[[T], R], items: list[T]) -> list[R]:
+    return [func(item) for item in items]
+
+
+def _name(func: Callable) -> str:
+    return getattr(getattr(func, "func", func), "__name__", "task")
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class CpuPool:
+    """A process pool whose workers are started (and warmed) once, then reused."""
+
+    def __init__(self, max_workers: int | None = None, warm_modules: tuple[str, ...] = WARM_MODULES):
+        self.max_workers = max_workers or default_workers()
+        self.warm_modules = warm_modules
+        self._executor: ProcessPoolExecutor | None = None
+        self._starting: asyncio.Future | None = None
+
+    def start(self) -> "CpuPool":
+        """Start every worker now and wait until each has done its imports."""
+        if self._executor is not None:
+            return self
+        t0 = time.perf_counter()
+        # Forking a process that already runs threads (to_thread, sqlite) is
+        # unsafe, so workers come from a clean fork server where available.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._executor = ProcessPoolExecutor(
+            self.max_workers,
+            mp_context=context,
+            initializer=_warm,
+            initargs=(self.warm_modules,),
+        )
+        # One no-op per worker: each submit that finds no idle worker starts one.
+        for future in [self._executor.submit(_noop) for _ in range(self.max_workers)]:
+            future.result()
+        tracing.record("cpu:pool", (time.perf_counter() - t0) * 1000, workers=self.max_workers)
+        return self
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._starting = None
+
+    def __enter__(self) -> "CpuPool":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    async def astart(self) -> "CpuPool":
+        """:meth:`start` without blocking the event loop (concurrent callers share it)."""
+        if self._executor is None:
+            if self._starting is None:
+                self._starting = asyncio.ensure_future(asyncio.to_thread(self.start))
+            await asyncio.shield(self._starting)
+        return self
+
+    async def __aenter__(self) -> "CpuPool":
+        return await self.astart()
+
+    async def __aexit__(self, *exc) -> None:
+        await asyncio.to_thread(self.close)
+
+    async def run(self, func: Callable[..., R], *args) -> R:
+        """``func(*args)`` in a worker process."""
+        return await self._submit(_name(func), func, *args)
+
+    async def map(self, func: Callable[[T], R], items: Iterable[T], chunksize: int | None = None) -> list[R]:
+        """``[func(item) for item in items]``, spread over the workers in chunks."""
+        items = list(items)
+        if not items:
+            return []
+        size = chunksize or -(-len(items) // (self.max_workers * CHUNKS_PER_WORKER))
+        results = await asyncio.gather(
+            *(self._submit(_name(func), _each, func, chunk) for chunk in _chunks(items, size))
+        )
+        return [r for chunk in results for r in chunk]
+
+    async def _submit(self, name: str, func: Callable, *args):
+        executor = (await self.astart())._executor
+        submitted = time.time()
+        result, started, ms = await asyncio.get_running_loop().run_in_executor(
+            executor, _timed, func, args
+        )
+        tracing.record(
+            f"cpu:{name}", ms,
+            wait_ms=round(max(0.0, started - submitted) * 1000, 3),
+            workers=self.max_workers,
+        )
+        return result
+
+
+_pool: ContextVar[CpuPool | None] = ContextVar("leadgen_cpu", default=None)
+
+
+@contextmanager
+def use_pool(pool: CpuPool) -> Iterator[CpuPool]:
+    """Send every :func:`run` and :func:`map` in this context to ``pool``."""
+    token = _pool.set(pool)
+    try:
+        yield pool
+    finally:
+        _pool.reset(token)
+
+
+async def run(func: Callable[..., R], *args) -> R:
+    """``func(*args)`` on the active pool, else in a thread."""
+    pool = _pool.get()
+    if pool is not None:
+        return await pool.run(func, *args)
+    return await _in_thread(_name(func), func, *args)
+
+
+async def map(func: Callable[[T], R], items: Iterable[T], chunksize: int | None = None) -> list[R]:
+    """``[func(item) for item in items]`` on the active pool, else in a thread."""
+    pool = _pool.get()
+    if pool is not None:
+        return await pool.map(func, items, chunksize)
+    items = list(items)
+    return await _in_thread(_name(func), _each, func, items) if items else []
+
+
+async def _in_thread(name: str, func: Callable, *args):
+    t0 = time.perf_counter()
+    result = await asyncio.to_thread(func, *args)
+    tracing.record(f"cpu:{name}", (time.perf_counter() - t0) * 1000, workers=0)
+    return result
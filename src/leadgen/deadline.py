@@ -0,0 +1,80 @@
+"""Run-level deadlines with per-stage budgets.
+
+:func:`deadline` sets an absolute end time in a context variable, so it
+follows the run into every task and ``to_thread`` call it starts. Each stage
+asks :func:`budget` for its time: its own cap, cut down to what is left of
+the run. :func:`stage` enforces that budget with ``asyncio.timeout``. On
+expiry the stage is cancelled, its cleanup runs (the Claude subprocess is
+killed, httpx closes the socket) and :class:`DeadlineExceeded` is raised.
+Outside any deadline, stages keep their old flat caps.
+"""
+
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+
+_deadline: ContextVar[float | None] = ContextVar("leadgen_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The run's deadline passed before a stage could finish."""
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Bound everything run in this context to ``seconds`` (``None``: no bound).
+
+    Nested deadlines can only shorten the outer one.
+    """
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(at if outer is None else min(at, outer))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the deadline, or ``None`` if there is none."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def short(seconds: float) -> bool:
+    """Whether less than ``seconds`` are left (never, without a deadline)."""
+    left = remaining()
+    return left is not None and left < seconds
+
+
+def budget(cap: float | None = None, name: str = "stage") -> float | None:
+    """Time for the next stage: ``cap`` cut down to what is left of the run.
+
+    Raises :class:`DeadlineExceeded` if the deadline has already passed.
+    """
+    left = remaining()
+    if left is None:
+        return cap
+    if left <= 0:
+        raise DeadlineExceeded(f"{name}: deadline already passed")
+    return left if cap is None else min(cap, left)
+
+
+@asynccontextmanager
+async def stage(name: str, cap: float | None = None) -> AsyncIterator[None]:
+    """Cancel the block if it outlives its :func:`budget`."""
+    import asyncio
+
+    timeout = asyncio.timeout(budget(cap, name))
+    try:
+        async with timeout:
+            yield
+    except TimeoutError:
+        if not timeout.expired():
+            raise
+        raise DeadlineExceeded(f"{name}: out of time") from None
@@ -6,8 +6,10 @@ Auth: Raw API key in Authorization header (no Bearer prefix).
 """
 
 from datetime import datetime, timezone
+from hashlib import sha256
 
-import httpx
+from leadgen.http import session
+from leadgen.resilience import IdempotencyStore, idempotency_key, once
 
 
 DEFAULT_BASE_URL = "https://api.postiz.com/public/v1"
@@ -28,11 +30,21 @@ PLATFORM_SETTINGS = {
 
 
 class PostizDistributor:
-    """Distribute social posts through Postiz (27+ platforms)."""
+    """Distribute social posts through Postiz (27+ platforms).
 
-    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL):
+    With a ``ledger``, scheduling the same posts for the same date twice (a
+    retried job) returns the first result instead of scheduling them again.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = DEFAULT_BASE_URL,
+        ledger: IdempotencyStore | None = None,
+    ):
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
+        self.ledger = ledger
 
     def _headers(self) -> dict:
         return {
@@ -41,7 +53,7 @@ class PostizDistributor:
         }
 
     async def check_connection(self) -> bool:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with session() as client:
             resp = await client.get(
                 f"{self.base_url}/check-connection",
                 headers=self._headers(),
@@ -50,13 +62,38 @@ class PostizDistributor:
             return resp.status_code == 200
 
     async def get_integrations(self) -> list[dict]:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with session() as client:
             resp = await client.get(
                 f"{self.base_url}/integrations",
                 headers=self._headers(),
             )
             resp.raise_for_status()
-            return await resp.json()
+            return resp.json()
+
+    async def get_analytics(self, integration_id: str, days: int = 7) -> list[dict]:
+        """Daily metrics for one channel over the last ``days``.
+
+        Returns ``[{"label": "Impressions", "data": [{"total", "date"}, ...]}, ...]``.
+        """
+        async with session() as client:
+            resp = await client.get(
+                f"{self.base_url}/analytics/{integration_id}",
+                params={"date": days},
+                headers=self._headers(),
+            )
+            resp.raise_for_status()
+            return resp.json()
+
+    async def upload(self, filename: str, data: bytes, content_type: str = "image/png") -> dict:
+        """Upload a media file; returns ``{"id", "path", ...}`` for a post's ``image`` list."""
+        async with session() as client:
+            resp = await client.post(
+                f"{self.base_url}/upload",
+                files={"file": (filename, data, content_type)},
+                headers={"Authorization": self.api_key},
+            )
+            resp.raise_for_status()
+            return resp.json()
 
     async def schedule_post(
         self,
@@ -91,14 +128,22 @@ class PostizDistributor:
             ],
         }
 
-        async with httpx.AsyncClient(timeout=30) as client:
+        account = sha256(self.api_key.encode()).hexdigest()[:16]
+        return await once(
+            self.ledger,
+            idempotency_key("postiz", self.base_url, account, payload),
+            lambda: self._create_posts(payload),
+        )
+
+    async def _create_posts(self, payload: dict) -> list[dict]:
+        async with session() as client:
             resp = await client.post(
                 f"{self.base_url}/posts",
                 json=payload,
                 headers=self._headers(),
             )
             resp.raise_for_status()
-            return await resp.json()
+            return resp.json()
 
     async def post_now(
         self,
@@ -129,11 +174,5 @@ class PostizDistributor:
             ],
         }
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(
-                f"{self.base_url}/posts",
-                json=payload,
-                headers=self._headers(),
-            )
-            resp.raise_for_status()
-            return await resp.json()
+        # Not deduplicated: an immediate post is meant to go out each time.
+        return await self._create_posts(payload)
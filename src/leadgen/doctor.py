@@ -0,0 +1,112 @@
+"""Environment and startup-time diagnostics for ``leadgen doctor``."""
+
+import shutil
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+
+# Cold start of `leadgen status` (import + run, excluding interpreter boot).
+STARTUP_BUDGET_MS = 150
+
+# Modules that lightweight commands must not import.
+HEAVY_MODULES = ("asyncio", "httpx", "yaml", "sqlite3", "leadgen.pipeline")
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+from leadgen.cli import main
+main({argv!r}, standalone_mode=False)
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print("\\n@@leadgen-startup", round(elapsed, 2), ",".join(heavy))
+"""
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupReport:
+    command: list[str]
+    elapsed_ms: float
+    heavy_modules: list[str]
+    imports: list[ImportRecord] = field(default_factory=list)
+
+    @property
+    def within_budget(self) -> bool:
+        return self.elapsed_ms <= STARTUP_BUDGET_MS and not self.heavy_modules
+
+    def top_imports(self, n: int = 10) -> list[ImportRecord]:
+        """Slowest imports made under ``leadgen.cli`` (not interpreter boot)."""
+        # importtime prints children before their parent, one indent deeper.
+        end = next(
+            (i for i, r in enumerate(self.imports) if r.module == "leadgen.cli"), None
+        )
+        scoped = self.imports
+        if end is not None:
+            begin = end
+            while begin > 0 and self.imports[begin - 1].depth > self.imports[end].depth:
+                begin -= 1
+            scoped = self.imports[begin:end + 1]
+        return sorted(scoped, key=lambda r: r.cumulative_us, reverse=True)[:n]
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """Parse ``python -X importtime`` output."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        module = parts[2].rstrip()
+        depth = (len(module) - len(module.lstrip())) // 2
+        records.append(
+            ImportRecord(module.strip(), int(parts[0]), int(parts[1]), depth)
+        )
+    return records
+
+
+def measure_startup(command: list[str] | None = None) -> StartupReport:
+    """Run ``leadgen <command>`` in a fresh interpreter with ``-X importtime``."""
+    command = command or ["status"]
+    probe = _PROBE.format(argv=command, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+    )
+    marker = next(
+        (line for line in result.stdout.splitlines() if line.startswith("@@leadgen-startup")),
+        None,
+    )
+    if result.returncode != 0 or marker is None:
+        raise RuntimeError(f"Startup probe failed: {result.stderr[-2000:]}")
+
+    _, elapsed, *heavy = marker.split(" ")
+    return StartupReport(
+        command=command,
+        elapsed_ms=float(elapsed),
+        heavy_modules=[m for m in "".join(heavy).split(",") if m],
+        imports=parse_importtime(result.stderr),
+    )
+
+
+def check_environment() -> list[tuple[str, bool, str]]:
+    """Check external tools the pipeline shells out to."""
+    checks = []
+    for tool, purpose in (
+        ("claude", "content generation"),
+        ("git", "publishing"),
+        ("hugo", "local blog builds"),
+    ):
+        path = shutil.which(tool)
+        checks.append((tool, path is not None, path or f"not found ({purpose})"))
+    return checks
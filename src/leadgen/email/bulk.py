@@ -0,0 +1,192 @@
+"""Bulk subscriber import into ConvertKit with concurrency and rate control.
+
+ConvertKit v3 allows roughly 120 requests per minute per API key, so imports
+run a fixed pool of workers behind a shared token bucket. Each finished email
+is appended to a JSON-lines progress file; re-running the same import skips
+everything already recorded as done.
+
+Retries come from the shared transport (:mod:`leadgen.resilience`), which
+takes a token from the bucket before every attempt, retries included. Adding
+a subscriber to a form is an upsert, so every failure is safe to retry.
+"""
+
+import asyncio
+import csv
+import json
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from leadgen.email.convertkit import ConvertKitClient
+from leadgen.email.dedupe import DedupeIndex
+from leadgen.email.normalize import canonical_email, is_valid_email, normalize_email
+from leadgen.http import session
+from leadgen.resilience import RetryPolicy, retry_policy
+
+
+EMAIL_COLUMNS = ("email", "email_address", "e-mail")
+NAME_COLUMNS = ("first_name", "firstname", "name")
+
+
+def iter_csv_leads(path: str | Path) -> Iterator[dict]:
+    """Stream ``{"email", "first_name"}`` rows from a CSV export.
+
+    Column names are matched case-insensitively against common spellings so
+    exports from other CRMs work without editing.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+        email_col = next((columns[c] for c in EMAIL_COLUMNS if c in columns), None)
+        if email_col is None:
+            raise ValueError(f"No email column in {path}; expected one of {EMAIL_COLUMNS}")
+        name_col = next((columns[c] for c in NAME_COLUMNS if c in columns), None)
+
+        for row in reader:
+            yield {
+                "email": row.get(email_col) or "",
+                "first_name": (row.get(name_col) or "").strip() if name_col else "",
+            }
+
+
+class RateLimiter:
+    """Token bucket shared by all import workers."""
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        self.rate = per_minute / 60
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ImportProgress:
+    """Append-only record of emails already handled by an import."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.done: set[str] = set()
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn final line from an interrupted run
+                    if entry.get("status") == "ok":
+                        self.done.add(entry["email"])
+        self._file = open(self.path, "a")
+        if self._file.tell() and not self.path.read_bytes().endswith(b"\n"):
+            self._file.write("\n")
+
+    def record(self, email: str, status: str, error: str = "") -> None:
+        entry = {"email": email, "status": status}
+        if error:
+            entry["error"] = error
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        if status == "ok":
+            self.done.add(email)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    already_done: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    known: int = 0
+    failed: int = 0
+
+
+class BulkImporter:
+    """Import many leads into one ConvertKit form."""
+
+    def __init__(
+        self,
+        client: ConvertKitClient,
+        form_id: str,
+        concurrency: int = 8,
+        requests_per_minute: float = 110,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        dedupe: DedupeIndex | None = None,
+    ):
+        self.client = client
+        self.dedupe = dedupe
+        self.form_id = form_id
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(requests_per_minute, burst=concurrency)
+        self.retry = RetryPolicy(
+            max_retries=max_retries, backoff=backoff, idempotent=True, throttle=self.limiter.acquire
+        )
+
+    async def _subscribe(self, http: httpx.AsyncClient, lead: dict) -> None:
+        with retry_policy(self.retry):
+            await self.client.add_subscriber_to_form(
+                self.form_id, lead["email"], lead["first_name"], http=http
+            )
+
+    async def run(self, leads: Iterable[dict], progress: ImportProgress) -> ImportResult:
+        result = ImportResult()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        seen: set[str] = set()
+
+        async def worker(http: httpx.AsyncClient) -> None:
+            while (lead := await queue.get()) is not None:
+                try:
+                    await self._subscribe(http, lead)
+                except Exception as exc:
+                    result.failed += 1
+                    progress.record(lead["email"], "failed", str(exc))
+                else:
+                    result.imported += 1
+                    progress.record(lead["email"], "ok")
+                    if self.dedupe is not None:
+                        self.dedupe.add(lead["email"])
+
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with session(limits=limits) as http:
+            workers = [asyncio.create_task(worker(http)) for _ in range(self.concurrency)]
+            try:
+                for lead in leads:
+                    email = normalize_email(lead["email"])
+                    key = canonical_email(email)
+                    if not is_valid_email(email):
+                        result.invalid += 1
+                    elif key in seen:
+                        result.duplicates += 1
+                    elif email in progress.done:
+                        result.already_done += 1
+                    elif self.dedupe is not None and self.dedupe.seen(email):
+                        result.known += 1
+                    else:
+                        seen.add(key)
+                        await queue.put({**lead, "email": email})
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+            finally:
+                for task in workers:
+                    task.cancel()
+                if self.dedupe is not None:
+                    self.dedupe.save()
+
+        return result
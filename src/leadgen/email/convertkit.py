@@ -1,7 +1,12 @@
 """ConvertKit API client (free tier: 10K subscribers, unlimited emails)."""
 
+from collections.abc import AsyncIterator
+from datetime import date
+
 import httpx
 
+from leadgen.http import session
+
 
 CONVERTKIT_API = "https://api.convertkit.com/v3"
 
@@ -18,27 +23,76 @@ class ConvertKitClient:
         form_id: str,
         email: str,
         first_name: str = "",
+        http: httpx.AsyncClient | None = None,
+        fields: dict | None = None,
     ) -> dict:
+        """Subscribe one email to a form.
+
+        Pass ``http`` to reuse an open client (bulk imports do); otherwise a
+        client is created for this call. ``fields`` sets custom fields
+        (e.g. ``source``), which must exist in the ConvertKit account.
+        """
         payload = {
             "api_key": self.api_key,
             "email": email,
         }
         if first_name:
             payload["first_name"] = first_name
+        if fields:
+            payload["fields"] = fields
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(
-                f"{CONVERTKIT_API}/forms/{form_id}/subscribe",
-                json=payload,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        if http is not None:
+            return await self._subscribe(http, form_id, payload)
+        async with session() as client:
+            return await self._subscribe(client, form_id, payload)
+
+    async def _subscribe(
+        self, client: httpx.AsyncClient, form_id: str, payload: dict
+    ) -> dict:
+        resp = await client.post(
+            f"{CONVERTKIT_API}/forms/{form_id}/subscribe",
+            json=payload,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def list_subscribers(self) -> dict:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with session() as client:
             resp = await client.get(
                 f"{CONVERTKIT_API}/subscribers",
                 params={"api_secret": self.api_secret},
             )
             resp.raise_for_status()
             return resp.json()
+
+    async def iter_subscribers(
+        self,
+        updated_from: date | None = None,
+        http: httpx.AsyncClient | None = None,
+    ) -> AsyncIterator[dict]:
+        """Yield every subscriber, following ``page`` until ``total_pages``.
+
+        ``updated_from`` limits the listing to subscribers changed on or after
+        that day (ConvertKit filters by date, not timestamp).
+        """
+        params = {"api_secret": self.api_secret, "sort_order": "asc"}
+        if updated_from is not None:
+            params["updated_from"] = updated_from.isoformat()
+
+        if http is None:
+            async with session() as client:
+                async for subscriber in self.iter_subscribers(updated_from, client):
+                    yield subscriber
+            return
+
+        page, total_pages = 1, 1
+        while page <= total_pages:
+            resp = await http.get(
+                f"{CONVERTKIT_API}/subscribers", params={**params, "page": page}
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            for subscriber in data.get("subscribers", []):
+                yield subscriber
+            total_pages = data.get("total_pages") or 1
+            page += 1
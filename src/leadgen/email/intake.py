@@ -0,0 +1,287 @@
+"""Inbound lead capture with write-behind delivery to ConvertKit.
+
+Form posts are validated and appended to a local JSON-lines journal, then
+acknowledged immediately. A background flusher reads the journal in batches
+and subscribes the leads through ConvertKit, backing off while ConvertKit is
+slow, down or misconfigured. The journal cursor only advances past leads
+that were delivered or rejected as invalid (a 400 or 422), so nothing is
+lost across restarts or while ConvertKit refuses the account.
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from leadgen.email.convertkit import ConvertKitClient
+from leadgen.email.dedupe import DedupeIndex
+from leadgen.email.normalize import canonical_email, is_valid_email, normalize_email
+from leadgen.http import session
+from leadgen.resilience import backoff
+from leadgen.server import HttpServer, Request, Response
+
+
+OPTIONAL_FIELDS = ("first_name", "industry", "source")
+MAX_FIELD_LENGTH = 200
+COMPACT_AT = 1024 * 1024  # truncate a fully-flushed journal past 1 MiB
+REJECTED_STATUSES = frozenset({400, 422})  # ConvertKit refused this lead's data
+
+
+def validate_lead(data) -> dict:
+    """Return a clean lead dict or raise ``ValueError``."""
+    if not isinstance(data, dict):
+        raise ValueError("expected an object")
+    email = normalize_email(str(data.get("email") or ""))
+    if len(email) > MAX_FIELD_LENGTH or not is_valid_email(email):
+        raise ValueError("invalid email")
+    lead = {"email": email}
+    for name in OPTIONAL_FIELDS:
+        value = str(data.get(name) or "").strip()
+        if value:
+            lead[name] = value[:MAX_FIELD_LENGTH]
+    return lead
+
+
+class LeadJournal:
+    """Durable append-only queue of captured leads."""
+
+    def __init__(self, directory: str | Path):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.dir / "journal.jsonl"
+        self.cursor_path = self.dir / "journal.cursor"
+        self.rejected_path = self.dir / "rejected.jsonl"
+        self._writer = open(self.path, "ab")
+        self._reader = open(self.path, "rb")
+        self.cursor = int(self.cursor_path.read_text() or 0) if self.cursor_path.exists() else 0
+        if self.cursor > self.path.stat().st_size:
+            # Journal compacted under a cursor from before the compaction.
+            self.cursor = 0
+        self.pending = self._count_pending()
+        self._unsynced = False
+
+    def _count_pending(self) -> int:
+        self._reader.seek(self.cursor)
+        return sum(1 for line in self._reader if line.endswith(b"\n"))
+
+    def append(self, lead: dict) -> None:
+        """Record a lead; durable against process crashes once this returns."""
+        self._writer.write(json.dumps(lead).encode() + b"\n")
+        self._writer.flush()
+        self.pending += 1
+        self._unsynced = True
+
+    def sync(self) -> None:
+        """fsync appended leads (called periodically, not per request)."""
+        if self._unsynced:
+            os.fsync(self._writer.fileno())
+            self._unsynced = False
+
+    def read_batch(self, limit: int) -> list[tuple[dict, int]]:
+        """Return up to ``limit`` unflushed leads with their end offsets."""
+        batch = []
+        self._reader.seek(self.cursor)
+        offset = self.cursor
+        for line in self._reader:
+            if not line.endswith(b"\n") or len(batch) >= limit:
+                break
+            offset += len(line)
+            batch.append((json.loads(line), offset))
+        return batch
+
+    def commit(self, offset: int, delivered: int) -> None:
+        """Advance the cursor past ``delivered`` leads ending at ``offset``."""
+        self.sync()
+        if offset == self._writer.tell() and offset >= COMPACT_AT:
+            # Cursor first: a crash before the truncate then re-sends the
+            # flushed leads (subscribing is idempotent) instead of skipping
+            # whatever is appended to the emptied journal.
+            self._write_cursor(0)
+            self._writer.truncate(0)
+            self._writer.seek(0)
+            offset = 0
+        else:
+            self._write_cursor(offset)
+        self.cursor = offset
+        self.pending -= delivered
+
+    def _write_cursor(self, offset: int) -> None:
+        tmp = self.cursor_path.with_suffix(".tmp")
+        tmp.write_text(str(offset))
+        os.replace(tmp, self.cursor_path)
+
+    def reject(self, lead: dict, reason: str) -> None:
+        with open(self.rejected_path, "a") as f:
+            f.write(json.dumps({**lead, "error": reason}) + "\n")
+
+    def close(self) -> None:
+        self.sync()
+        self._writer.close()
+        self._reader.close()
+
+
+def _is_rejection(exc: Exception) -> bool:
+    # Only ConvertKit refusing the lead itself drops it. Anything else (a
+    # revoked key, a wrong form ID, an outage) keeps every lead journaled.
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in REJECTED_STATUSES
+
+
+class LeadFlusher:
+    """Deliver journaled leads to a ConvertKit form in batches."""
+
+    def __init__(
+        self,
+        journal: LeadJournal,
+        client: ConvertKitClient,
+        form_id: str,
+        batch_size: int = 50,
+        concurrency: int = 8,
+        interval: float = 1.0,
+        max_backoff: float = 300.0,
+        dedupe: DedupeIndex | None = None,
+    ):
+        self.journal = journal
+        self.dedupe = dedupe
+        self.skipped = 0
+        self.client = client
+        self.form_id = form_id
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.interval = interval
+        self.max_backoff = max_backoff
+
+    async def flush_once(self, http: httpx.AsyncClient) -> int:
+        """Send one batch; raises if ConvertKit failed.
+
+        Returns how many leads were handled: delivered, skipped as duplicates
+        or rejected. ``run`` compares it with ``batch_size`` to keep draining.
+        """
+        batch = self.journal.read_batch(self.batch_size)
+        if not batch:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batch_keys: set[str] = set()
+
+        def is_duplicate(lead: dict) -> bool:
+            key = canonical_email(lead["email"])
+            if key in batch_keys or (self.dedupe is not None and self.dedupe.seen(key)):
+                return True
+            batch_keys.add(key)
+            return False
+
+        async def send(lead: dict):
+            if is_duplicate(lead):
+                self.skipped += 1
+                return None
+            async with semaphore:
+                return await self.client.add_subscriber_to_form(
+                    self.form_id,
+                    lead["email"],
+                    lead.get("first_name", ""),
+                    http=http,
+                    fields={"source": lead["source"]} if lead.get("source") else None,
+                )
+
+        results = await asyncio.gather(
+            *(send(lead) for lead, _ in batch), return_exceptions=True
+        )
+
+        # Only advance over the leading run of finished leads; anything after
+        # a transient failure is re-sent next time (subscribing is idempotent).
+        done, offset, failure = 0, self.journal.cursor, None
+        for (lead, end), result in zip(batch, results):
+            if isinstance(result, Exception):
+                if not _is_rejection(result):
+                    failure = result
+                    break
+                self.journal.reject(lead, str(result))
+            elif result is not None and self.dedupe is not None:
+                self.dedupe.add(lead["email"])
+            done += 1
+            offset = end
+        if done:
+            self.journal.commit(offset, done)
+        if failure is not None:
+            raise failure
+        return done
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Flush until ``stop`` is set, backing off (jittered, capped) on errors."""
+        delay, failures = self.interval, 0
+        async with session() as http:
+            while not stop.is_set():
+                try:
+                    handled = await self.flush_once(http)
+                    self.journal.sync()
+                    delay, failures = self.interval, 0
+                    if handled == self.batch_size:
+                        continue  # backlog: keep draining
+                except Exception:
+                    failures += 1
+                    delay = self.interval + backoff(failures, self.interval, self.max_backoff)
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        if self.dedupe is not None:
+            self.dedupe.save()
+
+
+class LeadIntake:
+    """HTTP handler accepting lead submissions from forms."""
+
+    def __init__(self, journal: LeadJournal, allowed_origin: str = "*"):
+        self.journal = journal
+        self.cors = {
+            "Access-Control-Allow-Origin": allowed_origin,
+            "Access-Control-Allow-Methods": "POST, OPTIONS",
+            "Access-Control-Allow-Headers": "Content-Type",
+        }
+
+    async def handle(self, request: Request) -> Response:
+        if request.method == "OPTIONS":
+            return Response(204, headers=self.cors)
+        if request.path == "/health" and request.method == "GET":
+            return Response.json({"status": "ok", "pending": self.journal.pending})
+        if request.path != "/leads":
+            return Response.json({"error": "not found"}, 404, self.cors)
+        if request.method != "POST":
+            return Response.json({"error": "method not allowed"}, 405, self.cors)
+
+        try:
+            if request.headers.get("content-type", "").startswith("application/json"):
+                data = request.json()
+            else:
+                data = request.form()
+            lead = validate_lead(data)
+        except ValueError as exc:
+            return Response.json({"error": str(exc)}, 400, self.cors)
+
+        lead["received_at"] = datetime.now(timezone.utc).isoformat()
+        self.journal.append(lead)
+        return Response.json({"status": "queued"}, 202, self.cors)
+
+
+async def serve_leads(
+    journal: LeadJournal,
+    flusher: LeadFlusher,
+    host: str = "127.0.0.1",
+    port: int = 8787,
+    allowed_origin: str = "*",
+) -> None:
+    """Run the intake endpoint and the flusher until cancelled."""
+    server = HttpServer(LeadIntake(journal, allowed_origin).handle)
+    await server.start(host, port)
+    stop = asyncio.Event()
+    flush_task = asyncio.create_task(flusher.run(stop))
+    try:
+        await server.serve_forever()
+    finally:
+        stop.set()
+        await server.close()
+        await flush_task
+        journal.close()
@@ -0,0 +1,145 @@
+"""Local mirror of the ConvertKit subscriber list.
+
+The mirror lives in SQLite and is refreshed incrementally: each sync asks
+ConvertKit only for subscribers updated since the previous sync day. Email
+lookups are served from an in-memory set loaded once from the mirror.
+"""
+
+import sqlite3
+from collections.abc import Iterable
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from leadgen.email.convertkit import ConvertKitClient
+from leadgen.email.normalize import canonical_email, normalize_email
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscribers (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    first_name TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL DEFAULT '',
+    synced_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+BATCH_SIZE = 500
+
+
+class SubscriberMirror:
+    """SQLite copy of ConvertKit subscribers with O(1) membership checks."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+        self._emails: set[str] | None = None
+
+    def __enter__(self) -> "SubscriberMirror":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @property
+    def last_sync(self) -> datetime | None:
+        row = self.conn.execute(
+            "SELECT value FROM sync_state WHERE key = 'last_sync'"
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM subscribers").fetchone()[0]
+
+    def emails(self) -> list[str]:
+        """Addresses of active subscribers."""
+        return [
+            email
+            for (email,) in self.conn.execute(
+                "SELECT email FROM subscribers WHERE state != 'cancelled'"
+            )
+        ]
+
+    def contains(self, email: str) -> bool:
+        """Is ``email`` (or a plus/dot variant) an active subscriber?"""
+        if self._emails is None:
+            self._emails = {canonical_email(e) for e in self.emails()}
+        return canonical_email(email) in self._emails
+
+    def upsert(self, subscribers: Iterable[dict], synced_at: str) -> int:
+        rows = [
+            (
+                s["id"],
+                normalize_email(s["email_address"]),
+                s.get("first_name") or "",
+                s.get("state") or "",
+                s.get("created_at") or "",
+                synced_at,
+            )
+            for s in subscribers
+        ]
+        with self.conn:
+            for row in rows:
+                # ConvertKit may hand an address to a new subscriber id (e.g.
+                # after a delete and re-subscribe); the newest record wins.
+                self.conn.execute(
+                    "DELETE FROM subscribers WHERE email = ? AND id != ?", (row[1], row[0])
+                )
+                self.conn.execute(
+                    """
+                    INSERT INTO subscribers (id, email, first_name, state, created_at, synced_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (id) DO UPDATE SET
+                        email = excluded.email,
+                        first_name = excluded.first_name,
+                        state = excluded.state,
+                        synced_at = excluded.synced_at
+                    """,
+                    row,
+                )
+        self._emails = None
+        return len(rows)
+
+    async def sync(self, client: ConvertKitClient, full: bool = False) -> int:
+        """Pull changes since the last sync (or everything if ``full``).
+
+        Returns the number of subscriber records written.
+        """
+        started = datetime.now(timezone.utc)
+        since: date | None = None
+        if not full and self.last_sync is not None:
+            since = self.last_sync.date()
+
+        synced_at = started.isoformat()
+        written = 0
+        batch: list[dict] = []
+        async for subscriber in client.iter_subscribers(updated_from=since):
+            batch.append(subscriber)
+            if len(batch) >= BATCH_SIZE:
+                written += self.upsert(batch, synced_at)
+                batch.clear()
+        if batch:
+            written += self.upsert(batch, synced_at)
+
+        with self.conn:
+            if full:
+                # Anything not seen in a complete listing was deleted upstream.
+                self.conn.execute(
+                    "DELETE FROM subscribers WHERE synced_at != ?", (synced_at,)
+                )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('last_sync', ?)",
+                (synced_at,),
+            )
+        self._emails = None
+        return written
@@ -0,0 +1,37 @@
+"""Email address normalization for lead deduplication.
+
+Two forms are used:
+
+* ``normalize_email`` is the address we actually send to ConvertKit:
+  trimmed and lowercased.
+* ``canonical_email`` is the dedupe key: plus-tags are dropped
+  (``ana+promo@x.com`` -> ``ana@x.com``) and, for Gmail, dots in the local
+  part are ignored and ``googlemail.com`` folds into ``gmail.com``. Never
+  send the canonical form; it may not be a deliverable address.
+"""
+
+import re
+
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+GMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def is_valid_email(email: str) -> bool:
+    return bool(EMAIL_RE.match(email))
+
+
+def canonical_email(email: str) -> str:
+    """Collapse case, plus-tag and Gmail dot variants of an address."""
+    local, _, domain = normalize_email(email).rpartition("@")
+    if not local:
+        return domain
+    local = local.split("+", 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local = local.replace(".", "")
+        domain = "gmail.com"
+    return f"{local}@{domain}"
@@ -0,0 +1,110 @@
+"""Shared HTTP client handling for the API wrappers.
+
+Every wrapper opens its client with :func:`session`. On its own that gives a
+fresh ``httpx.AsyncClient`` per call, as the one-off CLI commands always had.
+Inside :func:`use_client` (the multi-site orchestrator and the worker) every
+call reuses one pooled client instead, so many sites share warm connections
+rather than each paying for DNS and TLS on every request.
+
+Every client also carries event hooks that record each request as a
+``http:<host>`` span when a :func:`leadgen.tracing.trace` is active, and
+that cut each request's timeouts down to what is left of the run's
+:mod:`leadgen.deadline`. Its transport retries transient failures and fails
+fast while a host is down (see :mod:`leadgen.resilience`).
+"""
+
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from weakref import WeakKeyDictionary
+
+import httpx
+
+from leadgen import deadline, resilience, tracing
+
+
+TIMEOUT = 30
+
+_shared: ContextVar[httpx.AsyncClient | None] = ContextVar("leadgen_http", default=None)
+_started: WeakKeyDictionary = WeakKeyDictionary()
+
+
+async def _on_request(request: httpx.Request) -> None:
+    left = deadline.budget(name=f"http:{request.url.host}")
+    if left is not None:
+        timeouts = request.extensions.get("timeout", {})
+        request.extensions["timeout"] = {
+            phase: left if t is None else min(t, left)
+            for phase, t in {"connect": None, "read": None, "write": None, "pool": None, **timeouts}.items()
+        }
+    if tracing.active():
+        _started[request] = time.perf_counter()
+
+
+async def _on_response(response: httpx.Response) -> None:
+    started = _started.pop(response.request, None)
+    if started is None:
+        return
+    request = response.request
+    tracing.record(
+        f"http:{request.url.host}",
+        (time.perf_counter() - started) * 1000,
+        outcome="ok" if response.status_code < 400 else "error",
+        method=request.method,
+        path=request.url.path,
+        status=response.status_code,
+        request_bytes=len(request.content) if isinstance(request.stream, httpx.ByteStream) else None,
+        response_bytes=int(response.headers.get("content-length", 0)) or None,
+    )
+
+
+EVENT_HOOKS = {"request": [_on_request], "response": [_on_response]}
+
+
+def _install_hooks(client: httpx.AsyncClient) -> None:
+    hooks = client.event_hooks
+    for kind, funcs in EVENT_HOOKS.items():
+        for func in funcs:
+            if func not in hooks[kind]:
+                hooks[kind].append(func)
+    client.event_hooks = hooks
+
+
+@asynccontextmanager
+async def session(**kwargs) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the shared client if one is active, else a short-lived one.
+
+    ``kwargs`` (e.g. ``limits``) only apply to the short-lived client.
+    """
+    client = _shared.get()
+    if client is not None:
+        yield client
+        return
+    async with httpx.AsyncClient(timeout=TIMEOUT, event_hooks=EVENT_HOOKS, **kwargs) as client:
+        resilience.install(client)
+        yield client
+
+
+@contextmanager
+def use_client(client: httpx.AsyncClient) -> Iterator[httpx.AsyncClient]:
+    """Route every :func:`session` in this context (and its tasks) to ``client``."""
+    _install_hooks(client)
+    resilience.install(client)
+    token = _shared.set(client)
+    try:
+        yield client
+    finally:
+        _shared.reset(token)
+
+
+def pooled_client(max_connections: int = 50, max_keepalive: int = 20) -> httpx.AsyncClient:
+    """A client sized to be shared by many concurrent jobs."""
+    return httpx.AsyncClient(
+        timeout=TIMEOUT,
+        event_hooks=EVENT_HOOKS,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+        ),
+    )
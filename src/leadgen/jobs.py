@@ -0,0 +1,218 @@
+"""Durable SQLite job queue for the leadgen worker.
+
+Jobs are claimed with a visibility timeout: a claimed job is leased to one
+worker until ``lease_expires``; if that worker dies the lease lapses and the
+job becomes claimable again (or, after ``max_attempts`` leases, fails with
+"lease expired"). Failures are retried with exponential backoff
+until ``max_attempts`` is reached.
+
+A worker whose lease lapsed no longer owns its job: another worker may have
+claimed it (bumping ``attempts``). Completing or failing it then raises
+:class:`LeaseLost` instead of overwriting the new owner's state.
+"""
+
+import json
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    available_at REAL NOT NULL,
+    lease_expires REAL,
+    last_error TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+"""
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class LeaseLost(Exception):
+    """The job's lease lapsed and it was claimed again (or finished) elsewhere."""
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+
+
+class JobQueue:
+    """Queue stored in one SQLite file, safe to share between processes."""
+
+    def __init__(self, path: str | Path, backoff: float = 30.0, max_backoff: float = 3600.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict | None = None,
+        delay: float = 0,
+        max_attempts: int = 5,
+    ) -> int:
+        now = time.time()
+        cur = self.conn.execute(
+            """
+            INSERT INTO jobs (kind, payload, max_attempts, available_at, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (kind, json.dumps(payload or {}), max_attempts, now + delay, now),
+        )
+        return cur.lastrowid
+
+    def claim(self, visibility_timeout: float) -> Job | None:
+        """Lease the next ready job, or return ``None`` if there is none."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A job whose worker died on every attempt (OOM, SIGKILL) never
+            # reached fail(); give up on it rather than lease it forever.
+            self.conn.execute(
+                """
+                UPDATE jobs SET status = ?, last_error = ?, finished_at = ?, lease_expires = NULL
+                WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts
+                """,
+                (FAILED, "lease expired", now, RUNNING, now),
+            )
+            row = self.conn.execute(
+                """
+                SELECT id, kind, payload, attempts, max_attempts FROM jobs
+                WHERE (status = ? AND available_at <= ?)
+                   OR (status = ? AND lease_expires < ?)
+                ORDER BY available_at, id LIMIT 1
+                """,
+                (QUEUED, now, RUNNING, now),
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                """
+                UPDATE jobs SET status = ?, attempts = attempts + 1, lease_expires = ?
+                WHERE id = ?
+                """,
+                (RUNNING, now + visibility_timeout, row[0]),
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        job_id, kind, payload, attempts, max_attempts = row
+        return Job(job_id, kind, json.loads(payload), attempts + 1, max_attempts)
+
+    def extend(self, job: Job, visibility_timeout: float) -> None:
+        """Heartbeat: keep the lease on a long-running job."""
+        self.conn.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = ? AND attempts = ?",
+            (time.time() + visibility_timeout, job.id, RUNNING, job.attempts),
+        )
+
+    def _leased(self, job: Job, sql: str, params: tuple) -> None:
+        """Run ``sql``, whose WHERE matches ``job``'s lease, and check it still held."""
+        cur = self.conn.execute(sql, params + (job.id, RUNNING, job.attempts))
+        if cur.rowcount == 0:
+            raise LeaseLost(f"job {job.id} attempt {job.attempts} no longer holds its lease")
+
+    def save_payload(self, job: Job) -> None:
+        """Persist ``job.payload``, e.g. progress a retry can resume from."""
+        self._leased(
+            job,
+            "UPDATE jobs SET payload = ? WHERE id = ? AND status = ? AND attempts = ?",
+            (json.dumps(job.payload),),
+        )
+
+    def complete(self, job: Job) -> None:
+        self._leased(
+            job,
+            """
+            UPDATE jobs SET status = ?, finished_at = ?, lease_expires = NULL
+            WHERE id = ? AND status = ? AND attempts = ?
+            """,
+            (DONE, time.time()),
+        )
+
+    def fail(self, job: Job, error: str, retry: bool = True) -> bool:
+        """Record a failure; returns ``True`` if the job will be retried."""
+        now = time.time()
+        if not retry or job.attempts >= job.max_attempts:
+            self._leased(
+                job,
+                """
+                UPDATE jobs SET status = ?, last_error = ?, finished_at = ?, lease_expires = NULL
+                WHERE id = ? AND status = ? AND attempts = ?
+                """,
+                (FAILED, error, now),
+            )
+            return False
+        delay = min(self.max_backoff, self.backoff * 2 ** (job.attempts - 1))
+        delay *= 0.5 + random.random()
+        self._leased(
+            job,
+            """
+            UPDATE jobs SET status = ?, last_error = ?, available_at = ?, lease_expires = NULL
+            WHERE id = ? AND status = ? AND attempts = ?
+            """,
+            (QUEUED, error, now + delay),
+        )
+        return True
+
+    def counts(self) -> dict[str, int]:
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+    def recent_failures(self, limit: int = 10) -> list[dict]:
+        rows = self.conn.execute(
+            """
+            SELECT id, kind, attempts, last_error FROM jobs
+            WHERE status = ? ORDER BY finished_at DESC LIMIT ?
+            """,
+            (FAILED, limit),
+        )
+        return [
+            {"id": i, "kind": k, "attempts": a, "error": e} for i, k, a, e in rows
+        ]
+
+    def ready_count(self) -> int:
+        now = time.time()
+        return self.conn.execute(
+            """
+            SELECT COUNT(*) FROM jobs
+            WHERE (status = ? AND available_at <= ?)
+               OR (status = ? AND lease_expires < ? AND attempts < max_attempts)
+            """,
+            (QUEUED, now, RUNNING, now),
+        ).fetchone()[0]
@@ -0,0 +1 @@
+"""Social media images: branded cards rendered locally, stored and uploaded by hash."""
@@ -0,0 +1,183 @@
+"""Render branded social cards as PNG with the standard library only.
+
+A card is a flat background with an accent bar, the niche as a small label
+and the post title in a scaled 5x7 bitmap font. Output is deterministic:
+the same :class:`CardSpec` always gives the same bytes, which is what lets
+:mod:`leadgen.media.library` store cards by content hash.
+"""
+
+import re
+import struct
+import zlib
+from dataclasses import asdict, dataclass
+from hashlib import sha256
+
+
+CARD_VERSION = 1  # bump when the layout changes so cached cards are re-rendered
+WIDTH, HEIGHT = 1200, 630
+MARGIN = 80
+
+PALETTES = [  # (background, accent, text)
+    ((18, 32, 56), (255, 183, 3), (255, 255, 255)),
+    ((12, 59, 46), (129, 230, 160), (255, 255, 255)),
+    ((60, 22, 66), (255, 122, 162), (255, 255, 255)),
+    ((245, 240, 230), (214, 69, 65), (30, 30, 30)),
+    ((28, 28, 30), (94, 196, 255), (240, 240, 240)),
+]
+
+# 5x7 glyphs, one string of five bits per row.
+FONT = {
+    "A": ("01110", "10001", "10001", "11111", "10001", "10001", "10001"),
+    "B": ("11110", "10001", "10001", "11110", "10001", "10001", "11110"),
+    "C": ("01110", "10001", "10000", "10000", "10000", "10001", "01110"),
+    "D": ("11110", "10001", "10001", "10001", "10001", "10001", "11110"),
+    "E": ("11111", "10000", "10000", "11110", "10000", "10000", "11111"),
+    "F": ("11111", "10000", "10000", "11110", "10000", "10000", "10000"),
+    "G": ("01110", "10001", "10000", "10111", "10001", "10001", "01111"),
+    "H": ("10001", "10001", "10001", "11111", "10001", "10001", "10001"),
+    "I": ("01110", "00100", "00100", "00100", "00100", "00100", "01110"),
+    "J": ("00111", "00010", "00010", "00010", "00010", "10010", "01100"),
+    "K": ("10001", "10010", "10100", "11000", "10100", "10010", "10001"),
+    "L": ("10000", "10000", "10000", "10000", "10000", "10000", "11111"),
+    "M": ("10001", "11011", "10101", "10101", "10001", "10001", "10001"),
+    "N": ("10001", "11001", "10101", "10011", "10001", "10001", "10001"),
+    "O": ("01110", "10001", "10001", "10001", "10001", "10001", "01110"),
+    "P": ("11110", "10001", "10001", "11110", "10000", "10000", "10000"),
+    "Q": ("01110", "10001", "10001", "10001", "10101", "10010", "01101"),
+    "R": ("11110", "10001", "10001", "11110", "10100", "10010", "10001"),
+    "S": ("01111", "10000", "10000", "01110", "00001", "00001", "11110"),
+    "T": ("11111", "00100", "00100", "00100", "00100", "00100", "00100"),
+    "U": ("10001", "10001", "10001", "10001", "10001", "10001", "01110"),
+    "V": ("10001", "10001", "10001", "10001", "10001", "01010", "00100"),
+    "W": ("10001", "10001", "10001", "10101", "10101", "10101", "01010"),
+    "X": ("10001", "10001", "01010", "00100", "01010", "10001", "10001"),
+    "Y": ("10001", "10001", "01010", "00100", "00100", "00100", "00100"),
+    "Z": ("11111", "00001", "00010", "00100", "01000", "10000", "11111"),
+    "0": ("01110", "10001", "10011", "10101", "11001", "10001", "01110"),
+    "1": ("00100", "01100", "00100", "00100", "00100", "00100", "01110"),
+    "2": ("01110", "10001", "00001", "00010", "00100", "01000", "11111"),
+    "3": ("11111", "00010", "00100", "00010", "00001", "10001", "01110"),
+    "4": ("00010", "00110", "01010", "10010", "11111", "00010", "00010"),
+    "5": ("11111", "10000", "11110", "00001", "00001", "10001", "01110"),
+    "6": ("00110", "01000", "10000", "11110", "10001", "10001", "01110"),
+    "7": ("11111", "00001", "00010", "00100", "01000", "01000", "01000"),
+    "8": ("01110", "10001", "10001", "01110", "10001", "10001", "01110"),
+    "9": ("01110", "10001", "10001", "01111", "00001", "00010", "01100"),
+    " ": ("00000",) * 7,
+    ".": ("00000", "00000", "00000", "00000", "00000", "01100", "01100"),
+    ",": ("00000", "00000", "00000", "00000", "01100", "00100", "01000"),
+    "!": ("00100", "00100", "00100", "00100", "00100", "00000", "00100"),
+    "?": ("01110", "10001", "00001", "00010", "00100", "00000", "00100"),
+    ":": ("00000", "01100", "01100", "00000", "01100", "01100", "00000"),
+    "'": ("00100", "00100", "01000", "00000", "00000", "00000", "00000"),
+    "-": ("00000", "00000", "00000", "11111", "00000", "00000", "00000"),
+    "&": ("01100", "10010", "10100", "01000", "10101", "10010", "01101"),
+    "$": ("00100", "01111", "10100", "01110", "00101", "11110", "00100"),
+    "%": ("11000", "11001", "00010", "00100", "01000", "10011", "00011"),
+    "/": ("00000", "00001", "00010", "00100", "01000", "10000", "00000"),
+    "(": ("00010", "00100", "01000", "01000", "01000", "00100", "00010"),
+    ")": ("01000", "00100", "00010", "00010", "00010", "00100", "01000"),
+    "+": ("00000", "00100", "00100", "11111", "00100", "00100", "00000"),
+    "#": ("01010", "01010", "11111", "01010", "11111", "01010", "01010"),
+}
+# Glyph rows as (start, length) runs of set bits, so drawing is a few slice writes.
+_RUNS = {
+    char: [
+        [(m.start(), len(m.group())) for m in re.finditer("1+", row)]
+        for row in rows
+    ]
+    for char, rows in FONT.items()
+}
+
+
+@dataclass(frozen=True)
+class CardSpec:
+    title: str
+    niche: str = ""
+    footer: str = ""
+
+    def key(self) -> str:
+        """Stable ID for this spec and layout version (not the image hash)."""
+        payload = repr((CARD_VERSION, sorted(asdict(self).items())))
+        return sha256(payload.encode()).hexdigest()
+
+
+def _palette(niche: str) -> tuple:
+    return PALETTES[zlib.crc32(niche.lower().encode()) % len(PALETTES)]
+
+
+def _wrap(text: str, width: int, max_lines: int) -> list[str]:
+    lines, line = [], ""
+    for word in text.split():
+        candidate = f"{line} {word}".strip()
+        if len(candidate) <= width:
+            line = candidate
+            continue
+        if line:
+            lines.append(line)
+        line = word[:width]
+    if line:
+        lines.append(line)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1] = lines[-1][: width - 3].rstrip() + "..."
+    return lines
+
+
+class _Canvas:
+    def __init__(self, width: int, height: int, color: tuple):
+        self.width = width
+        self.rows = [bytearray(bytes(color) * width) for _ in range(height)]
+
+    def rect(self, x: int, y: int, w: int, h: int, color: tuple) -> None:
+        fill = bytes(color) * w
+        for row in self.rows[y:y + h]:
+            row[x * 3:(x + w) * 3] = fill
+
+    def text(self, x: int, y: int, text: str, scale: int, color: tuple) -> None:
+        for i, char in enumerate(text.upper()):
+            runs = _RUNS.get(char, _RUNS["?"])
+            left = x + i * 6 * scale
+            for r, row_runs in enumerate(runs):
+                for start, length in row_runs:
+                    self.rect(left + start * scale, y + r * scale, length * scale, scale, color)
+
+    def png(self) -> bytes:
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return (
+                struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+            )
+
+        raw = b"".join(b"\x00" + bytes(row) for row in self.rows)
+        header = struct.pack(">IIBBBBB", self.width, len(self.rows), 8, 2, 0, 0, 0)
+        return (
+            b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw, 6))
+            + chunk(b"IEND", b"")
+        )
+
+
+def render_card(spec: CardSpec) -> bytes:
+    """PNG bytes of a 1200x630 card for ``spec`` (safe to run in a worker process)."""
+    background, accent, ink = _palette(spec.niche)
+    canvas = _Canvas(WIDTH, HEIGHT, background)
+    canvas.rect(0, 0, 16, HEIGHT, accent)
+
+    y = MARGIN
+    if spec.niche:
+        canvas.text(MARGIN, y, spec.niche, 4, accent)
+        y += 7 * 4 + 40
+
+    title_scale = 8
+    per_line = (WIDTH - 2 * MARGIN) // (6 * title_scale)
+    for line in _wrap(spec.title, per_line, max_lines=5):
+        canvas.text(MARGIN, y, line, title_scale, ink)
+        y += 9 * title_scale
+
+    if spec.footer:
+        canvas.rect(MARGIN, HEIGHT - MARGIN - 40, 120, 6, accent)
+        footer = spec.footer[: (WIDTH - 2 * MARGIN) // (6 * 3)]
+        canvas.text(MARGIN, HEIGHT - MARGIN - 7 * 3, footer, 3, ink)
+    return canvas.png()
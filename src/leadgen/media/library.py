@@ -0,0 +1,136 @@
+"""Content-addressed store for social cards, with a per-account upload cache.
+
+Cards live under ``<data_dir>/media`` as ``<sha256>.png``, named by the hash
+of their bytes, so the same image made for two platforms, two variants or a
+repost is stored once. ``media.db`` maps each :class:`CardSpec` to the hash
+it rendered to, so a known card is never rendered again. It also maps each
+hash to the media reference Postiz returned, per Postiz account, so each
+image is uploaded at most once.
+
+Missing cards are rendered with :func:`leadgen.cpu.map`, since drawing a
+card is pure Python CPU work: on the shared worker pool when one is active,
+else in a thread.
+"""
+
+import asyncio
+import sqlite3
+from hashlib import sha256
+from pathlib import Path
+
+from leadgen import cpu
+from leadgen.media.cards import CardSpec, render_card
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    spec_key TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS uploads (
+    hash TEXT NOT NULL,
+    account TEXT NOT NULL,
+    media_id TEXT NOT NULL,
+    media_path TEXT NOT NULL,
+    PRIMARY KEY (hash, account)
+) WITHOUT ROWID;
+"""
+
+
+class MediaLibrary:
+    """Render, store and upload cards, each at most once."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.root / "media.db")
+        self.conn.executescript(SCHEMA)
+        self._uploading: dict[tuple[str, str], asyncio.Task] = {}
+
+    def __enter__(self) -> "MediaLibrary":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def path(self, digest: str) -> Path:
+        return self.root / f"{digest}.png"
+
+    def store(self, data: bytes) -> str:
+        """Write ``data`` under its hash (once); returns the hash."""
+        digest = sha256(data).hexdigest()
+        path = self.path(digest)
+        if not path.exists():
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+        return digest
+
+    def _known(self, specs: list[CardSpec]) -> dict[CardSpec, str]:
+        known = {}
+        for spec in specs:
+            row = self.conn.execute(
+                "SELECT hash FROM cards WHERE spec_key = ?", (spec.key(),)
+            ).fetchone()
+            if row and self.path(row[0]).exists():
+                known[spec] = row[0]
+        return known
+
+    async def cards(self, specs: list[CardSpec]) -> dict[CardSpec, str]:
+        """``{spec: hash}``, rendering only cards not stored yet (in parallel)."""
+        specs = list(dict.fromkeys(specs))
+        hashes = self._known(specs)
+        missing = [s for s in specs if s not in hashes]
+        if not missing:
+            return hashes
+
+        images = await cpu.map(render_card, missing)
+        with self.conn:
+            for spec, data in zip(missing, images):
+                hashes[spec] = self.store(data)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO cards (spec_key, hash) VALUES (?, ?)",
+                    (spec.key(), hashes[spec]),
+                )
+        return hashes
+
+    async def upload(self, digest: str, distributor) -> dict:
+        """The Postiz media reference for ``digest``, uploading it the first time."""
+        account = distributor.base_url + "|" + sha256(distributor.api_key.encode()).hexdigest()[:16]
+        row = self.conn.execute(
+            "SELECT media_id, media_path FROM uploads WHERE hash = ? AND account = ?",
+            (digest, account),
+        ).fetchone()
+        if row:
+            return {"id": row[0], "path": row[1]}
+
+        # Concurrent callers wanting the same image share one upload.
+        key = (digest, account)
+        task = self._uploading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                distributor.upload(f"{digest[:16]}.png", self.path(digest).read_bytes())
+            )
+            self._uploading[key] = task
+        try:
+            media = await task
+        finally:
+            self._uploading.pop(key, None)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO uploads (hash, account, media_id, media_path) "
+                "VALUES (?, ?, ?, ?)",
+                (digest, account, str(media["id"]), media["path"]),
+            )
+        return {"id": str(media["id"]), "path": media["path"]}
+
+    async def images(self, specs: list[CardSpec], distributor) -> dict[CardSpec, dict]:
+        """``{spec: media reference}``: rendered and uploaded only where needed."""
+        hashes = await self.cards(specs)
+        refs = await asyncio.gather(
+            *(self.upload(digest, distributor) for digest in dict.fromkeys(hashes.values()))
+        )
+        by_hash = dict(zip(dict.fromkeys(hashes.values()), refs))
+        return {spec: by_hash[digest] for spec, digest in hashes.items()}
@@ -1,22 +1,98 @@
 """Orchestrate the full content generation and distribution pipeline."""
 
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TypeVar
+
+from leadgen import deadline, tracing
+from leadgen.config import Config
 from leadgen.content_generator import ContentGenerator
 from leadgen.publishers.hugo import HugoPublisher
+from leadgen.resilience import IdempotencyStore
+
+
+VARIANT_SLOT_HOURS = 24  # gap between rotation rounds of social variants
+MIN_OPTIONAL_SECONDS = 60  # an optional stage with less time left is deferred
+
+T = TypeVar("T")
+
+
+def idempotency_store(config: Config) -> IdempotencyStore:
+    return IdempotencyStore(Path(config.data_dir) / "idempotency.db")
+
+
+def cross_post_publishers(config: Config, platforms: list[str] | None = None) -> dict:
+    """Publishers for every cross-post target ``config`` has credentials for.
+
+    They share the idempotency ledger in ``<data_dir>``, so a retried
+    cross-post never publishes an article twice.
+    """
+    publishers = {}
+    ledger = idempotency_store(config)
+    if config.devto_api_key:
+        from leadgen.publishers.devto import DevtoPublisher
+
+        publishers["devto"] = DevtoPublisher(api_key=config.devto_api_key, ledger=ledger)
+    if config.hashnode_api_token:
+        from leadgen.publishers.hashnode import HashnodePublisher
+
+        publishers["hashnode"] = HashnodePublisher(
+            api_token=config.hashnode_api_token,
+            publication_id=config.hashnode_publication_id,
+            ledger=ledger,
+        )
+    if platforms:
+        publishers = {k: v for k, v in publishers.items() if k in platforms}
+    return publishers
+
+
+def load_post(blog_dir: str | Path, site_url: str, slug: str) -> dict:
+    """:meth:`LeadgenPipeline.load_post` as a plain function, for worker processes."""
+    post_data = HugoPublisher(blog_dir=str(blog_dir)).load(slug)
+    if site_url:
+        post_data["canonical_url"] = f"{site_url.rstrip('/')}/posts/{slug}/"
+    return post_data
 
 
 class LeadgenPipeline:
     """End-to-end pipeline: generate -> publish -> distribute."""
 
-    def __init__(self, content_model: str, hugo_blog_dir: str):
-        self.generator = ContentGenerator(model=content_model)
+    def __init__(
+        self,
+        content_model: str,
+        hugo_blog_dir: str,
+        site_url: str = "",
+        llm_slots: asyncio.Semaphore | None = None,
+        variants: int = 0,
+    ):
+        self.generator = ContentGenerator(model=content_model, slots=llm_slots)
+        self.variants = variants
         self.hugo_publisher = HugoPublisher(blog_dir=hugo_blog_dir)
+        self.site_url = site_url.rstrip("/")
 
-    async def generate_and_publish(self, niche: str, topic: str) -> dict:
-        post_data = await self.generator.generate_blog_post(
-            niche=niche, topic=topic
-        )
+    async def generate_and_publish(
+        self, niche: str, topic: str, keyword: str = "", draft: bool = False
+    ) -> dict:
+        """Generate a post and write it to Hugo.
+
+        A ``draft`` also gets its social copy now (unless it has variants,
+        which carry their own), so promoting it later needs no LLM call.
+        """
+        with tracing.span("generate", niche=niche):
+            post_data = await self.generator.generate_blog_post(
+                niche=niche, topic=topic, keyword=keyword, variants=self.variants
+            )
+        if draft and not post_data.get("variants"):
+            with tracing.span("repurpose"):
+                post_data["social"] = await self.generator.repurpose_to_social(
+                    blog_title=post_data["title"], blog_body=post_data["body"]
+                )
 
-        local_path = self.hugo_publisher.publish(post_data)
+        post_data.update(niche=niche, topic=topic, keyword=keyword, draft=draft)
+        with tracing.span("hugo_write", bytes=len(post_data["body"])):
+            local_path = self.hugo_publisher.publish(post_data)
 
         return {
             "title": post_data["title"],
@@ -24,3 +100,146 @@ class LeadgenPipeline:
             "tags": post_data.get("tags", []),
             "local_path": local_path,
         }
+
+    def load_post(self, slug: str) -> dict:
+        """Load a published Hugo post, with its canonical URL if known."""
+        return load_post(self.hugo_publisher.blog_dir, self.site_url, slug)
+
+    async def cross_post(self, post_data: dict, publishers: dict) -> dict:
+        """Publish to every cross-post target concurrently.
+
+        ``publishers`` maps a platform name to a publisher with an async
+        ``publish(post_data)``; returns ``{platform: result}``.
+        """
+        async def publish(name, publisher):
+            with tracing.span(f"cross_post:{name}"):
+                return await publisher.publish(post_data)
+
+        results = await asyncio.gather(
+            *(publish(name, p) for name, p in publishers.items())
+        )
+        return dict(zip(publishers, results))
+
+    async def optional(
+        self, name: str, run: Callable[[], Awaitable[T]], reserve: float = 0.0
+    ) -> T | None:
+        """Run an optional stage only if the run deadline leaves room for it.
+
+        The stage may use what is left minus ``reserve`` (kept for the
+        required stages after it). Returns ``None`` if it was deferred, up
+        front or by running out of time, so a later run can pick it up.
+        """
+        if not deadline.short(MIN_OPTIONAL_SECONDS + reserve):
+            left = deadline.remaining()
+            try:
+                with deadline.deadline(None if left is None else left - reserve):
+                    async with deadline.stage(name):
+                        return await run()
+            except deadline.DeadlineExceeded:
+                pass
+        tracing.record(f"deferred:{name}", 0.0, outcome="deferred")
+        return None
+
+    async def distribute(
+        self, post_data: dict, distributor, schedule_date: str, media=None
+    ) -> list:
+        """Schedule social copy on every matching integration.
+
+        Returns one ``{"date", "platform", "variant"}`` entry per scheduled post.
+
+        Posts generated with variants need no extra LLM call: each variant is
+        scheduled once per platform, rotated so every time slot shows a
+        different variant on each platform (see :func:`variant_rounds`).
+        Other posts use the social copy drafted with them, or are repurposed
+        to a single set of social copy first.
+
+        With a :class:`~leadgen.media.library.MediaLibrary` as ``media``, each
+        post also carries a card of its (variant) title. A card is rendered
+        and uploaded once, then reused on every platform and slot.
+        """
+        integrations = await distributor.get_integrations()
+        if post_data.get("variants"):
+            rounds = variant_rounds(post_data["variants"], integrations, schedule_date)
+        else:
+            social = post_data.get("social")
+            if not social:
+                with tracing.span("repurpose"):
+                    social = await self.generator.repurpose_to_social(
+                        blog_title=post_data["title"], blog_body=post_data["body"]
+                    )
+            rounds = [(schedule_date, [
+                {
+                    "integration_id": i["id"],
+                    "platform": i["providerIdentifier"],
+                    "content": social[i["providerIdentifier"]],
+                }
+                for i in integrations
+                if i["providerIdentifier"] in social
+            ])]
+
+        if media is not None:
+            await self._attach_cards(post_data, rounds, distributor, media)
+
+        scheduled = []
+        for date, posts in rounds:
+            if not posts:
+                continue
+            with tracing.span("schedule", posts=len(posts)):
+                await distributor.schedule_post(posts, date)
+            scheduled += [
+                {"date": date, "platform": p["platform"], "variant": p.get("variant", "")}
+                for p in posts
+            ]
+        return scheduled
+
+    async def _attach_cards(self, post_data: dict, rounds: list, distributor, media) -> None:
+        from urllib.parse import urlparse
+
+        from leadgen.media.cards import CardSpec
+
+        titles = {v.get("id"): v.get("title") for v in post_data.get("variants", [])}
+        footer = urlparse(self.site_url).netloc
+        posts = [p for _, round_posts in rounds for p in round_posts]
+        specs = [
+            CardSpec(
+                titles.get(p.get("variant")) or post_data["title"],
+                post_data.get("niche", ""),
+                footer,
+            )
+            for p in posts
+        ]
+        with tracing.span("media", cards=len(set(specs))):
+            refs = await media.images(specs, distributor)
+        for post, spec in zip(posts, specs):
+            post["image"] = [refs[spec]]
+
+
+def variant_rounds(
+    variants: list[dict], integrations: list[dict], schedule_date: str
+) -> list[tuple[str, list[dict]]]:
+    """Assign social variants to (platform, time slot) pairs, Latin-square style.
+
+    Round ``r`` goes out ``r * VARIANT_SLOT_HOURS`` after ``schedule_date`` and
+    gives the ``p``-th matching platform variant ``(r + p) % len(variants)``, so
+    over ``len(variants)`` rounds every platform shows every variant once and
+    no slot shows the same variant everywhere. Each post dict carries its
+    ``variant`` ID for attribution.
+    """
+    targets = [i for i in integrations if any(i["providerIdentifier"] in v for v in variants)]
+    start = datetime.strptime(schedule_date, "%Y-%m-%dT%H:%M:%S.%fZ")
+    rounds = []
+    for r in range(len(variants)):
+        date = (start + timedelta(hours=r * VARIANT_SLOT_HOURS)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        posts = []
+        for p, integration in enumerate(targets):
+            variant = variants[(r + p) % len(variants)]
+            platform = integration["providerIdentifier"]
+            if platform in variant:
+                posts.append({
+                    "integration_id": integration["id"],
+                    "platform": platform,
+                    "content": variant[platform],
+                    "variant": variant.get("id", str((r + p) % len(variants))),
+                })
+        rounds.append((date, posts))
+    return rounds
@@ -0,0 +1,168 @@
+"""CPU and memory profiling for ``leadgen --profile <command>``.
+
+Two CPU modes:
+
+* ``sample`` (default): a background thread samples the main thread's stack
+  every few milliseconds and writes collapsed stacks (``a;b;c 42`` lines)
+  that ``flamegraph.pl``, speedscope or inferno read directly. Sampling
+  sees the event loop as it really runs: time parked in ``select`` shows
+  up as idle, and each coroutine's stack appears while it holds the loop.
+* ``cprofile``: deterministic ``cProfile`` of the main thread, saved as a
+  ``.prof`` file (for snakeviz / ``pstats``) plus a text top list.
+
+Either way ``tracemalloc`` runs alongside and the top allocation sites
+(grown between start and end of the command) are written as a report.
+Work done in executor threads (the Claude CLI wait) is not sampled; it
+shows up as the main thread idling in the loop.
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+
+MODES = ("sample", "cprofile")
+IDLE_FUNCS = {"select", "poll", "epoll", "kqueue", "_run_once"}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{code.co_name}:{frame.f_lineno}"
+
+
+class StackSampler:
+    """Sample one thread's stack on a timer and count collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="leadgen-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def idle_fraction(self) -> float:
+        if not self.samples:
+            return 0.0
+        idle = sum(
+            count for stack, count in self.stacks.items()
+            if stack.rsplit(";", 1)[-1].split(":")[1] in IDLE_FUNCS
+        )
+        return idle / self.samples
+
+
+class Profiler:
+    """Context manager that profiles the block and writes reports to ``out_dir``."""
+
+    def __init__(
+        self,
+        command: str,
+        out_dir: str | Path,
+        mode: str = "sample",
+        interval: float = 0.005,
+        top: int = 25,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.mode = mode
+        self.interval = interval
+        self.top = top
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.prefix = Path(out_dir) / f"{command or 'leadgen'}-{stamp}"
+        self.outputs: list[Path] = []
+        self._sampler: StackSampler | None = None
+        self._profile: cProfile.Profile | None = None
+
+    def __enter__(self) -> "Profiler":
+        self.prefix.parent.mkdir(parents=True, exist_ok=True)
+        tracemalloc.start()
+        self._baseline = tracemalloc.take_snapshot()
+        self._started = time.perf_counter()
+        if self.mode == "sample":
+            self._sampler = StackSampler(threading.get_ident(), self.interval)
+            self._sampler.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self._started
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self._profile is not None:
+            self._profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if self._sampler is not None:
+            self._write(".collapsed", self._sampler.collapsed())
+        if self._profile is not None:
+            path = self.prefix.with_suffix(".prof")
+            self._profile.dump_stats(path)
+            self.outputs.append(path)
+            text = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=text)
+            stats.sort_stats("cumulative").print_stats(self.top)
+            self._write(".cpu.txt", text.getvalue())
+        self._write(".alloc.txt", self._alloc_report(snapshot, current, peak, elapsed))
+
+    def _write(self, suffix: str, text: str) -> None:
+        path = self.prefix.with_suffix(suffix)
+        path.write_text(text)
+        self.outputs.append(path)
+
+    def _alloc_report(self, snapshot, current: int, peak: int, elapsed: float) -> str:
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        diff = snapshot.filter_traces(filters).compare_to(
+            self._baseline.filter_traces(filters), "lineno"
+        )
+        lines = [
+            f"elapsed: {elapsed:.3f}s",
+            f"traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB",
+        ]
+        if self._sampler is not None:
+            lines.append(
+                f"samples: {self._sampler.samples} "
+                f"({self._sampler.idle_fraction():.0%} idle in the event loop)"
+            )
+        lines += ["", f"top {self.top} allocation sites (growth during the command):"]
+        for stat in diff[: self.top]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  "
+                f"{frame.filename}:{frame.lineno}"
+            )
+        return "\n".join(lines) + "\n"
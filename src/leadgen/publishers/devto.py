@@ -1,35 +1,107 @@
 """Cross-post articles to Dev.to via REST API."""
 
-import httpx
+from hashlib import sha256
+
+from leadgen.http import session
+from leadgen.resilience import IdempotencyStore, idempotency_key, once
+from leadgen.publishers.transform import render
 
 
 DEVTO_API = "https://dev.to/api/articles"
+PAGE_SIZE = 1000
 
 
 class DevtoPublisher:
-    """Publish articles to Dev.to."""
+    """Publish articles to Dev.to.
+
+    With a ``ledger``, publishing the same article twice (a retried job)
+    returns the first result instead of creating a duplicate.
+    """
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, ledger: IdempotencyStore | None = None):
         self.api_key = api_key
+        self.ledger = ledger
 
-    async def publish(self, post_data: dict) -> dict:
-        payload = {
+    def _article(self, post_data: dict) -> dict:
+        post_data = render(post_data, "devto")
+        return {
             "article": {
                 "title": post_data["title"],
                 "body_markdown": post_data["body"],
                 "published": True,
-                "tags": post_data.get("tags", [])[:4],
+                "tags": post_data["tags"],
                 "canonical_url": post_data.get("canonical_url", ""),
             }
         }
 
-        async with httpx.AsyncClient(timeout=30) as client:
+    async def publish(self, post_data: dict) -> dict:
+        article = self._article(post_data)
+        account = sha256(self.api_key.encode()).hexdigest()[:16]
+        return await once(
+            self.ledger,
+            idempotency_key("devto", account, article),
+            lambda: self._create(article),
+            recover=lambda: self._find(article["article"]),
+        )
+
+    async def _create(self, article: dict) -> dict:
+        async with session() as client:
             resp = await client.post(
                 DEVTO_API,
-                json=payload,
+                json=article,
                 headers={"api-key": self.api_key},
             )
             resp.raise_for_status()
             data = resp.json()
 
         return {"id": data["id"], "url": data["url"]}
+
+    async def _find(self, article: dict) -> dict | None:
+        """The article as created by an earlier attempt that lost its response.
+
+        Matched on the canonical URL when it has one; titles are not unique.
+        """
+        field = "canonical_url" if article["canonical_url"] else "title"
+        for remote in await self.list_remote():
+            if remote[field] == article[field]:
+                return {"id": remote["id"], "url": remote["url"]}
+        return None
+
+    async def update(self, article_id: int | str, post_data: dict) -> dict:
+        """Replace the content of an existing article."""
+        async with session() as client:
+            resp = await client.put(
+                f"{DEVTO_API}/{article_id}",
+                json=self._article(post_data),
+                headers={"api-key": self.api_key},
+            )
+            resp.raise_for_status()
+            data = resp.json()
+
+        return {"id": data["id"], "url": data["url"]}
+
+    async def list_remote(self) -> list[dict]:
+        """Every article on the account (published or not)."""
+        articles, page = [], 1
+        async with session() as client:
+            while True:
+                resp = await client.get(
+                    f"{DEVTO_API}/me/all",
+                    params={"page": page, "per_page": PAGE_SIZE},
+                    headers={"api-key": self.api_key},
+                )
+                resp.raise_for_status()
+                batch = resp.json()
+                articles += [
+                    {
+                        "id": a["id"],
+                        "url": a["url"],
+                        "title": a.get("title", ""),
+                        "slug": a.get("slug", ""),
+                        "canonical_url": a.get("canonical_url") or "",
+                    }
+                    for a in batch
+                ]
+                if len(batch) < PAGE_SIZE:
+                    return articles
+                page += 1
@@ -0,0 +1,118 @@
+"""Commit generated content and push it with git.
+
+A :class:`GitPublishTransaction` gathers every post a run produced and lands
+them as one commit and one push, so a batch of N posts triggers one site
+deploy instead of N. Only the collected files are committed; anything else
+in the working tree (other drafts, local edits) is left alone.
+"""
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from leadgen import deadline, tracing
+
+
+GIT_TIMEOUT = 120  # seconds per git command, less if the run deadline is nearer
+PUSH_ATTEMPTS = 3
+
+
+def _git(project_dir: str | Path, *args: str) -> subprocess.CompletedProcess:
+    with tracing.span(f"git:{args[0]}") as span:
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=project_dir,
+                timeout=deadline.budget(GIT_TIMEOUT, f"git {args[0]}"),
+            )
+        except subprocess.TimeoutExpired:
+            raise deadline.DeadlineExceeded(f"git {args[0]}: out of time") from None
+        span.set(returncode=result.returncode)
+        return result
+
+
+@dataclass
+class Entry:
+    path: str
+    summary: str = ""
+
+
+class GitPublishTransaction:
+    """Stage exactly the collected files, commit once and push once.
+
+    Use it as a context manager: posts added inside the block are
+    committed and pushed when it exits, even if a later post failed, so the
+    work already done is not lost. ``push`` rebases onto the remote and
+    retries when the push is rejected because someone else pushed first.
+    """
+
+    def __init__(
+        self,
+        project_dir: str | Path,
+        subject: str = "content: publish posts",
+        push: bool = True,
+        push_attempts: int = PUSH_ATTEMPTS,
+    ):
+        self.project_dir = Path(project_dir)
+        self.subject = subject
+        self.push_enabled = push
+        self.push_attempts = push_attempts
+        self.entries: list[Entry] = []
+        self.committed = False
+        self.pushed = False
+
+    def __enter__(self) -> "GitPublishTransaction":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.finish()
+
+    def add(self, path: str | Path, summary: str = "") -> None:
+        """Include ``path`` (a file or directory) in the commit."""
+        self.entries.append(Entry(str(path), summary))
+
+    def add_post(self, post: dict) -> None:
+        """Include a post written by :class:`HugoPublisher` (needs ``local_path``)."""
+        niche = f" [{post['niche']}]" if post.get("niche") else ""
+        self.add(Path(post["local_path"]).resolve(), f"{post['slug']}: {post['title']}{niche}")
+
+    def message(self) -> str:
+        """Subject line plus one ``- summary`` line per described post."""
+        lines = [e.summary for e in self.entries if e.summary]
+        return self.subject + ("\n\n" + "\n".join(f"- {line}" for line in lines) if lines else "")
+
+    def commit(self) -> bool:
+        """Commit the collected paths only; ``False`` if none of them changed."""
+        paths = list(dict.fromkeys(e.path for e in self.entries))
+        if not paths:
+            return False
+        _git(self.project_dir, "add", "--", *paths)
+        if _git(self.project_dir, "diff", "--cached", "--quiet", "--", *paths).returncode == 0:
+            return False
+        # Naming the paths commits just them, whatever else is staged.
+        result = _git(self.project_dir, "commit", "-m", self.message(), "--", *paths)
+        if result.returncode != 0:
+            raise RuntimeError(f"git commit failed ({result.returncode})")
+        self.committed = True
+        return True
+
+    def push(self) -> bool:
+        """Push, rebasing onto the remote and retrying if the push is rejected."""
+        for attempt in range(1, self.push_attempts + 1):
+            if _git(self.project_dir, "push").returncode == 0:
+                self.pushed = True
+                return True
+            if attempt == self.push_attempts:
+                break
+            if _git(self.project_dir, "pull", "--rebase", "--autostash").returncode != 0:
+                _git(self.project_dir, "rebase", "--abort")
+                break
+        raise RuntimeError(f"git push failed after {attempt} attempt(s)")
+
+    def finish(self) -> bool:
+        """Commit and (if enabled) push; ``False`` if there was nothing to commit."""
+        if self.committed or not self.commit():
+            return False
+        if self.push_enabled:
+            self.push()
+        return True
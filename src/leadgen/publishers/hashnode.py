@@ -1,19 +1,68 @@
 """Cross-post articles to Hashnode via GraphQL API."""
 
-import httpx
+import json
+from hashlib import sha256
+
+from leadgen.http import session
+from leadgen.resilience import IdempotencyStore, idempotency_key, once
+from leadgen.publishers.transform import render, slugify
 
 
 HASHNODE_API = "https://gql.hashnode.com"
 
+# Limits for one batched request: aliased mutations per document (Hashnode
+# caps query complexity per request) and serialized request size.
+MAX_BATCH_OPS = 20
+MAX_BATCH_BYTES = 512 * 1024
+
+_RESULT_FIELDS = "post { id url }"
+
 
 class HashnodePublisher:
-    """Publish articles to Hashnode."""
+    """Publish articles to Hashnode.
+
+    With a ``ledger``, publishing the same post twice (a retried job) returns
+    the first result instead of creating a duplicate.
+    """
 
-    def __init__(self, api_token: str, publication_id: str):
+    def __init__(
+        self, api_token: str, publication_id: str, ledger: IdempotencyStore | None = None
+    ):
         self.api_token = api_token
         self.publication_id = publication_id
+        self.ledger = ledger
+
+    def _input(self, post_data: dict) -> dict:
+        post_data = render(post_data, "hashnode")
+        return {
+            "title": post_data["title"],
+            "contentMarkdown": post_data["body"],
+            "publicationId": self.publication_id,
+            "tags": [{"name": t, "slug": slugify(t)} for t in post_data["tags"]],
+            "slug": post_data.get("slug", ""),
+            "originalArticleURL": post_data.get("canonical_url", ""),
+        }
+
+    async def _post(self, client, document: str, variables: dict) -> dict:
+        resp = await client.post(
+            HASHNODE_API,
+            json={"query": document, "variables": variables},
+            headers={"Authorization": self.api_token},
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def publish(self, post_data: dict) -> dict:
+        variables = self._input(post_data)
+        account = sha256(self.api_token.encode()).hexdigest()[:16]
+        return await once(
+            self.ledger,
+            idempotency_key("hashnode", account, variables),
+            lambda: self._create(variables),
+            recover=lambda: self._find(variables),
+        )
+
+    async def _create(self, variables: dict) -> dict:
         mutation = """
         mutation PublishPost($input: PublishPostInput!) {
             publishPost(input: $input) {
@@ -25,25 +74,124 @@ class HashnodePublisher:
         }
         """
 
-        variables = {
-            "input": {
-                "title": post_data["title"],
-                "contentMarkdown": post_data["body"],
-                "publicationId": self.publication_id,
-                "tags": [{"name": t} for t in post_data.get("tags", [])],
-                "slug": post_data.get("slug", ""),
-                "originalArticleURL": post_data.get("canonical_url", ""),
+        async with session() as client:
+            data = await self._post(client, mutation, {"input": variables})
+
+        post = data["data"]["publishPost"]["post"]
+        return {"id": post["id"], "url": post["url"]}
+
+    async def _find(self, variables: dict) -> dict | None:
+        """The post as created by an earlier attempt that lost its response.
+
+        Matched on the slug when it has one; titles are not unique.
+        """
+        field = "slug" if variables["slug"] else "title"
+        for remote in await self.list_remote():
+            if remote[field] == variables[field]:
+                return {"id": remote["id"], "url": remote["url"]}
+        return None
+
+    async def update(self, post_id: str, post_data: dict) -> dict:
+        """Replace the content of an existing Hashnode post."""
+        [result] = await self.publish_many([{**post_data, "remote_id": post_id}])
+        if "error" in result:
+            raise RuntimeError(f"Hashnode update failed: {result['error']}")
+        return result
+
+    async def publish_many(
+        self,
+        posts: list[dict],
+        max_ops: int = MAX_BATCH_OPS,
+        max_bytes: int = MAX_BATCH_BYTES,
+    ) -> list[dict]:
+        """Publish (or, with ``remote_id`` set, update) many posts in few requests.
+
+        Posts are packed into GraphQL documents of aliased mutations, split
+        on ``max_ops`` and ``max_bytes``. Returns one entry per post, in
+        order: ``{"id", "url"}`` or ``{"error": message}`` when Hashnode
+        rejected that post. A batch whose request failed gets an error entry
+        for each of its posts; posts already created by other batches keep
+        their results.
+        """
+        ops = []
+        for post_data in posts:
+            variables = self._input(post_data)
+            if post_data.get("remote_id"):
+                variables = {"id": post_data["remote_id"], **variables}
+                ops.append(("updatePost", "UpdatePostInput", variables))
+            else:
+                ops.append(("publishPost", "PublishPostInput", variables))
+
+        results: list[dict] = []
+        async with session() as client:
+            for batch in _batches(ops, max_ops, max_bytes):
+                try:
+                    results += await self._send_batch(client, batch)
+                except Exception as exc:
+                    results += [{"error": f"{type(exc).__name__}: {exc}"}] * len(batch)
+        return results
+
+    async def list_remote(self) -> list[dict]:
+        """Every post in the publication."""
+        query = """
+        query Posts($id: ObjectId!, $after: String) {
+            publication(id: $id) {
+                posts(first: 50, after: $after) {
+                    edges { node { id slug url title } }
+                    pageInfo { hasNextPage endCursor }
+                }
             }
         }
+        """
+        posts, after = [], None
+        async with session() as client:
+            while True:
+                data = await self._post(client, query, {"id": self.publication_id, "after": after})
+                page = data["data"]["publication"]["posts"]
+                posts += [{**edge["node"], "canonical_url": ""} for edge in page["edges"]]
+                if not page["pageInfo"]["hasNextPage"]:
+                    return posts
+                after = page["pageInfo"]["endCursor"]
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(
-                HASHNODE_API,
-                json={"query": mutation, "variables": variables},
-                headers={"Authorization": self.api_token},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+    async def _send_batch(self, client, batch: list[tuple]) -> list[dict]:
+        params, fields, variables = [], [], {}
+        for i, (mutation, input_type, value) in enumerate(batch):
+            params.append(f"$p{i}: {input_type}!")
+            fields.append(f"p{i}: {mutation}(input: $p{i}) {{ {_RESULT_FIELDS} }}")
+            variables[f"p{i}"] = value
+        document = f"mutation Batch({', '.join(params)}) {{\n  " + "\n  ".join(fields) + "\n}"
 
-        post = data["data"]["publishPost"]["post"]
-        return {"id": post["id"], "url": post["url"]}
+        data = await self._post(client, document, variables)
+        payload = data.get("data") or {}
+        errors: dict[str, list[str]] = {}
+        unattributed = []
+        for error in data.get("errors") or []:
+            path = error.get("path") or []
+            if path and path[0] in variables:
+                errors.setdefault(path[0], []).append(error.get("message", "error"))
+            else:
+                unattributed.append(error.get("message", "error"))
+
+        results = []
+        for alias in variables:
+            post = (payload.get(alias) or {}).get("post")
+            if post and alias not in errors:
+                results.append({"id": post["id"], "url": post["url"]})
+            else:
+                messages = errors.get(alias) or unattributed or ["no result returned"]
+                results.append({"error": "; ".join(messages)})
+        return results
+
+
+def _batches(ops: list[tuple], max_ops: int, max_bytes: int):
+    """Group ops greedily; an op larger than ``max_bytes`` is sent on its own."""
+    batch, size = [], 0
+    for op in ops:
+        op_size = len(json.dumps(op[2])) + 100  # alias, selection and separators
+        if batch and (len(batch) >= max_ops or size + op_size > max_bytes):
+            yield batch
+            batch, size = [], 0
+        batch.append(op)
+        size += op_size
+    if batch:
+        yield batch
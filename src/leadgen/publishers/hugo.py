@@ -1,11 +1,16 @@
 """Publish blog posts to Hugo static site."""
 
+import re
 from datetime import datetime, timezone
 from pathlib import Path
 
 import yaml
 
 
+_DRAFT = re.compile(r"^draft: true$", re.M)
+_DATE = re.compile(r"^date: .*$", re.M)
+
+
 class HugoPublisher:
     """Create Hugo markdown posts with frontmatter."""
 
@@ -22,10 +27,13 @@ class HugoPublisher:
             "description": post_data["meta_description"],
             "date": datetime.now(timezone.utc).isoformat(),
             "tags": post_data.get("tags", []),
-            "draft": False,
+            "draft": bool(post_data.get("draft", False)),
             "ShowToc": True,
             "TocOpen": True,
         }
+        for key in ("niche", "topic", "keyword", "variants", "social"):
+            if post_data.get(key):
+                frontmatter[key] = post_data[key]
 
         filename = f"{post_data['slug']}.md"
         filepath = self.content_dir / filename
@@ -37,3 +45,55 @@ class HugoPublisher:
 
         filepath.write_text(content)
         return filepath
+
+    def load(self, slug: str) -> dict:
+        """Read a published post back into the ``post_data`` shape."""
+        text = (self.content_dir / f"{slug}.md").read_text()
+        _, frontmatter, body = text.split("---\n", 2)
+        meta = yaml.safe_load(frontmatter) or {}
+        return {
+            "title": meta.get("title", ""),
+            "slug": meta.get("slug", slug),
+            "meta_description": meta.get("description", ""),
+            "body": body.lstrip("\n"),
+            "tags": meta.get("tags", []),
+            "draft": bool(meta.get("draft", False)),
+            "date": str(meta.get("date", "")),
+            "niche": meta.get("niche", ""),
+            "topic": meta.get("topic", ""),
+            "keyword": meta.get("keyword", ""),
+            "variants": meta.get("variants", []),
+            "social": meta.get("social", {}),
+        }
+
+    def slugs(self) -> list[str]:
+        """Slugs of every post file, sorted."""
+        return sorted(path.stem for path in self.content_dir.glob("*.md"))
+
+    def _frontmatter(self, slug: str) -> tuple[str, str]:
+        text = (self.content_dir / f"{slug}.md").read_text()
+        _, frontmatter, _ = text.split("---\n", 2)
+        return text, frontmatter
+
+    def drafts(self) -> list[str]:
+        """Slugs of draft posts, oldest first.
+
+        Scans the frontmatter text rather than parsing YAML, so it stays
+        cheap on a large archive.
+        """
+        found = []
+        for path in self.content_dir.glob("*.md"):
+            _, frontmatter = self._frontmatter(path.stem)
+            if _DRAFT.search(frontmatter):
+                date = _DATE.search(frontmatter)
+                found.append((date.group(0) if date else "", path.stem))
+        return [slug for _, slug in sorted(found)]
+
+    def promote(self, slug: str) -> Path:
+        """Publish a draft: ``draft: false`` and today's date, body untouched."""
+        path = self.content_dir / f"{slug}.md"
+        text, frontmatter = self._frontmatter(slug)
+        now = datetime.now(timezone.utc).isoformat()
+        updated = _DATE.sub(f"date: '{now}'", _DRAFT.sub("draft: false", frontmatter), count=1)
+        path.write_text(text.replace(frontmatter, updated, 1))
+        return path
@@ -0,0 +1,215 @@
+"""Keep cross-posted copies in step with the Hugo archive.
+
+Each cross-post is recorded in ``<data_dir>/crosspost.db`` with its remote ID
+and a hash of the content that was sent. :class:`CrossPostSync` hashes every
+post in ``blog/content/posts`` and only calls a platform for posts whose hash
+changed (an update) or that it has never seen (a create), so a nightly
+full-archive sync of an unchanged blog makes no API calls at all.
+
+Loading and hashing the archive runs through :func:`leadgen.cpu.map`, so a
+large backfill parses posts on every core while the event loop stays free.
+
+A post that was cross-posted before the store existed is matched against the
+platform's own post list (canonical URL, slug or title) before anything is
+created, so a first sync never duplicates it; it is updated once instead.
+"""
+
+import asyncio
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+from leadgen import cpu
+from leadgen.publishers.transform import content_hash
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cross_posts (
+    slug TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    remote_id TEXT NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    content_hash TEXT NOT NULL,
+    synced_at TEXT NOT NULL,
+    PRIMARY KEY (slug, platform)
+);
+"""
+
+
+def post_hash(post_data: dict) -> str:
+    """Hash of everything a cross-post is rendered from."""
+    return content_hash(json.dumps([
+        post_data.get("title", ""),
+        post_data.get("body", ""),
+        list(post_data.get("tags", [])),
+        post_data.get("canonical_url", ""),
+    ]))
+
+
+def load_hashed(blog_dir: str | Path, site_url: str, slug: str) -> tuple[dict, str]:
+    """A post and its :func:`post_hash` (run in a worker process by :meth:`CrossPostSync.load_posts`)."""
+    from leadgen.pipeline import load_post
+
+    post = load_post(blog_dir, site_url, slug)
+    return post, post_hash(post)
+
+
+@dataclass
+class Record:
+    remote_id: str
+    url: str
+    content_hash: str
+
+
+class SyncStore:
+    """Remote IDs and last-synced content hashes per (post, platform)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "SyncStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def records(self, platform: str) -> dict[str, Record]:
+        rows = self.conn.execute(
+            "SELECT slug, remote_id, url, content_hash FROM cross_posts WHERE platform = ?",
+            (platform,),
+        )
+        return {slug: Record(remote_id, url, digest) for slug, remote_id, url, digest in rows}
+
+    def record(self, slug: str, platform: str, remote_id, url: str, digest: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO cross_posts (slug, platform, remote_id, url, content_hash, synced_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (slug, platform) DO UPDATE SET
+                    remote_id = excluded.remote_id,
+                    url = excluded.url,
+                    content_hash = excluded.content_hash,
+                    synced_at = excluded.synced_at
+                """,
+                (slug, platform, str(remote_id), url, digest,
+                 datetime.now(timezone.utc).isoformat()),
+            )
+
+    def record_results(self, post_data: dict, results: dict) -> None:
+        """Store the outcome of ``LeadgenPipeline.cross_post`` for ``post_data``."""
+        digest = post_hash(post_data)
+        for platform, result in results.items():
+            self.record(post_data["slug"], platform, result["id"], result["url"], digest)
+
+
+@dataclass
+class SyncReport:
+    created: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def _match(post: dict, remote: list[dict]) -> dict | None:
+    """The remote copy of ``post``: by canonical URL, else slug, else title."""
+    for key in ("canonical_url", "slug", "title"):
+        if not post.get(key):
+            continue
+        for candidate in remote:
+            if candidate.get(key) == post[key]:
+                return candidate
+    return None
+
+
+class CrossPostSync:
+    """Push new and changed Hugo posts to every cross-post platform."""
+
+    def __init__(self, store: SyncStore, publishers: dict, pipeline, concurrency: int = 4):
+        self.store = store
+        self.publishers = publishers
+        self.pipeline = pipeline
+        self.concurrency = concurrency
+
+    async def load_posts(self, slugs: list[str] | None = None) -> dict[str, tuple[dict, str]]:
+        """``{slug: (post, hash)}`` for every published post."""
+        hugo = self.pipeline.hugo_publisher
+        load = partial(load_hashed, hugo.blog_dir, self.pipeline.site_url)
+        loaded = await cpu.map(load, slugs or hugo.slugs())
+        return {post["slug"]: (post, digest) for post, digest in loaded if not post.get("draft")}
+
+    async def run(
+        self,
+        slugs: list[str] | None = None,
+        force: bool = False,
+        dry_run: bool = False,
+    ) -> SyncReport:
+        report = SyncReport()
+        loaded = await self.load_posts(slugs)
+        posts = {slug: post for slug, (post, _) in loaded.items()}
+        hashes = {slug: digest for slug, (_, digest) in loaded.items()}
+
+        for platform, publisher in self.publishers.items():
+            known = self.store.records(platform)
+            todo: list[tuple[str, str | None]] = []
+            for slug in posts:
+                record = known.get(slug)
+                if record and record.content_hash == hashes[slug] and not force:
+                    report.unchanged += 1
+                else:
+                    todo.append((slug, record.remote_id if record else None))
+
+            if any(remote_id is None for _, remote_id in todo) and hasattr(publisher, "list_remote"):
+                remote = await publisher.list_remote()
+                todo = [
+                    (slug, remote_id or (_match(posts[slug], remote) or {}).get("id"))
+                    for slug, remote_id in todo
+                ]
+
+            if dry_run:
+                for slug, remote_id in todo:
+                    (report.updated if remote_id else report.created).append(f"{platform}:{slug}")
+                continue
+
+            results = await self._push(publisher, [(posts[slug], remote_id) for slug, remote_id in todo])
+            for (slug, remote_id), result in zip(todo, results):
+                key = f"{platform}:{slug}"
+                if "error" in result:
+                    report.failed[key] = result["error"]
+                    continue
+                self.store.record(slug, platform, result["id"], result["url"], hashes[slug])
+                (report.updated if remote_id else report.created).append(key)
+        return report
+
+    async def _push(self, publisher, items: list[tuple[dict, str | None]]) -> list[dict]:
+        if not items:
+            return []
+        if hasattr(publisher, "publish_many"):
+            try:
+                return await publisher.publish_many(
+                    [{**post, "remote_id": remote_id} for post, remote_id in items]
+                )
+            except Exception as exc:
+                return [{"error": f"{type(exc).__name__}: {exc}"}] * len(items)
+
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def push_one(post: dict, remote_id: str | None) -> dict:
+            async with slots:
+                try:
+                    if remote_id:
+                        return await publisher.update(remote_id, post)
+                    return await publisher.publish(post)
+                except Exception as exc:
+                    return {"error": f"{type(exc).__name__}: {exc}"}
+
+        return list(await asyncio.gather(*(push_one(post, rid) for post, rid in items)))
@@ -0,0 +1,329 @@
+"""Parse a post once, render it for each cross-post platform.
+
+Generated bodies are Hugo markdown: they may open with a duplicate ``# Title``,
+use relative links (``/posts/other/``), Hugo shortcodes (``ref``, ``figure``,
+``youtube``) and raw HTML (``hugo.toml`` sets ``unsafe = true``). None of that
+survives a verbatim copy to Dev.to or Hashnode, so :func:`render` rewrites the
+body per platform:
+
+* headings are shifted so the body starts at ``##`` (the platform renders
+  the title as the page's ``h1``);
+* links and images are made absolute against the post's canonical URL;
+* shortcodes become plain markdown links/images or the platform's embed tag;
+* raw HTML is kept where the platform renders it, otherwise reduced to
+  markdown;
+* tags are normalised to what the platform accepts.
+
+The body is parsed into a small block/inline tree once per content hash and
+every platform renders from that same tree, so adding platforms does not add
+parses. Rendered bodies are cached too.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from html import unescape
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+
+@dataclass(frozen=True)
+class Platform:
+    name: str
+    max_tags: int
+    embed: str  # format string with ``{url}``
+    keep_html: bool = True
+    compact_tags: bool = False  # lowercase alphanumerics only
+    min_heading: int = 2
+
+
+PLATFORMS = {
+    # Dev.to sanitises most raw HTML away and allows 4 alphanumeric tags.
+    "devto": Platform("devto", max_tags=4, embed="{{% embed {url} %}}", keep_html=False,
+                      compact_tags=True),
+    "hashnode": Platform("hashnode", max_tags=5, embed="%[{url}]"),
+}
+
+CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class Block:
+    kind: str  # heading | text | code | html | shortcode
+    text: str = ""
+    level: int = 0
+    inline: tuple = ()
+
+
+_FENCE = re.compile(r"^(```+|~~~+)")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_SHORTCODE = re.compile(r"\{\{[<%]\s*(/?)\s*([\w-]+)(.*?)\s*[>%]\}\}")
+_HTML_BLOCK = re.compile(r"^\s*</?[A-Za-z][\w-]*(\s|>|/>|$)")
+_INLINE = re.compile(
+    r"(?P<code>`+).+?(?P=code)"
+    r"|(?P<image>!)?\[(?P<label>[^\]]*)\]\((?P<url>\{\{[<%].*?[>%]\}\}|[^)\s]+)(?P<title>\s+\"[^\"]*\")?\)"
+    r"|(?P<short>\{\{[<%].*?[>%]\}\})"
+    r"|(?P<html></?[A-Za-z][^>]*>)"
+)
+_ARG = re.compile(r'(\w+)=("[^"]*"|\S+)|("[^"]*"|\S+)')
+_URL_ATTR = re.compile(r'\b(href|src)=(["\'])(.*?)\2')
+
+
+def _parse_inline(text: str) -> tuple:
+    nodes, pos = [], 0
+    for m in _INLINE.finditer(text):
+        if m.start() > pos:
+            nodes.append(("text", text[pos:m.start()]))
+        if m.group("code"):
+            nodes.append(("code", m.group(0)))
+        elif m.group("url"):
+            nodes.append(
+                ("link", m.group("label"), m.group("url"), m.group("title") or "", bool(m.group("image")))
+            )
+        elif m.group("short"):
+            nodes.append(("shortcode", m.group(0)))
+        else:
+            nodes.append(("html", m.group(0)))
+        pos = m.end()
+    if pos < len(text):
+        nodes.append(("text", text[pos:]))
+    return tuple(nodes)
+
+
+def parse(body: str) -> tuple[Block, ...]:
+    """Split markdown into blocks; text blocks carry parsed inline nodes."""
+    blocks: list[Block] = []
+    lines = body.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            i += 1
+            continue
+        fence = _FENCE.match(line.lstrip())
+        if fence:
+            end = i + 1
+            while end < len(lines) and not lines[end].lstrip().startswith(fence.group(1)):
+                end += 1
+            blocks.append(Block("code", "\n".join(lines[i:end + 1])))
+            i = end + 1
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            text = heading.group(2)
+            blocks.append(Block("heading", text, len(heading.group(1)), _parse_inline(text)))
+            i += 1
+            continue
+        if _SHORTCODE.fullmatch(line.strip()):
+            blocks.append(Block("shortcode", line.strip()))
+            i += 1
+            continue
+        end = i
+        while end < len(lines) and lines[end].strip():
+            end += 1
+        if _HTML_BLOCK.match(line):
+            blocks.append(Block("html", "\n".join(lines[i:end])))
+        else:
+            end = i
+            while (
+                end < len(lines)
+                and lines[end].strip()
+                and not _FENCE.match(lines[end].lstrip())
+                and not _HEADING.match(lines[end])
+                and not _SHORTCODE.fullmatch(lines[end].strip())
+            ):
+                end += 1
+            text = "\n".join(lines[i:end])
+            blocks.append(Block("text", text, inline=_parse_inline(text)))
+        i = end
+    return tuple(blocks)
+
+
+def _shortcode_args(raw: str) -> tuple[str, str, list[str], dict[str, str]]:
+    m = _SHORTCODE.fullmatch(raw.strip())
+    if not m:
+        return "", "", [], {}
+    positional, named = [], {}
+    for key, value, bare in _ARG.findall(m.group(3)):
+        if key:
+            named[key] = value.strip('"')
+        else:
+            positional.append(bare.strip('"'))
+    return m.group(1), m.group(2), positional, named
+
+
+class _Renderer:
+    def __init__(self, platform: Platform, base_url: str):
+        self.platform = platform
+        self.base_url = base_url
+
+    def url(self, url: str) -> str:
+        if url.startswith("{{"):
+            return self.shortcode_url(url) or url
+        if not self.base_url or url.startswith(("#", "mailto:")):
+            return url
+        return urljoin(self.base_url, url)
+
+    def shortcode_url(self, raw: str) -> str:
+        _, name, args, _ = _shortcode_args(raw)
+        if name not in ("ref", "relref") or not args:
+            return ""
+        target = args[0].removesuffix(".md").removesuffix("/_index").rstrip("/")
+        slug = target.rsplit("/", 1)[-1]
+        return self.url(f"/posts/{slug}/")
+
+    def shortcode(self, raw: str) -> str:
+        closing, name, args, named = _shortcode_args(raw)
+        if closing:
+            return ""
+        if name in ("ref", "relref"):
+            return self.shortcode_url(raw)
+        if name == "figure" and named.get("src"):
+            alt = named.get("alt") or named.get("caption") or ""
+            return f"![{alt}]({self.url(named['src'])})"
+        if name == "youtube" and (args or named.get("id")):
+            video = args[0] if args else named["id"]
+            return self.platform.embed.format(url=f"https://www.youtube.com/watch?v={video}")
+        if name in ("x", "tweet") and named.get("id") and named.get("user"):
+            return self.platform.embed.format(
+                url=f"https://twitter.com/{named['user']}/status/{named['id']}"
+            )
+        return ""  # theme-specific shortcodes have no equivalent; keep their inner text
+
+    def inline(self, nodes: tuple) -> str:
+        out = []
+        for node in nodes:
+            kind = node[0]
+            if kind == "link":
+                _, label, url, title, image = node
+                out.append(f"{'!' if image else ''}[{label}]({self.url(url)}{title})")
+            elif kind == "shortcode":
+                out.append(self.shortcode(node[1]))
+            elif kind == "html":
+                out.append(self.html(node[1]) if self.platform.keep_html else _html_to_markdown(node[1], self.url))
+            else:
+                out.append(node[1])
+        return "".join(out)
+
+    def html(self, raw: str) -> str:
+        return _URL_ATTR.sub(lambda m: f"{m[1]}={m[2]}{self.url(m[3])}{m[2]}", raw)
+
+    def render(self, blocks: tuple[Block, ...], title: str) -> str:
+        if blocks and blocks[0].kind == "heading" and blocks[0].level == 1 \
+                and blocks[0].text.strip().lower() == title.strip().lower():
+            blocks = blocks[1:]  # the platform already shows the title
+        levels = [b.level for b in blocks if b.kind == "heading"]
+        shift = max(0, self.platform.min_heading - min(levels)) if levels else 0
+
+        out = []
+        for block in blocks:
+            if block.kind == "heading":
+                out.append(f"{'#' * min(6, block.level + shift)} {self.inline(block.inline)}")
+            elif block.kind == "code":
+                out.append(block.text)
+            elif block.kind == "shortcode":
+                out.append(self.shortcode(block.text))
+            elif block.kind == "html":
+                out.append(
+                    self.html(block.text) if self.platform.keep_html
+                    else _html_to_markdown(block.text, self.url)
+                )
+            else:
+                out.append(self.inline(block.inline))
+        return "\n\n".join(part for part in out if part.strip()) + "\n"
+
+
+class _HTMLToMarkdown(HTMLParser):
+    """Reduce embedded HTML to text, links, images and line breaks."""
+
+    BREAKS = {"p", "div", "section", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+    def __init__(self, url):
+        super().__init__(convert_charrefs=True)
+        self.url = url
+        self.parts: list[str] = []
+        self.href: str | None = None
+        self.link_text: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "a" and attrs.get("href"):
+            self.href, self.link_text = attrs["href"], []
+        elif tag == "img" and attrs.get("src"):
+            self.parts.append(f"![{attrs.get('alt') or ''}]({self.url(attrs['src'])})")
+        elif tag == "iframe" and attrs.get("src"):
+            self.parts.append(f"\n[{attrs.get('title') or attrs['src']}]({self.url(attrs['src'])})\n")
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag in self.BREAKS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self.href is not None:
+            text = "".join(self.link_text).strip() or self.href
+            self.parts.append(f"[{text}]({self.url(self.href)})")
+            self.href = None
+        elif tag in self.BREAKS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        (self.link_text if self.href is not None else self.parts).append(data)
+
+
+def _html_to_markdown(raw: str, url) -> str:
+    parser = _HTMLToMarkdown(url)
+    parser.feed(raw)
+    parser.close()
+    lines = [" ".join(line.split()) for line in unescape("".join(parser.parts)).splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def slugify(tag: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", tag.lower()).strip("-")
+
+
+def platform_tags(tags: list[str], platform: Platform) -> list[str]:
+    result, seen = [], set()
+    for tag in tags:
+        tag = re.sub(r"[^a-z0-9]", "", tag.lower()) if platform.compact_tags else tag.strip()
+        key = slugify(tag)
+        if key and key not in seen:
+            seen.add(key)
+            result.append(tag)
+    return result[:platform.max_tags]
+
+
+class _LRU(OrderedDict):
+    def get_or_build(self, key, build):
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        value = self[key] = build()
+        if len(self) > CACHE_SIZE:
+            self.popitem(last=False)
+        return value
+
+
+_parsed = _LRU()
+_rendered = _LRU()
+
+
+def content_hash(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def render(post_data: dict, platform: str) -> dict:
+    """``post_data`` with body and tags rewritten for ``platform``."""
+    target = PLATFORMS[platform]
+    body = post_data["body"]
+    digest = content_hash(body)
+    base_url = post_data.get("canonical_url", "")
+    title = post_data.get("title", "")
+    rendered = _rendered.get_or_build(
+        (digest, platform, base_url, title),
+        lambda: _Renderer(target, base_url).render(
+            _parsed.get_or_build(digest, lambda: parse(body)), title
+        ),
+    )
+    return {**post_data, "body": rendered, "tags": platform_tags(post_data.get("tags", []), target)}
@@ -0,0 +1,382 @@
+"""Retries, circuit breaking and idempotency for the HTTP integrations.
+
+Every client from :mod:`leadgen.http` sends through a
+:class:`ResilientTransport`, so each wrapper in ``leadgen.publishers``,
+``leadgen.distributors``, ``leadgen.email`` and ``leadgen.seo`` gets the same
+behaviour without code of its own:
+
+* A request is retried on a connection failure, a 408/429 or a 5xx, after
+  the server's ``Retry-After`` or else a capped, fully jittered exponential
+  backoff (see :class:`RetryPolicy`). A retry never sleeps past the run's
+  :mod:`leadgen.deadline`.
+* Only requests that are safe to repeat are retried once they may have
+  reached the server: GET, PUT, DELETE and friends, requests with an
+  ``Idempotency-Key`` header, or anything under a policy marked
+  ``idempotent``. A POST is otherwise retried only when it provably was not
+  processed: the connection failed, or the server answered 429 or 503 with
+  a ``Retry-After``.
+* A policy's ``throttle`` (e.g. a rate limiter's ``acquire``) is awaited
+  before every attempt, so retries are paced like first tries.
+* Each host has a :class:`CircuitBreaker`. After ``BREAKER_THRESHOLD``
+  failures in a row, requests to it fail at once with
+  :class:`CircuitOpenError` for ``BREAKER_COOLDOWN`` seconds, then a single
+  probe decides whether it is back.
+
+Creating things (articles, scheduled posts) is not safe to repeat, so
+:class:`IdempotencyStore` records each such call under a key derived from
+its payload. Running it again (a retried job, a rerun after a crash) returns
+the recorded result instead of creating a second copy.
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from hashlib import sha256
+from pathlib import Path
+from typing import TypeVar
+
+import httpx
+
+from leadgen import deadline, tracing
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+BREAKER_THRESHOLD = 5  # consecutive failures that open a host's circuit
+BREAKER_COOLDOWN = 30.0  # seconds an open circuit fails fast before a probe
+IDEMPOTENCY_TTL_DAYS = 30  # after this a payload may be created again
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(httpx.TransportError):
+    """A host failed repeatedly; requests to it fail fast for a while."""
+
+
+def is_retryable_status(status: int) -> bool:
+    return status in (408, 429) or status >= 500
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether a failed call is worth trying again later."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return is_retryable_status(exc.response.status_code)
+    return isinstance(exc, httpx.TransportError)
+
+
+def retry_after(response: httpx.Response) -> float | None:
+    """Seconds the server asked us to wait (``Retry-After``), if it did."""
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return max(0.0, (at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in ``[0, min(cap, base * 2**attempt)]``."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    max_retry_after: float = 120.0  # a longer Retry-After is not waited out
+    idempotent: bool = False  # every request is safe to repeat (e.g. an upsert)
+    throttle: Callable[[], Awaitable[None]] | None = None  # awaited before every attempt
+
+    def delay(self, attempt: int, response: httpx.Response | None = None) -> float | None:
+        """Seconds before retry ``attempt`` (0-based), or ``None`` to give up."""
+        asked = retry_after(response) if response is not None else None
+        if asked is None:
+            return backoff(attempt, self.backoff, self.max_backoff)
+        return asked if asked <= self.max_retry_after else None
+
+
+_policy: ContextVar[RetryPolicy] = ContextVar("leadgen_retry", default=RetryPolicy())
+
+
+@contextmanager
+def retry_policy(policy: RetryPolicy) -> Iterator[RetryPolicy]:
+    """Use ``policy`` for every request sent in this context (and its tasks)."""
+    token = _policy.set(policy)
+    try:
+        yield policy
+    finally:
+        _policy.reset(token)
+
+
+class CircuitBreaker:
+    """Consecutive-failure counter for one host."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def open(self) -> bool:
+        return self.opened_at is not None
+
+    def check(self, host: str) -> None:
+        """Raise :class:`CircuitOpenError` unless a request may go out now.
+
+        Once the cooldown is over one caller gets through as a probe; the
+        circuit stays open for everyone else until that probe succeeds.
+        """
+        if self.opened_at is None:
+            return
+        waited = time.monotonic() - self.opened_at
+        if waited < self.cooldown:
+            raise CircuitOpenError(
+                f"{host}: circuit open after {self.failures} failures, "
+                f"retry in {self.cooldown - waited:.0f}s"
+            )
+        self.opened_at = time.monotonic()
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def breaker(host: str) -> CircuitBreaker:
+    """The process-wide breaker for ``host``."""
+    if host not in _breakers:
+        _breakers[host] = CircuitBreaker()
+    return _breakers[host]
+
+
+def reset_breakers() -> None:
+    _breakers.clear()
+
+
+def _safe_to_repeat(request: httpx.Request, policy: RetryPolicy) -> bool:
+    return (
+        policy.idempotent
+        or request.method in IDEMPOTENT_METHODS
+        or "Idempotency-Key" in request.headers
+    )
+
+
+def _not_processed(response: httpx.Response) -> bool:
+    return response.status_code == 429 or (
+        response.status_code == 503 and "Retry-After" in response.headers
+    )
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Wrap a transport with retries and per-host circuit breaking."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        policy = _policy.get()
+        host = request.url.host
+        circuit = breaker(host)
+        await request.aread()  # buffer the body so it can be sent again
+        attempt = 0
+        while True:
+            circuit.check(host)
+            if policy.throttle is not None:
+                await policy.throttle()
+            try:
+                response = await self.inner.handle_async_request(request)
+            except httpx.TransportError as exc:
+                circuit.failure()
+                unsent = isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if attempt >= policy.max_retries or not (unsent or _safe_to_repeat(request, policy)):
+                    raise
+                delay = policy.delay(attempt)
+                if deadline.short(delay):
+                    raise
+                outcome = type(exc).__name__
+            else:
+                if response.status_code >= 500:
+                    circuit.failure()
+                else:
+                    circuit.success()
+                if (
+                    attempt >= policy.max_retries
+                    or not is_retryable_status(response.status_code)
+                    or not (_not_processed(response) or _safe_to_repeat(request, policy))
+                ):
+                    return response
+                delay = policy.delay(attempt, response)
+                if delay is None or deadline.short(delay):
+                    return response
+                await response.aclose()
+                outcome = str(response.status_code)
+            tracing.record(f"retry:{host}", delay * 1000, outcome=outcome, attempt=attempt + 1)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def __aenter__(self) -> "ResilientTransport":
+        await self.inner.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.inner.__aexit__(*exc)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+def install(client: httpx.AsyncClient) -> None:
+    """Route ``client``'s default transport through :class:`ResilientTransport`."""
+    # httpx has no public hook for wrapping the transport of a built client
+    # (and tests build theirs with a MockTransport), so wrap it in place.
+    if not isinstance(client._transport, ResilientTransport):
+        client._transport = ResilientTransport(client._transport)
+
+
+def idempotency_key(*parts) -> str:
+    """Stable key for a call made from ``parts`` (JSON-serializable values)."""
+    return sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _surely_not_applied(exc: BaseException) -> bool:
+    """The failed call cannot have created anything on the remote side."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code < 500
+    return isinstance(
+        exc, (CircuitOpenError, httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+    )
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    key TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    result TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class IdempotencyStore:
+    """Outcome of each non-repeatable call, by :func:`idempotency_key`.
+
+    A key is ``pending`` while its call runs and ``done`` (with the result)
+    once it returned. A call that failed before it could have had an effect
+    is forgotten; any other failure leaves the key pending, since the remote
+    side may have acted on it.
+    """
+
+    def __init__(self, path: str | Path, ttl_days: int = IDEMPOTENCY_TTL_DAYS):
+        self.path = Path(path)
+        self.ttl = timedelta(days=ttl_days)
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # Opened on first use: publishers are built per job, most never publish.
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def __enter__(self) -> "IdempotencyStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, key: str) -> tuple[str, object] | None:
+        """``(state, result)`` recorded for ``key`` within the TTL, if any."""
+        cutoff = (datetime.now(timezone.utc) - self.ttl).isoformat()
+        row = self.conn.execute(
+            "SELECT state, result FROM calls WHERE key = ? AND updated_at >= ?", (key, cutoff)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]) if row[1] else None
+
+    def _set(self, key: str, state: str, result=None) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO calls (key, state, result, updated_at) VALUES (?, ?, ?, ?)",
+                (key, state, json.dumps(result) if result is not None else "",
+                 datetime.now(timezone.utc).isoformat()),
+            )
+
+    def forget(self, key: str) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM calls WHERE key = ?", (key,))
+
+    async def once(
+        self,
+        key: str,
+        run: Callable[[], Awaitable[T]],
+        recover: Callable[[], Awaitable[T | None]] | None = None,
+    ) -> T:
+        """Run ``run`` unless ``key`` already has a result; returns that result.
+
+        If an earlier attempt ended without a clear outcome, ``recover`` (if
+        given) looks the created object up on the remote side first.
+        """
+        known = self.get(key)
+        if known is not None:
+            state, result = known
+            if state == "done":
+                tracing.record("idempotent:hit", 0.0)
+                return result
+            if recover is not None:
+                found = await recover()
+                if found is not None:
+                    self._set(key, "done", found)
+                    tracing.record("idempotent:recovered", 0.0)
+                    return found
+
+        self._set(key, "pending")
+        try:
+            result = await run()
+        except BaseException as exc:
+            if _surely_not_applied(exc):
+                self.forget(key)
+            raise
+        self._set(key, "done", result)
+        return result
+
+
+async def once(
+    store: IdempotencyStore | None,
+    key: str,
+    run: Callable[[], Awaitable[T]],
+    recover: Callable[[], Awaitable[T | None]] | None = None,
+) -> T:
+    """:meth:`IdempotencyStore.once`, or just ``run()`` without a store."""
+    if store is None:
+        return await run()
+    return await store.once(key, run, recover)
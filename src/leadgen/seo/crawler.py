@@ -0,0 +1,135 @@
+"""Crawl every page of DataForSEO keyword suggestions concurrently."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from leadgen.resilience import backoff, is_retryable
+from leadgen.seo.keyword_store import KeywordStore
+from leadgen.seo.keywords import KeywordResearcher
+
+
+_PAGE_DONE = object()
+MAX_BACKOFF = 30.0
+
+
+class KeywordCrawler:
+    """Fetch all suggestion pages for a seed keyword.
+
+    The first page is streamed immediately; as soon as its ``total_count`` is
+    parsed the remaining offsets are scheduled, at most ``max_concurrency``
+    at a time. Pages that keep failing after ``max_retries`` are recorded in
+    ``failed_offsets`` instead of aborting the crawl. The page is retried
+    here rather than by the transport because a streamed page can also
+    fail halfway through its body.
+    """
+
+    def __init__(
+        self,
+        researcher: KeywordResearcher,
+        page_size: int = 1000,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        max_items: int | None = None,
+    ):
+        self.researcher = researcher
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_items = max_items
+        self.total_count: int | None = None
+        self.failed_offsets: list[int] = []
+
+    async def crawl(self, seed_keyword: str) -> AsyncIterator[dict]:
+        """Yield deduplicated keyword records from every page."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.page_size)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        meta: dict = {}
+        tasks: list[asyncio.Task] = []
+        errors: list[Exception] = []
+        pending = 1
+        scheduled = False
+        self.failed_offsets = []
+
+        def schedule_remaining() -> None:
+            nonlocal pending, scheduled
+            if scheduled or "total_count" not in meta:
+                return
+            scheduled = True
+            self.total_count = meta["total_count"] or 0
+            total = self.total_count
+            if self.max_items is not None:
+                total = min(total, self.max_items)
+            offsets = range(self.page_size, total, self.page_size)
+            pending += len(offsets)
+            tasks.extend(asyncio.create_task(fetch(o)) for o in offsets)
+
+        async def fetch(offset: int) -> None:
+            first = offset == 0
+            try:
+                async with semaphore:
+                    for attempt in range(self.max_retries + 1):
+                        try:
+                            async for record in self.researcher.iter_suggestions(
+                                seed_keyword,
+                                limit=self.page_size,
+                                offset=offset,
+                                meta=meta if first else None,
+                            ):
+                                await queue.put(record)
+                                if first:
+                                    schedule_remaining()
+                            break
+                        except Exception as exc:
+                            if not is_retryable(exc):
+                                raise
+                            if attempt == self.max_retries:
+                                self.failed_offsets.append(offset)
+                                break
+                            await asyncio.sleep(backoff(attempt, self.backoff, MAX_BACKOFF))
+                    if first:
+                        schedule_remaining()
+            except Exception as exc:
+                errors.append(exc)
+            await queue.put(_PAGE_DONE)
+
+        tasks.append(asyncio.create_task(fetch(0)))
+        seen: set[str] = set()
+        try:
+            while pending:
+                record = await queue.get()
+                if record is _PAGE_DONE:
+                    pending -= 1
+                    continue
+                key = record["keyword"].casefold()
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield record
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if errors:
+            raise errors[0]
+
+    async def crawl_into(
+        self,
+        store: KeywordStore,
+        niche: str,
+        seed_keyword: str,
+        batch_size: int = 500,
+    ) -> int:
+        """Crawl ``seed_keyword`` and write results to ``store`` in batches."""
+        written = 0
+        batch: list[dict] = []
+        async for record in self.crawl(seed_keyword):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                written += store.upsert(niche, batch)
+                batch.clear()
+        if batch:
+            written += store.upsert(niche, batch)
+        return written
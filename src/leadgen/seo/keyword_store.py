@@ -0,0 +1,105 @@
+"""Local SQLite store for researched keywords."""
+
+import sqlite3
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keywords (
+    keyword TEXT NOT NULL,
+    niche TEXT NOT NULL,
+    search_volume INTEGER NOT NULL DEFAULT 0,
+    keyword_difficulty INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (keyword, niche)
+);
+CREATE INDEX IF NOT EXISTS keywords_niche_difficulty
+    ON keywords (niche, keyword_difficulty);
+"""
+
+# Stores created before keywords were keyed per niche had ``keyword`` alone
+# as the primary key; their rows are copied into the new table once.
+MIGRATE_KEY_PER_NICHE = """
+BEGIN;
+ALTER TABLE keywords RENAME TO keywords_old;
+DROP INDEX keywords_niche_difficulty;
+""" + SCHEMA + """
+INSERT INTO keywords SELECT keyword, niche, search_volume, keyword_difficulty, updated_at
+    FROM keywords_old;
+DROP TABLE keywords_old;
+COMMIT;
+"""
+
+
+class KeywordStore:
+    """Persist keyword records so research accumulates across runs."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+        key = {row[1] for row in self.conn.execute("PRAGMA table_info(keywords)") if row[5]}
+        if key == {"keyword"}:
+            self.conn.executescript(MIGRATE_KEY_PER_NICHE)
+
+    def __enter__(self) -> "KeywordStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def upsert(self, niche: str, records: Iterable[dict]) -> int:
+        """Insert or refresh keyword records; returns the number written."""
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (
+                r["keyword"],
+                niche,
+                r.get("search_volume") or 0,
+                r.get("keyword_difficulty") or 0,
+                now,
+            )
+            for r in records
+        ]
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO keywords (keyword, niche, search_volume, keyword_difficulty, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (keyword, niche) DO UPDATE SET
+                    search_volume = excluded.search_volume,
+                    keyword_difficulty = excluded.keyword_difficulty,
+                    updated_at = excluded.updated_at
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def count(self, niche: str | None = None, max_difficulty: int = 100) -> int:
+        query = "SELECT COUNT(*) FROM keywords WHERE keyword_difficulty <= ?"
+        params: tuple = (max_difficulty,)
+        if niche is not None:
+            query += " AND niche = ?"
+            params += (niche,)
+        return self.conn.execute(query, params).fetchone()[0]
+
+    def top(self, niche: str, max_difficulty: int = 50, limit: int = 20) -> list[dict]:
+        """Highest-volume keywords for a niche under a difficulty ceiling."""
+        rows = self.conn.execute(
+            """
+            SELECT keyword, search_volume, keyword_difficulty FROM keywords
+            WHERE niche = ? AND keyword_difficulty <= ?
+            ORDER BY search_volume DESC LIMIT ?
+            """,
+            (niche, max_difficulty, limit),
+        )
+        return [
+            {"keyword": k, "search_volume": v, "keyword_difficulty": d}
+            for k, v, d in rows
+        ]
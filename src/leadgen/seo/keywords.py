@@ -1,9 +1,27 @@
 """Keyword research via DataForSEO API ($6/mo for 10K searches)."""
 
-import httpx
+import heapq
+from collections.abc import AsyncIterator
+
+from leadgen.http import session
+from leadgen.seo.streaming import JsonItemStream
 
 
 DATAFORSEO_API = "https://api.dataforseo.com/v3"
+SUGGESTIONS_ENDPOINT = f"{DATAFORSEO_API}/dataforseo_labs/google/keyword_suggestions/live"
+
+# Where keyword items live in a DataForSEO Labs response.
+ITEMS_PATH = ("tasks", "*", "result", "*", "items")
+STATUS_OK = 20000
+META_FIELDS = ("status_code", "status_message", "total_count", "items_count", "offset")
+
+
+def _to_record(item: dict) -> dict:
+    return {
+        "keyword": item["keyword"],
+        "search_volume": item["search_volume"],
+        "keyword_difficulty": item["keyword_difficulty"],
+    }
 
 
 class KeywordResearcher:
@@ -16,35 +34,95 @@ class KeywordResearcher:
     def _auth(self) -> tuple[str, str]:
         return (self.login, self.password)
 
-    async def get_suggestions(self, seed_keyword: str) -> list[dict]:
-        payload = [
+    def _payload(self, seed_keyword: str, **extra) -> list[dict]:
+        return [
             {
                 "keyword": seed_keyword,
                 "location_code": 2840,  # United States
                 "language_code": "en",
+                **extra,
             }
         ]
 
-        async with httpx.AsyncClient(timeout=30) as client:
+    async def get_suggestions(self, seed_keyword: str) -> list[dict]:
+        async with session() as client:
             resp = await client.post(
-                f"{DATAFORSEO_API}/dataforseo_labs/google/keyword_suggestions/live",
-                json=payload,
+                SUGGESTIONS_ENDPOINT,
+                json=self._payload(seed_keyword),
                 auth=self._auth(),
             )
             resp.raise_for_status()
-            data = await resp.json()
+            data = resp.json()
 
         items = data["tasks"][0]["result"][0]["items"]
-        return [
-            {
-                "keyword": item["keyword"],
-                "search_volume": item["search_volume"],
-                "keyword_difficulty": item["keyword_difficulty"],
-            }
-            for item in items
-        ]
+        return [_to_record(item) for item in items]
+
+    async def iter_suggestions(
+        self,
+        seed_keyword: str,
+        limit: int = 1000,
+        offset: int = 0,
+        meta: dict | None = None,
+    ) -> AsyncIterator[dict]:
+        """Stream keyword records as the response body arrives.
+
+        Unlike ``get_suggestions`` this never holds the whole payload: items
+        are parsed and yielded one at a time, so memory stays flat no matter
+        how large ``limit`` is. If ``meta`` is given it is filled in place
+        with envelope fields (``total_count``, ``items_count``, ``offset``)
+        as soon as they are parsed.
+        """
+        parser = JsonItemStream(ITEMS_PATH, capture=META_FIELDS)
+        if meta is not None:
+            parser.captured = meta
+        payload = self._payload(seed_keyword, limit=limit, offset=offset)
+        yielded = False
+
+        async with session() as client:
+            async with client.stream(
+                "POST", SUGGESTIONS_ENDPOINT, json=payload, auth=self._auth()
+            ) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.aiter_text():
+                    for item in parser.feed(chunk):
+                        yielded = True
+                        yield _to_record(item)
+
+        for item in parser.close():
+            yielded = True
+            yield _to_record(item)
+
+        status = parser.captured.get("status_code", STATUS_OK)
+        if not yielded and status != STATUS_OK:
+            raise RuntimeError(
+                f"DataForSEO error {status}: {parser.captured.get('status_message', '')}"
+            )
 
     def filter_low_competition(
         self, keywords: list[dict], max_difficulty: int = 50
     ) -> list[dict]:
         return [k for k in keywords if k["keyword_difficulty"] <= max_difficulty]
+
+    async def top_low_competition(
+        self,
+        records: AsyncIterator[dict],
+        max_difficulty: int = 50,
+        top_n: int = 20,
+    ) -> tuple[int, list[dict]]:
+        """Filter a record stream and keep the ``top_n`` by search volume.
+
+        Returns ``(matched, top)`` where ``matched`` counts every record under
+        ``max_difficulty``. Only ``top_n`` records are held at any time.
+        """
+        heap: list[tuple[int, int, dict]] = []
+        matched = 0
+        async for kw in records:
+            if kw["keyword_difficulty"] > max_difficulty:
+                continue
+            entry = (kw["search_volume"] or 0, matched, kw)
+            matched += 1
+            if len(heap) < top_n:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heappushpop(heap, entry)
+        return matched, [kw for _, _, kw in sorted(heap, reverse=True)]
@@ -0,0 +1,225 @@
+"""Pick the next (niche, topic, keyword) to write about.
+
+Each niche and each topic is an arm of a multi-armed bandit. A post's reward
+is the leads it brought in plus its views (``VIEWS_PER_LEAD`` views count as
+one lead), read from the analytics store. Rewards are counts, so every arm
+keeps a Gamma posterior over its reward rate per post, with the prior
+centred on the archive-wide mean. Each run draws one sample per arm
+(Thompson sampling): arms that convert get picked more, arms with few posts
+still get explored.
+
+Candidates are every niche x topic pair, crossed with that niche's unused
+keywords from the keyword store. A candidate scores
+``niche sample * relative topic sample * keyword opportunity``; arms are
+sampled once per run, so ranking thousands of candidates is a single pass.
+"""
+
+import math
+import random
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from leadgen.config import Config
+
+
+NICHES = ["restaurants", "law firms", "real estate", "dental offices", "hvac", "accounting"]
+TOPICS = [
+    "how AI agents save money",
+    "automating customer service",
+    "reducing missed appointments",
+    "streamlining operations",
+]
+
+VIEWS_PER_LEAD = 200
+WINDOW_DAYS = 180
+MIN_AGE_DAYS = 7  # younger posts have not had time to earn their reward
+MAX_KEYWORD_DIFFICULTY = 50
+KEYWORDS_PER_NICHE = 200
+
+
+@dataclass
+class Outcome:
+    niche: str
+    topic: str
+    reward: float
+
+
+@dataclass
+class Candidate:
+    niche: str
+    topic: str
+    keyword: str = ""
+    search_volume: int = 0
+    keyword_difficulty: int = 0
+
+    def opportunity(self) -> float:
+        """Multiplier from the keyword: higher volume, lower difficulty."""
+        if not self.keyword:
+            return 1.0
+        ease = 1 - min(self.keyword_difficulty, 100) / 100
+        return 1 + math.log1p(self.search_volume) * ease / 10
+
+
+@dataclass
+class Choice:
+    niche: str
+    topic: str
+    keyword: str
+    score: float
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class Arm:
+    alpha: float
+    beta: float
+
+    def mean(self) -> float:
+        return self.alpha / self.beta
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.gammavariate(self.alpha, 1 / self.beta)
+
+
+class TopicSelector:
+    """Thompson sampling over niches and topics, weighted by keyword opportunity."""
+
+    def __init__(
+        self,
+        niches: list[str] | None = None,
+        topics: list[str] | None = None,
+        prior_strength: float = 1.0,
+        seed: int | None = None,
+    ):
+        self.niches = list(niches or NICHES)
+        self.topics = list(topics or TOPICS)
+        self.prior_strength = prior_strength
+        self.rng = random.Random(seed)
+        self.niche_arms: dict[str, Arm] = {}
+        self.topic_arms: dict[str, Arm] = {}
+        self.observe([])
+
+    def observe(self, outcomes: list[Outcome]) -> None:
+        """Rebuild the posteriors from post outcomes."""
+        mean = sum(o.reward for o in outcomes) / len(outcomes) if outcomes else 1.0
+        mean = max(mean, 0.01)
+        k = self.prior_strength
+
+        def arms(names: list[str], key: str) -> dict[str, Arm]:
+            result = {name: Arm(k * mean, k) for name in names}
+            for o in outcomes:
+                arm = result.get(getattr(o, key))
+                if arm is not None:
+                    arm.alpha += o.reward
+                    arm.beta += 1
+            return result
+
+        self.niche_arms = arms(self.niches, "niche")
+        self.topic_arms = arms(self.topics, "topic")
+
+    def candidates(
+        self, keywords: dict[str, list[dict]] | None = None, used: set[str] | None = None
+    ) -> list[Candidate]:
+        keywords, used = keywords or {}, used or set()
+        result = []
+        for niche in self.niches:
+            options = [k for k in keywords.get(niche, []) if k["keyword"].lower() not in used]
+            for topic in self.topics:
+                if not options:
+                    result.append(Candidate(niche, topic))
+                for k in options:
+                    result.append(
+                        Candidate(
+                            niche,
+                            topic,
+                            k["keyword"],
+                            k.get("search_volume") or 0,
+                            k.get("keyword_difficulty") or 0,
+                        )
+                    )
+        return result
+
+    def rank(self, candidates: list[Candidate], count: int = 1) -> list[Choice]:
+        """Draw one sample per arm and return the ``count`` best candidates."""
+        niche_draw = {name: arm.sample(self.rng) for name, arm in self.niche_arms.items()}
+        topic_draw = {name: arm.sample(self.rng) for name, arm in self.topic_arms.items()}
+        topic_mean = sum(a.mean() for a in self.topic_arms.values()) / len(self.topic_arms)
+
+        scored = [
+            (
+                niche_draw[c.niche] * topic_draw[c.topic] / topic_mean * c.opportunity(),
+                self.rng.random(),  # random tie-break
+                c,
+            )
+            for c in candidates
+        ]
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+
+        choices, seen = [], set()
+        for score, _, c in scored:
+            if (c.niche, c.topic) in seen:
+                continue  # one keyword per pair, so a batch spreads out
+            seen.add((c.niche, c.topic))
+            choices.append(Choice(c.niche, c.topic, c.keyword, round(score, 4)))
+            if len(choices) == count:
+                break
+        return choices
+
+
+def load_outcomes(
+    hugo_blog_dir: str | Path, analytics_db: str | Path | None, today: date | None = None
+) -> tuple[list[Outcome], set[str]]:
+    """Rewards of matured posts, plus every keyword already written about."""
+    from leadgen.publishers.hugo import HugoPublisher
+
+    today = today or datetime.now(timezone.utc).date()
+    hugo = HugoPublisher(str(hugo_blog_dir))
+    posts = [hugo.load(slug) for slug in hugo.slugs()]
+    used = {p["keyword"].lower() for p in posts if p.get("keyword")}
+
+    totals: dict[str, dict[str, int]] = {}
+    if analytics_db and Path(analytics_db).exists():
+        from leadgen.analytics.store import AnalyticsStore
+
+        with AnalyticsStore(analytics_db) as store:
+            totals = store.post_totals(WINDOW_DAYS, today)
+
+    cutoff = (today - timedelta(days=MIN_AGE_DAYS)).isoformat()
+    outcomes = []
+    for post in posts:
+        # Drafts have no traffic yet; their keywords stay in ``used`` above.
+        if post.get("draft") or not post.get("niche") or str(post.get("date", ""))[:10] > cutoff:
+            continue
+        metrics = totals.get(post["slug"], {})
+        reward = metrics.get("leads", 0) + metrics.get("views", 0) / VIEWS_PER_LEAD
+        outcomes.append(Outcome(post["niche"], post.get("topic", ""), reward))
+    return outcomes, used
+
+
+def next_topics(
+    config: Config,
+    count: int = 1,
+    niches: list[str] | None = None,
+    topics: list[str] | None = None,
+    seed: int | None = None,
+) -> list[Choice]:
+    """The next ``count`` (niche, topic, keyword) picks for ``config``'s blog."""
+    data_dir = Path(config.data_dir)
+    outcomes, used = load_outcomes(config.hugo_blog_dir, data_dir / "analytics.db")
+    selector = TopicSelector(niches, topics, seed=seed)
+    selector.observe(outcomes)
+
+    keywords: dict[str, list[dict]] = {}
+    keywords_db = data_dir / "keywords.db"
+    if keywords_db.exists():
+        from leadgen.seo.keyword_store import KeywordStore
+
+        with KeywordStore(keywords_db) as store:
+            keywords = {
+                niche: store.top(niche, MAX_KEYWORD_DIFFICULTY, KEYWORDS_PER_NICHE)
+                for niche in selector.niches
+            }
+    return selector.rank(selector.candidates(keywords, used), count)
@@ -0,0 +1,134 @@
+"""Incremental JSON parsing for large API responses.
+
+Only the envelope around the streamed array is walked character by character;
+each array element is decoded in one go with ``json.JSONDecoder.raw_decode``,
+so parsing cost stays close to ``json.loads`` while memory stays bounded by a
+single element plus one network chunk.
+"""
+
+import json
+from collections.abc import Iterable
+
+_WHITESPACE = " \t\r\n"
+_DECODER = json.JSONDecoder()
+
+# Parser states
+_VALUE = "value"    # expecting a value (or "]" right after "[")
+_KEY = "key"        # expecting an object key (or "}" right after "{")
+_COLON = "colon"    # expecting ":" after a key
+_AFTER = "after"    # expecting "," or a closing bracket after a value
+_DONE = "done"      # top-level value complete
+
+
+class JsonItemStream:
+    """Yield the elements of a nested JSON array as the document arrives.
+
+    ``path`` names the array to stream; ``"*"`` stands for any array index, so
+    ``("tasks", "*", "result", "*", "items")`` selects the ``items`` list of
+    every task result. Scalar values whose key is listed in ``capture`` are
+    kept in :attr:`captured` (last occurrence wins), which is how callers read
+    envelope fields such as ``total_count`` without buffering the response.
+    """
+
+    def __init__(self, path: Iterable[str], capture: Iterable[str] = ()):
+        self.item_path = tuple(path) + ("*",)
+        self.capture = frozenset(capture)
+        self.captured: dict = {}
+        self._buf = ""
+        self._pos = 0
+        self._keys: list = []
+        self._kinds: list[str] = []
+        self._state = _VALUE
+
+    def feed(self, text: str) -> list:
+        """Consume a chunk of the document and return the completed items."""
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self) -> list:
+        """Finish parsing; raises ``ValueError`` if the document is truncated."""
+        items = self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError("Truncated JSON document")
+        return items
+
+    def _decode(self, final: bool):
+        """Decode one value at the cursor, or return ``None`` if incomplete."""
+        try:
+            value, end = _DECODER.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError(f"Invalid JSON at offset {self._pos}") from None
+            return None
+        # A number may continue in the next chunk ("12" + "3").
+        if end == len(self._buf) and not final and self._buf[self._pos] in "-0123456789":
+            return None
+        self._pos = end
+        return (value,)
+
+    def _close_container(self) -> None:
+        self._kinds.pop()
+        self._keys.pop()
+        self._state = _AFTER if self._kinds else _DONE
+
+    def _parse(self, final: bool) -> list:
+        items = []
+        buf = self._buf
+        size = len(buf)
+
+        while True:
+            while self._pos < size and buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos >= size or self._state == _DONE:
+                return items
+            char = buf[self._pos]
+
+            if self._state == _VALUE:
+                if char == "]" and self._kinds and self._kinds[-1] == "[":
+                    self._pos += 1
+                    self._close_container()
+                elif tuple(self._keys) == self.item_path:
+                    decoded = self._decode(final)
+                    if decoded is None:
+                        return items
+                    items.append(decoded[0])
+                    self._state = _AFTER
+                elif char in "{[":
+                    self._pos += 1
+                    self._kinds.append(char)
+                    self._keys.append(None if char == "{" else "*")
+                    self._state = _KEY if char == "{" else _VALUE
+                else:
+                    decoded = self._decode(final)
+                    if decoded is None:
+                        return items
+                    if self._keys and self._keys[-1] in self.capture:
+                        self.captured[self._keys[-1]] = decoded[0]
+                    self._state = _AFTER if self._kinds else _DONE
+
+            elif self._state == _KEY:
+                if char == "}":
+                    self._pos += 1
+                    self._close_container()
+                    continue
+                decoded = self._decode(final)
+                if decoded is None:
+                    return items
+                self._keys[-1] = decoded[0]
+                self._state = _COLON
+
+            elif self._state == _COLON:
+                if char != ":":
+                    raise ValueError(f"Expected ':' at offset {self._pos}")
+                self._pos += 1
+                self._state = _VALUE
+
+            elif self._state == _AFTER:
+                self._pos += 1
+                if char == ",":
+                    self._state = _KEY if self._kinds[-1] == "{" else _VALUE
+                elif char in "}]":
+                    self._close_container()
+                else:
+                    raise ValueError(f"Unexpected {char!r} at offset {self._pos - 1}")
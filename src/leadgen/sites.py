@@ -0,0 +1,236 @@
+"""Multi-site tenancy: run several client blogs from one process.
+
+A sites file (YAML) lists each site with its own niches, topics, Hugo dir and
+credentials. Keys under ``defaults`` apply to every site, and ``${NAME}``
+values are read from the environment so secrets can stay in ``.env``::
+
+    defaults:
+      content_model: sonnet
+      topics: [how AI agents save money, reducing missed appointments]
+    sites:
+      - name: smile-dental
+        hugo_blog_dir: sites/smile-dental/blog
+        site_url: https://blog.smile-dental.com
+        niches: [dental offices]
+        devto_api_key: ${SMILE_DEVTO_KEY}
+
+Credentials are never inherited from the single-site environment: a site
+without its own key simply skips that channel, so one client's posts can
+never go out on another client's accounts.
+"""
+
+import asyncio
+import os
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+import yaml
+
+from leadgen import tracing
+from leadgen.config import Config, load_config
+from leadgen.http import pooled_client, use_client
+from leadgen.pipeline import LeadgenPipeline, cross_post_publishers
+from leadgen.publishers.sync import SyncStore
+from leadgen.seo.selection import Choice, next_topics
+
+
+PUSH_RESERVE = 60.0  # seconds kept back from optional stages for the git push
+
+_ENV_REF = re.compile(r"\$\{(\w+)\}")
+_NAME = re.compile(r"^[a-z0-9][a-z0-9_-]*$")
+
+# Settings a site may set; everything else in Config is process-wide.
+SITE_FIELDS = {f.name for f in fields(Config)} - {"sites_file", "metrics_textfile"}
+
+
+@dataclass
+class Site:
+    name: str
+    config: Config
+    niches: list[str]
+    topics: list[str]
+
+
+def _expand(value):
+    if isinstance(value, str):
+        return _ENV_REF.sub(lambda m: os.getenv(m.group(1), ""), value)
+    return value
+
+
+def load_sites(path: str | Path, base: Config | None = None) -> list[Site]:
+    """Parse a sites file into fully resolved per-site configs."""
+    path = Path(path)
+    base = base or load_config()
+    raw = yaml.safe_load(path.read_text()) or {}
+    defaults = raw.get("defaults") or {}
+
+    sites, names = [], set()
+    for entry in raw.get("sites") or []:
+        merged = {**defaults, **entry}
+        name = str(merged.pop("name", ""))
+        if not _NAME.match(name) or name in names:
+            raise ValueError(f"{path}: site names must be unique slugs, got {name!r}")
+        names.add(name)
+
+        niches = merged.pop("niches", None)
+        topics = merged.pop("topics", None)
+        if not niches or not topics:
+            raise ValueError(f"{path}: site {name!r} needs niches and topics")
+        unknown = set(merged) - SITE_FIELDS
+        if unknown:
+            raise ValueError(f"{path}: site {name!r} has unknown keys: {sorted(unknown)}")
+
+        values = {key: _expand(value) for key, value in merged.items()}
+        hugo_dir = Path(values.get("hugo_blog_dir") or Path("sites") / name / "blog")
+        values["hugo_blog_dir"] = str(path.parent / hugo_dir)
+        values.setdefault("data_dir", str(Path(base.data_dir) / "sites" / name))
+        values.setdefault("content_model", base.content_model)
+        sites.append(Site(name, Config(**values), list(niches), list(topics)))
+    return sites
+
+
+@dataclass
+class SiteRun:
+    site: str
+    niche: str
+    topic: str
+    keyword: str = ""
+    slug: str = ""
+    title: str = ""
+    local_path: str = ""
+    cross_posts: dict = field(default_factory=dict)
+    deferred: list[str] = field(default_factory=list)
+    error: str = ""
+
+
+class SiteOrchestrator:
+    """Run posts for many sites with shared HTTP and LLM capacity.
+
+    Jobs are submitted round-robin (every site's first post, then every
+    site's second, ...) and each site may hold at most ``per_site`` jobs at
+    once. Since the LLM semaphore wakes waiters in FIFO order, a site with a
+    long backlog cannot starve the others.
+    """
+
+    def __init__(
+        self,
+        sites: list[Site],
+        llm_concurrency: int = 2,
+        per_site: int = 1,
+        http_connections: int = 50,
+        echo: Callable[[str], None] = print,
+    ):
+        self.sites = sites
+        self.llm_slots = asyncio.Semaphore(llm_concurrency)
+        self.per_site = per_site
+        self.http_connections = http_connections
+        self.echo = echo
+        self.git_lock = asyncio.Lock()
+
+    async def run(self, posts_per_site: int = 1, push: bool = False) -> list[SiteRun]:
+        # Each site's picks come from its own archive, analytics and keywords;
+        # a site with fewer (niche, topic) pairs than posts gets fewer posts.
+        picks = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    next_topics, site.config, posts_per_site, niches=site.niches, topics=site.topics
+                )
+                for site in self.sites
+            )
+        )
+        choices = dict(zip((site.name for site in self.sites), picks))
+        pipelines = {
+            site.name: LeadgenPipeline(
+                content_model=site.config.content_model,
+                hugo_blog_dir=site.config.hugo_blog_dir,
+                site_url=site.config.site_url,
+                llm_slots=self.llm_slots,
+                variants=site.config.ab_variants,
+            )
+            for site in self.sites
+        }
+        site_slots = {site.name: asyncio.Semaphore(self.per_site) for site in self.sites}
+
+        async with pooled_client(max_connections=self.http_connections) as client:
+            with use_client(client):
+                tasks = [
+                    asyncio.create_task(
+                        self._run_one(site, pipelines[site.name], site_slots[site.name], choice, push)
+                    )
+                    for n in range(posts_per_site)
+                    for site in self.sites
+                    for choice in choices[site.name][n:n + 1]
+                ]
+                runs = list(await asyncio.gather(*tasks))
+        if push:
+            # One commit and push per site for the whole batch, not per post.
+            await asyncio.gather(*(self._push(site, runs) for site in self.sites))
+        return runs
+
+    async def _run_one(
+        self,
+        site: Site,
+        pipeline: LeadgenPipeline,
+        slots: asyncio.Semaphore,
+        choice: Choice,
+        push: bool,
+    ) -> SiteRun:
+        run = SiteRun(site.name, choice.niche, choice.topic, choice.keyword)
+        async with slots:
+            try:
+                with tracing.span("site", site=site.name):
+                    await self._publish(site, pipeline, run, push)
+            except Exception as exc:
+                run.error = f"{type(exc).__name__}: {exc}"
+        self.echo(
+            f"[{site.name}] {run.slug or run.topic}: "
+            + (f"failed ({run.error})" if run.error else "published")
+            + (f", deferred {', '.join(run.deferred)}" if run.deferred else "")
+        )
+        return run
+
+    async def _publish(
+        self, site: Site, pipeline: LeadgenPipeline, run: SiteRun, push: bool
+    ) -> None:
+        result = await pipeline.generate_and_publish(
+            niche=run.niche, topic=run.topic, keyword=run.keyword
+        )
+        run.slug, run.title, run.local_path = result["slug"], result["title"], str(result["local_path"])
+        publishers = cross_post_publishers(site.config)
+        if publishers:
+            post_data = pipeline.load_post(run.slug)
+            # Optional: near the deadline, leave it to the next `sync-posts`.
+            results = await pipeline.optional(
+                "cross_post",
+                lambda: pipeline.cross_post(post_data, publishers),
+                reserve=PUSH_RESERVE if push else 0.0,
+            )
+            if results is None:
+                run.deferred.append("cross-post")
+            else:
+                run.cross_posts = {name: r["url"] for name, r in results.items()}
+                with SyncStore(Path(site.config.data_dir) / "crosspost.db") as store:
+                    store.record_results(post_data, results)
+
+    async def _push(self, site: Site, runs: list[SiteRun]) -> None:
+        from leadgen.publishers.git import GitPublishTransaction
+
+        done = [r for r in runs if r.site == site.name and r.local_path]
+        if not done:
+            return
+        tx = GitPublishTransaction(
+            site.config.hugo_blog_dir,
+            f"content: {len(done)} auto-generated post(s) for {site.name}",
+        )
+        for r in done:
+            tx.add_post({"slug": r.slug, "title": r.title, "niche": r.niche, "local_path": r.local_path})
+        try:
+            # Sites may share one repository: keep git commands serialized.
+            async with self.git_lock:
+                await asyncio.to_thread(tx.finish)
+        except Exception as exc:
+            self.echo(f"[{site.name}] push failed: {type(exc).__name__}: {exc}")
+            for r in done:
+                r.error = r.error or f"push: {exc}"
@@ -0,0 +1,292 @@
+"""Lightweight tracing for pipeline runs.
+
+Wrap a command in :func:`trace` and every :func:`span` opened underneath it
+(pipeline stages, Claude CLI calls, git subprocesses, and HTTP requests via
+the hooks in :mod:`leadgen.http`) is timed and recorded with its parent,
+attributes and outcome. When the trace ends it is appended to
+``<data_dir>/traces/spans.jsonl`` and folded into cumulative Prometheus
+histograms written as a textfile for node_exporter's textfile collector.
+
+Outside a trace, :func:`span` only times the block and records nothing.
+"""
+
+import fcntl
+import json
+import os
+import secrets
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+
+# Histogram buckets (seconds) shared by every span name.
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+SPANS_FILE = "spans.jsonl"
+MAX_SPANS_BYTES = 5 * 1024 * 1024
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start: float
+    duration_ms: float = 0.0
+    outcome: str = "ok"
+    error: str = ""
+    attrs: dict = field(default_factory=dict)
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+@dataclass
+class Trace:
+    name: str
+    trace_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    spans: list[Span] = field(default_factory=list)
+
+
+_trace: ContextVar[Trace | None] = ContextVar("leadgen_trace", default=None)
+_current: ContextVar[Span | None] = ContextVar("leadgen_span", default=None)
+
+
+def active() -> bool:
+    return _trace.get() is not None
+
+
+def _new_span(name: str, start: float, attrs: dict) -> Span:
+    trace = _trace.get()
+    parent = _current.get()
+    return Span(
+        name=name,
+        trace_id=trace.trace_id if trace else "",
+        span_id=secrets.token_hex(4),
+        parent_id=parent.span_id if parent else None,
+        start=start,
+        attrs=attrs,
+    )
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Span]:
+    """Time the block as a child of the current span."""
+    current = _new_span(name, time.time(), attrs)
+    token = _current.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as exc:
+        current.outcome = "error"
+        current.error = f"{type(exc).__name__}: {exc}"[:500]
+        raise
+    finally:
+        current.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        _current.reset(token)
+        trace = _trace.get()
+        if trace is not None:
+            trace.spans.append(current)
+
+
+def record(name: str, duration_ms: float, outcome: str = "ok", **attrs) -> None:
+    """Record an already-measured operation (e.g. from an HTTP event hook)."""
+    trace = _trace.get()
+    if trace is None:
+        return
+    finished = _new_span(name, time.time() - duration_ms / 1000, attrs)
+    finished.duration_ms = round(duration_ms, 3)
+    finished.outcome = outcome
+    trace.spans.append(finished)
+
+
+@contextmanager
+def trace(
+    name: str,
+    data_dir: str | Path,
+    textfile: str | Path | None = None,
+    **attrs,
+) -> Iterator[Trace]:
+    """Trace a whole command and export it when the block exits."""
+    current = Trace(name)
+    token = _trace.set(current)
+    try:
+        with span(name, **attrs):
+            yield current
+    finally:
+        _trace.reset(token)
+        export(current, Path(data_dir) / "traces", textfile)
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    with open(path, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def export(trace: Trace, traces_dir: Path, textfile: str | Path | None = None) -> None:
+    """Append spans to the JSONL log and refresh the Prometheus textfile."""
+    traces_dir.mkdir(parents=True, exist_ok=True)
+    with _locked(traces_dir / ".lock"):
+        log = traces_dir / SPANS_FILE
+        if log.exists() and log.stat().st_size > MAX_SPANS_BYTES:
+            log.replace(traces_dir / f"{SPANS_FILE}.1")
+        torn = log.exists() and not _ends_with_newline(log)
+        with log.open("a") as f:
+            if torn:
+                f.write("\n")  # a killed run left a partial line
+            for s in trace.spans:
+                f.write(json.dumps(asdict(s)) + "\n")
+
+        metrics = Metrics.load(traces_dir / "metrics.json")
+        metrics.observe(trace)
+        metrics.save(traces_dir / "metrics.json")
+        metrics.write_textfile(Path(textfile) if textfile else traces_dir / "leadgen.prom")
+
+
+@dataclass
+class Metrics:
+    """Cumulative per-span-name histograms, persisted between runs."""
+
+    # name -> {"buckets": [...], "sum": float, "count": int, "errors": int}
+    spans: dict = field(default_factory=dict)
+    # command -> {"timestamp", "duration", "success"}
+    last_run: dict = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "Metrics":
+        try:
+            return cls(**json.loads(path.read_text()))
+        except (OSError, ValueError, TypeError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(self)))
+        tmp.replace(path)
+
+    def observe(self, trace: Trace) -> None:
+        for s in trace.spans:
+            h = self.spans.setdefault(
+                s.name, {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0, "errors": 0}
+            )
+            seconds = s.duration_ms / 1000
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    h["buckets"][i] += 1
+            h["sum"] += seconds
+            h["count"] += 1
+            h["errors"] += s.outcome != "ok"
+            if s.parent_id is None:
+                self.last_run[s.name] = {
+                    "timestamp": s.start + seconds,
+                    "duration": seconds,
+                    "success": int(s.outcome == "ok"),
+                }
+
+    def write_textfile(self, path: Path) -> None:
+        lines = [
+            "# HELP leadgen_span_duration_seconds Duration of traced pipeline operations.",
+            "# TYPE leadgen_span_duration_seconds histogram",
+        ]
+        for name, h in sorted(self.spans.items()):
+            for bound, count in zip(BUCKETS, h["buckets"]):
+                lines.append(
+                    f'leadgen_span_duration_seconds_bucket{{span="{name}",le="{bound}"}} {count}'
+                )
+            lines.append(f'leadgen_span_duration_seconds_bucket{{span="{name}",le="+Inf"}} {h["count"]}')
+            lines.append(f'leadgen_span_duration_seconds_sum{{span="{name}"}} {h["sum"]:.6f}')
+            lines.append(f'leadgen_span_duration_seconds_count{{span="{name}"}} {h["count"]}')
+        lines += [
+            "# HELP leadgen_span_errors_total Traced operations that failed.",
+            "# TYPE leadgen_span_errors_total counter",
+        ]
+        lines += [
+            f'leadgen_span_errors_total{{span="{name}"}} {h["errors"]}'
+            for name, h in sorted(self.spans.items())
+        ]
+        for metric, key, help_text in (
+            ("leadgen_last_run_timestamp_seconds", "timestamp", "End of the last run."),
+            ("leadgen_last_run_duration_seconds", "duration", "Duration of the last run."),
+            ("leadgen_last_run_success", "success", "1 if the last run succeeded."),
+        ):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+            lines += [
+                f'{metric}{{command="{name}"}} {run[key]}'
+                for name, run in sorted(self.last_run.items())
+            ]
+
+        # Write-then-rename so node_exporter never reads a partial file.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}")
+        tmp.write_text("\n".join(lines) + "\n")
+        tmp.replace(path)
+
+
+def load_spans(traces_dir: str | Path) -> list[dict]:
+    """Every recorded span, oldest first (rotated file included)."""
+    traces_dir = Path(traces_dir)
+    spans = []
+    for path in (traces_dir / f"{SPANS_FILE}.1", traces_dir / SPANS_FILE):
+        if not path.exists():
+            continue
+        with path.open() as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue  # torn last line from a killed run
+    return spans
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (``pct`` in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(spans: list[dict], runs: int = 20) -> dict:
+    """Latency distribution per span name over the last ``runs`` traces."""
+    roots = [s for s in spans if s["parent_id"] is None]
+    recent = roots[-runs:]
+    keep = {s["trace_id"] for s in recent}
+    by_name: dict[str, list[dict]] = {}
+    for s in spans:
+        if s["trace_id"] in keep:
+            by_name.setdefault(s["name"], []).append(s)
+
+    stats = {}
+    for name, group in by_name.items():
+        durations = [s["duration_ms"] for s in group]
+        stats[name] = {
+            "count": len(group),
+            "errors": sum(s["outcome"] != "ok" for s in group),
+            "p50_ms": percentile(durations, 50),
+            "p95_ms": percentile(durations, 95),
+            "p99_ms": percentile(durations, 99),
+            "max_ms": max(durations),
+        }
+    return {
+        "runs": len(recent),
+        "failed_runs": sum(s["outcome"] != "ok" for s in recent),
+        "since": recent[0]["start"] if recent else None,
+        "spans": stats,
+    }
@@ -0,0 +1,321 @@
+"""Long-running worker that executes jobs from the durable queue.
+
+``leadgen worker`` runs ``concurrency`` async loops that claim jobs from
+:class:`~leadgen.jobs.JobQueue`. Steps that shell out to the Claude CLI hold
+one of ``subprocess_slots`` so a backlog cannot start dozens of LLM processes
+at once, and git operations are serialized behind a lock. Local CPU work
+(rendering cards, hashing the archive) goes to one shared
+:class:`~leadgen.cpu.CpuPool`.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from leadgen import deadline, tracing
+from leadgen.config import Config
+from leadgen.cpu import CpuPool, use_pool
+from leadgen.http import pooled_client, use_client
+from leadgen.jobs import RUNNING, Job, JobQueue, LeaseLost
+from leadgen.pipeline import LeadgenPipeline, cross_post_publishers, idempotency_store
+
+
+Handler = Callable[["Worker", dict], Awaitable[dict | None]]
+HANDLERS: dict[str, Handler] = {}
+
+_job: ContextVar[Job | None] = ContextVar("leadgen_job", default=None)
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    """Register a coroutine as the handler for a job kind."""
+    def register(func: Handler) -> Handler:
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+class Worker:
+    """Pull jobs from a queue and run them on a pool of async workers."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        config: Config,
+        project_dir: str | Path = ".",
+        concurrency: int = 4,
+        subprocess_slots: int = 1,
+        visibility_timeout: float = 900.0,
+        poll_interval: float = 1.0,
+        job_deadline: float | None = None,
+        echo: Callable[[str], None] = print,
+    ):
+        self.queue = queue
+        self.config = config
+        self.project_dir = Path(project_dir)
+        self.concurrency = concurrency
+        self.subprocess_slots = asyncio.Semaphore(subprocess_slots)
+        self.git_lock = asyncio.Lock()
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        # Each job (its LLM calls, requests and git commands) gets this long.
+        self.job_deadline = job_deadline
+        self.echo = echo
+        self.completed = 0
+        self.failed = 0
+        self.lost = 0
+        self._pipeline = None
+
+    def pipeline(self):
+        if self._pipeline is None:
+            self._pipeline = LeadgenPipeline(
+                content_model=self.config.content_model,
+                hugo_blog_dir=self.config.hugo_blog_dir,
+                site_url=self.config.site_url,
+                llm_slots=self.subprocess_slots,
+                variants=self.config.ab_variants,
+            )
+        return self._pipeline
+
+    async def run(self, stop: asyncio.Event | None = None, drain: bool = False) -> None:
+        """Process jobs until ``stop`` is set (or the queue is empty, if ``drain``)."""
+        stop = stop or asyncio.Event()
+        # Started by the first job with CPU work, then kept warm for the rest.
+        cpu_pool = CpuPool(self.config.cpu_workers)
+        try:
+            async with pooled_client() as client:
+                with use_client(client), use_pool(cpu_pool):
+                    await asyncio.gather(
+                        *(self._loop(stop, drain) for _ in range(self.concurrency))
+                    )
+        finally:
+            await asyncio.to_thread(cpu_pool.close)
+
+    async def _loop(self, stop: asyncio.Event, drain: bool) -> None:
+        while not stop.is_set():
+            job = self.queue.claim(self.visibility_timeout)
+            if job is not None:
+                await self._execute(job)
+                continue
+            if drain and self.queue.counts()[RUNNING] == 0:
+                return
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _heartbeat(self, job: Job) -> None:
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            self.queue.extend(job, self.visibility_timeout)
+
+    async def _execute(self, job: Job) -> None:
+        func = HANDLERS.get(job.kind)
+        if func is None:
+            self.queue.fail(job, f"Unknown job kind: {job.kind}", retry=False)
+            self.failed += 1
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            with deadline.deadline(self.job_deadline), tracing.trace(
+                f"job:{job.kind}",
+                self.config.data_dir,
+                self.config.metrics_textfile or None,
+                job_id=job.id,
+                attempt=job.attempts,
+            ):
+                token = _job.set(job)
+                try:
+                    result = await func(self, job.payload)
+                finally:
+                    _job.reset(token)
+        except Exception as exc:
+            try:
+                retried = self.queue.fail(job, f"{type(exc).__name__}: {exc}")
+            except LeaseLost:
+                self._lease_lost(job)
+                return
+            self.failed += 1
+            self.echo(
+                f"[job {job.id}] {job.kind} failed (attempt {job.attempts}/{job.max_attempts})"
+                f"{', will retry' if retried else ''}: {exc}"
+            )
+        else:
+            try:
+                self.queue.complete(job)
+            except LeaseLost:
+                self._lease_lost(job)
+                return
+            self.completed += 1
+            self.echo(f"[job {job.id}] {job.kind} done {result or ''}".rstrip())
+        finally:
+            heartbeat.cancel()
+
+    def checkpoint(self, **progress) -> None:
+        """Save ``progress`` into the running job's payload, where a retry will find it."""
+        job = _job.get()
+        if job is not None:
+            job.payload.update(progress)
+            self.queue.save_payload(job)
+
+    def _lease_lost(self, job: Job) -> None:
+        # The lease lapsed mid-run and another worker owns the job now; its
+        # outcome, not ours, is recorded.
+        self.lost += 1
+        self.echo(f"[job {job.id}] {job.kind} lease lost (attempt {job.attempts}); result dropped")
+
+
+@handler("generate")
+async def generate_job(worker: Worker, payload: dict) -> dict:
+    """Generate a post; optionally push it and queue its cross-posts and social.
+
+    The written post is checkpointed on the job, so a retry after a failed
+    push or enqueue redoes only those steps, not the LLM call.
+    """
+    niche, topic = payload.get("niche"), payload.get("topic")
+    keyword = payload.get("keyword", "")
+    result = payload.get("generated")
+    if result is None:
+        if not (niche and topic):
+            from leadgen.seo.selection import next_topics
+
+            [choice] = await asyncio.to_thread(
+                next_topics,
+                worker.config,
+                niches=[niche] if niche else None,
+                topics=[topic] if topic else None,
+            )
+            niche, topic, keyword = choice.niche, choice.topic, keyword or choice.keyword
+        result = await worker.pipeline().generate_and_publish(
+            niche=niche, topic=topic, keyword=keyword
+        )
+        result = {**result, "local_path": str(result["local_path"])}
+        worker.checkpoint(niche=niche, topic=topic, keyword=keyword, generated=result)
+
+    if payload.get("push"):
+        from leadgen.publishers.git import GitPublishTransaction
+
+        tx = GitPublishTransaction(worker.project_dir, f"content: auto-generated post ({niche})")
+        tx.add_post({**result, "niche": niche})
+        async with worker.git_lock:
+            await asyncio.to_thread(tx.finish)
+
+    if payload.get("follow_up", True):
+        slug = result["slug"]
+        if cross_post_publishers(worker.config):
+            worker.queue.enqueue("cross-post", {"slug": slug})
+        if worker.config.postiz_api_key:
+            worker.queue.enqueue("distribute", {"slug": slug})
+
+    return {"slug": result["slug"], "niche": niche, "topic": topic}
+
+
+@handler("fill-buffer")
+async def fill_buffer_job(worker: Worker, payload: dict) -> dict:
+    """Draft posts ahead of the schedule (see :mod:`leadgen.buffer`)."""
+    from leadgen.buffer import ContentBuffer
+
+    buffer = ContentBuffer(worker.pipeline(), worker.config, payload.get("size"))
+    drafted = await buffer.fill()
+    return {"drafted": [post["slug"] for post in drafted]}
+
+
+@handler("cross-post")
+async def cross_post_job(worker: Worker, payload: dict) -> dict:
+    publishers = cross_post_publishers(worker.config, payload.get("platforms"))
+    if not publishers:
+        return {}
+    from leadgen.publishers.sync import SyncStore
+
+    post_data = worker.pipeline().load_post(payload["slug"])
+    results = await worker.pipeline().cross_post(post_data, publishers)
+    with SyncStore(Path(worker.config.data_dir) / "crosspost.db") as store:
+        store.record_results(post_data, results)
+    return {name: r["url"] for name, r in results.items()}
+
+
+@handler("distribute")
+async def distribute_job(worker: Worker, payload: dict) -> dict:
+    from leadgen.distributors.postiz import PostizDistributor
+
+    schedule_date = payload.get("schedule_date") or (
+        datetime.now(timezone.utc) + timedelta(minutes=10)
+    ).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    distributor = PostizDistributor(
+        api_key=worker.config.postiz_api_key,
+        base_url=worker.config.postiz_base_url,
+        ledger=idempotency_store(worker.config),
+    )
+    from leadgen.media.library import MediaLibrary
+
+    post_data = worker.pipeline().load_post(payload["slug"])
+    with MediaLibrary(Path(worker.config.data_dir) / "media") as media:
+        scheduled = await worker.pipeline().distribute(
+            post_data, distributor, schedule_date, media=media
+        )
+    variants = [
+        (f"postiz:{s['platform']}", s["date"][:10], s["variant"]) for s in scheduled if s["variant"]
+    ]
+    if variants:
+        from leadgen.analytics.store import AnalyticsStore
+
+        with AnalyticsStore(Path(worker.config.data_dir) / "analytics.db") as store:
+            store.set_variants(payload["slug"], variants)
+    return {"scheduled": len(scheduled)}
+
+
+@handler("sync")
+async def sync_job(worker: Worker, payload: dict) -> dict:
+    """Refresh remote state: subscriber mirror, cross-posted copies or analytics."""
+    target = payload.get("target", "subscribers")
+    if target == "subscribers":
+        return await _sync_subscribers(worker, payload)
+    if target == "cross-posts":
+        return await _sync_cross_posts(worker, payload)
+    if target == "analytics":
+        return await _sync_analytics(worker, payload)
+    raise ValueError(f"Unknown sync target: {target}")
+
+
+async def _sync_subscribers(worker: Worker, payload: dict) -> dict:
+    from leadgen.email.convertkit import ConvertKitClient
+    from leadgen.email.dedupe import DedupeIndex
+    from leadgen.email.mirror import SubscriberMirror
+
+    data_dir = Path(worker.config.data_dir)
+    client = ConvertKitClient(
+        api_key=worker.config.convertkit_api_key,
+        api_secret=worker.config.convertkit_api_secret,
+    )
+    with SubscriberMirror(data_dir / "subscribers.db") as mirror:
+        written = await mirror.sync(client, full=payload.get("full", False))
+        with DedupeIndex(data_dir / "dedupe") as dedupe:
+            dedupe.add_many(mirror.emails())
+    return {"synced": written}
+
+
+async def _sync_cross_posts(worker: Worker, payload: dict) -> dict:
+    from leadgen.publishers.sync import CrossPostSync, SyncStore
+
+    publishers = cross_post_publishers(worker.config, payload.get("platforms"))
+    with SyncStore(Path(worker.config.data_dir) / "crosspost.db") as store:
+        report = await CrossPostSync(store, publishers, worker.pipeline()).run(
+            force=payload.get("force", False)
+        )
+    if report.failed:
+        raise RuntimeError(f"{len(report.failed)} cross-posts failed: {report.failed}")
+    return {"created": len(report.created), "updated": len(report.updated)}
+
+
+async def _sync_analytics(worker: Worker, payload: dict) -> dict:
+    from leadgen.analytics.collectors import AnalyticsCollector
+    from leadgen.analytics.store import AnalyticsStore
+
+    with AnalyticsStore(Path(worker.config.data_dir) / "analytics.db") as store:
+        results = await AnalyticsCollector(store, worker.config).collect(payload.get("sources"))
+    failed = {name: r for name, r in results.items() if isinstance(r, str)}
+    if failed:
+        raise RuntimeError(f"analytics sources failed: {failed}")
+    return results
@@ -0,0 +1,160 @@
+import re
+from datetime import date, timedelta
+import httpx
+import pytest
+from leadgen.analytics.collectors import AnalyticsCollector
+from leadgen.analytics.store import AnalyticsStore
+from leadgen.config import Config
+from leadgen.email import convertkit  # noqa: F401  (imported before httpx is patched)
+from leadgen.publishers.hugo import HugoPublisher
+
+
+TODAY = date(2026, 10, 19)
+
+
+def test_store_books_deltas_events_and_rollups(tmp_path):
+    with AnalyticsStore(tmp_path / "analytics.db") as store:
+        store.set_posts({"a": "hvac", "b": "hvac", "c": "dental"})
+        store.observe_totals("2026-10-18", "devto", [("a", "views", 100), ("c", "views", 40)])
+        assert store.observe_totals("2026-10-19", "devto", [("a", "views", 130), ("c", "views", 40)]) == 1
+        store.observe_totals("2026-10-19", "devto", [("a", "views", 120)])  # recount down
+
+        assert store.add_events("convertkit", "leads", [
+            ("s1", "2026-10-10", "a"), ("s2", "2026-10-11", "c"), ("s3", "2026-10-12", "c"),
+        ]) == 3
+        assert store.add_events("convertkit", "leads", [("s1", "2026-10-10", "a")]) == 0
+
+        store.set_daily("postiz:x", [("2026-10-19", "", "impressions", 5)])
+        store.set_daily("postiz:x", [("2026-10-19", "", "impressions", 9)])
+
+        niches = store.top_niches("leads", days=90, today=TODAY)
+        assert [(n["niche"], n["leads"], n["posts"]) for n in niches] == [("dental", 2, 1), ("hvac", 1, 2)]
+        assert store.top_posts("views", days=2, today=TODAY) == [{"slug": "a", "views": 130}, {"slug": "c", "views": 40}]
+        assert store.top_posts("views", days=1, today=TODAY) == [{"slug": "a", "views": 30}]
+        assert store.channel_totals(days=1, today=TODAY) == {"devto": {"views": 30}, "postiz:x": {"impressions": 9}}
+
+        store.set_posts({"a": "dental"})  # re-tagging a post re-rolls history
+        niches = store.top_niches("views", days=90, today=TODAY)
+        assert niches[0]["niche"] == "dental" and niches[0]["views"] == 170
+
+
+def test_top_niches_reads_only_the_rollups_over_a_year_of_data(tmp_path):
+    with AnalyticsStore(tmp_path / "analytics.db") as store:
+        slugs = {f"post-{i}": f"niche-{i % 8}" for i in range(300)}
+        store.set_posts(slugs)
+        start = date(2025, 10, 20)
+        for offset in range(365):
+            day = (start + timedelta(days=offset)).isoformat()
+            store.set_daily("devto", [(day, slug, "views", offset % 7) for slug in list(slugs)[:60]])
+            store.add_events("convertkit", "leads", [(f"{day}-{n}", day, f"post-{n * 7 % 300}") for n in range(3)])
+
+        statements = []
+        store.conn.set_trace_callback(statements.append)
+        niches = store.top_niches("leads", days=90, today=TODAY)
+        store.conn.set_trace_callback(None)
+        [query] = statements
+        plan = [row[3] for row in store.conn.execute("EXPLAIN QUERY PLAN " + query)]
+    assert sum(n["leads"] for n in niches) == 270
+    assert not re.search(r"\bdaily\b", query)  # never the per-post rows
+    assert any("USING PRIMARY KEY (day>?)" in step for step in plan)  # only the days asked for
+
+
+class FakeChannels:
+    def __init__(self):
+        self.calls = []
+        self.devto_views = 10
+        self.not_modified = 0
+
+    def __call__(self, request):
+        self.calls.append((request.url.host, request.url.path))
+        host = request.url.host
+        if host == "dev.to":
+            etag = f'W/"v{self.devto_views}"'
+            if request.headers.get("if-none-match") == etag:
+                self.not_modified += 1
+                return httpx.Response(304)
+            return httpx.Response(200, headers={"etag": etag}, json=[
+                {"id": 1, "canonical_url": "https://blog.example.com/posts/fix-hvac/",
+                 "page_views_count": self.devto_views, "public_reactions_count": 2, "comments_count": 0},
+                {"id": 2, "canonical_url": "", "page_views_count": 999},
+            ])
+        if host == "gql.hashnode.com":
+            page = {"edges": [{"node": {"id": "h1", "slug": "fix-hvac", "views": 7,
+                                        "reactionCount": 1, "responseCount": 0}}],
+                    "pageInfo": {"hasNextPage": False, "endCursor": None}}
+            return httpx.Response(200, json={"data": {"publication": {"posts": page}}})
+        if request.url.path.endswith("/integrations"):
+            return httpx.Response(200, json=[{"id": "i1", "providerIdentifier": "linkedin"}])
+        if "/analytics/" in request.url.path:
+            return httpx.Response(200, json=[{"label": "Impressions", "data": [
+                {"total": "40", "date": "2026-10-18"}, {"total": "12", "date": "2026-10-19"},
+            ]}])
+        assert host == "api.convertkit.com"
+        return httpx.Response(200, json={"total_pages": 1, "subscribers": [
+            {"id": 5, "created_at": "2026-10-19T08:00:00Z",
+             "fields": {"source": "https://blog.example.com/posts/fix-hvac/"}},
+            {"id": 6, "created_at": "2026-10-19T09:00:00Z", "fields": {"source": None}},
+        ]})
+
+
+@pytest.mark.asyncio
+async def test_collector_polls_every_channel_incrementally(tmp_path, monkeypatch):
+    api = FakeChannels()
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "leadgen.http.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(api), **kw),
+    )
+    hugo = HugoPublisher(str(tmp_path / "blog"))
+    hugo.publish({"title": "Fix HVAC", "slug": "fix-hvac", "meta_description": "", "body": "x",
+                  "niche": "hvac"})
+    hugo.publish({"title": "Queued", "slug": "queued", "meta_description": "", "body": "x",
+                  "niche": "hvac", "draft": True})
+    config = Config(
+        data_dir=str(tmp_path), hugo_blog_dir=str(tmp_path / "blog"),
+        devto_api_key="k", hashnode_api_token="t", hashnode_publication_id="p",
+        postiz_api_key="z", convertkit_api_key="ck", convertkit_api_secret="cs",
+    )
+
+    with AnalyticsStore(tmp_path / "analytics.db") as store:
+        first = await AnalyticsCollector(store, config, today=TODAY).collect()
+        assert first == {"devto": 2, "hashnode": 2, "postiz": 2, "convertkit": 2}
+        assert store.top_niches("leads", today=TODAY) == [
+            {"niche": "hvac", "leads": 1, "posts": 1, "per_post": 1.0}
+        ]
+        assert store.top_posts("views", today=TODAY) == [{"slug": "fix-hvac", "views": 17}]
+
+        second = await AnalyticsCollector(store, config, today=TODAY).collect()
+        assert second["devto"] == 0 and second["hashnode"] == 0 and second["convertkit"] == 0
+        assert api.not_modified == 1
+        ck_query = [c for c in api.calls if c[0] == "api.convertkit.com"]
+        assert len(ck_query) == 2
+
+        api.devto_views = 15
+        third = await AnalyticsCollector(store, config, today=TODAY).collect(["devto"])
+        assert third == {"devto": 1}
+        assert store.channel_totals(today=TODAY)["devto"]["views"] == 15
+        assert store.channel_totals(today=TODAY)["postiz:linkedin"] == {"impressions": 52}
+
+
+@pytest.mark.asyncio
+async def test_devto_etag_is_only_saved_with_its_rows(tmp_path, monkeypatch):
+    api = FakeChannels()
+
+    def handler(request):
+        if request.url.params.get("page") == "2":
+            return httpx.Response(400)
+        return api(request)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "leadgen.http.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+    monkeypatch.setattr("leadgen.analytics.collectors.DEVTO_PAGE_SIZE", 2)
+    config = Config(data_dir=str(tmp_path), hugo_blog_dir=str(tmp_path / "blog"), devto_api_key="k")
+
+    with AnalyticsStore(tmp_path / "analytics.db") as store:
+        with pytest.raises(httpx.HTTPStatusError):
+            await AnalyticsCollector(store, config, today=TODAY).collect_devto()
+        assert store.cursor("devto:page:1") == ""
@@ -0,0 +1,67 @@
+import pytest
+from leadgen.bench.runner import BenchParams, compare, percentile, run_bench
+from leadgen.bench.standins import ServiceProfile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7.0], 95) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_compare_flags_throughput_and_latency_regressions():
+    baseline = {"posts_per_min": 100, "stages": {"generate": {"count": 5, "p50_ms": 200, "p95_ms": 300}}}
+    report = {"posts_per_min": 85, "stages": {"generate": {"count": 5, "p50_ms": 205, "p95_ms": 400}}}
+    assert compare(report, baseline) == [
+        "posts_per_min 100 -> 85",
+        "generate p95_ms 300 -> 400",
+    ]
+    assert compare(baseline, baseline) == []
+
+
+@pytest.mark.asyncio
+async def test_bench_drives_every_stage_through_standins():
+    params = BenchParams(
+        posts=3,
+        concurrency=2,
+        latency_ms=1,
+        jitter_ms=0,
+        claude_latency_ms=0,
+        claude_words=40,
+        keywords_per_post=20,
+        leads_per_post=2,
+        services={"hashnode": ServiceProfile(error_rate=1.0)},
+    )
+    report = await run_bench(params)
+
+    assert report["requests"] == {
+        "devto": 3, "hashnode": 3, "postiz": 0, "convertkit": 0, "dataforseo": 3,
+    }
+    # Hashnode always fails, so every post stops at cross-posting.
+    assert report["failed"] == 3 and report["injected_errors"] == 3
+    assert report["stages"]["generate"]["count"] == 3
+    assert report["stages"]["cross_post"]["errors"] == 3
+    assert report["stages"]["distribute"]["count"] == 0
+
+    healthy = await run_bench(BenchParams(
+        posts=2, concurrency=2, latency_ms=0, jitter_ms=0, claude_latency_ms=0, claude_words=40,
+        keywords_per_post=5, leads_per_post=2,
+    ))
+    assert healthy["completed"] == 2 and healthy["posts_per_min"] > 0
+    assert healthy["requests"]["postiz"] == 4 and healthy["requests"]["convertkit"] == 4
+    assert healthy["peak_rss_mb"]["self"] > 0
+
+
+@pytest.mark.asyncio
+async def test_bench_replays_a_recorded_run(tmp_path):
+    params = BenchParams(
+        posts=2, concurrency=2, latency_ms=0, jitter_ms=0, claude_latency_ms=0, claude_words=40,
+        keywords_per_post=5, leads_per_post=1,
+    )
+    recorded = await run_bench(params, record=tmp_path / "run.jsonl")
+    replayed = await run_bench(params, replay=tmp_path / "run.jsonl")
+
+    assert replayed["mode"] == "replay" and replayed["completed"] == 2
+    assert replayed["requests"] == recorded["requests"]
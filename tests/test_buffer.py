@@ -0,0 +1,94 @@
+import time
+from unittest.mock import AsyncMock, patch
+import pytest
+from click.testing import CliRunner
+from leadgen.buffer import ContentBuffer
+from leadgen.cli import main
+from leadgen.config import Config
+from leadgen.pipeline import LeadgenPipeline
+
+
+SOCIAL = {p: f"on {p}" for p in ("linkedin", "x", "facebook", "instagram", "threads")}
+
+
+def _fake_post(niche, topic, keyword="", variants=0):
+    slug = f"{niche}-{topic}".replace(" ", "-")
+    return {"title": slug.title(), "slug": slug, "meta_description": "d",
+            "body": "Body.\n", "tags": ["ai"]}
+
+
+@pytest.fixture
+def setup(tmp_path):
+    config = Config(data_dir=str(tmp_path / "data"), hugo_blog_dir=str(tmp_path / "blog"),
+                    ab_variants=0, buffer_size=3)
+    pipeline = LeadgenPipeline("sonnet", config.hugo_blog_dir)
+    return config, pipeline
+
+
+@pytest.mark.asyncio
+async def test_fill_drafts_distinct_picks_with_social_copy(setup):
+    config, pipeline = setup
+    buffer = ContentBuffer(pipeline, config)
+    with patch.object(pipeline.generator, "generate_blog_post", AsyncMock(side_effect=_fake_post)), \
+         patch.object(pipeline.generator, "repurpose_to_social", AsyncMock(return_value=SOCIAL)) as social:
+        drafted = await buffer.fill()
+        assert len(drafted) == 3 and social.await_count == 3
+        assert await buffer.fill() == []
+
+    drafts = buffer.drafts()
+    assert len({(d["niche"], d["topic"]) for d in drafts}) == 3
+    assert all(d["draft"] and d["social"] == SOCIAL for d in drafts)
+
+
+@pytest.mark.asyncio
+async def test_promote_publishes_oldest_draft_without_the_llm(setup):
+    config, pipeline = setup
+    hugo = pipeline.hugo_publisher
+    for slug, niche in (("first", "hvac"), ("second", "accounting")):
+        hugo.publish({"title": slug, "slug": slug, "meta_description": "", "body": "x",
+                      "niche": niche, "topic": "t", "draft": True, "social": SOCIAL})
+        time.sleep(0.001)
+    buffer = ContentBuffer(pipeline, config)
+
+    assert buffer.promote(niche="law firms") is None
+    with patch.object(pipeline.generator, "generate_blog_post", AsyncMock()) as generate, \
+         patch.object(pipeline.generator, "repurpose_to_social", AsyncMock()) as social:
+        post = buffer.promote()
+    generate.assert_not_called()
+    social.assert_not_called()
+    assert post["slug"] == "first" and post["social"] == SOCIAL
+    assert hugo.load("first")["draft"] is False
+    assert hugo.drafts() == ["second"]
+    assert buffer.promote(niche="accounting")["slug"] == "second"
+    assert buffer.promote() is None
+
+
+def test_publish_command_promotes_before_generating(setup, monkeypatch):
+    config, pipeline = setup
+    monkeypatch.setenv("LEADGEN_DATA_DIR", config.data_dir)
+    monkeypatch.setenv("HUGO_BLOG_DIR", config.hugo_blog_dir)
+    pipeline.hugo_publisher.publish({"title": "Ready", "slug": "ready", "meta_description": "",
+                                     "body": "x", "niche": "hvac", "draft": True})
+    with patch("leadgen.pipeline.LeadgenPipeline.generate_and_publish") as generate:
+        result = CliRunner().invoke(main, ["publish", "--no-push"])
+    assert result.exit_code == 0, result.output
+    assert "Published from buffer: Ready" in result.output
+    generate.assert_not_called()
+
+
+def test_buffer_fill_push_commits_only_the_new_drafts(setup, monkeypatch):
+    config, _ = setup
+    monkeypatch.setenv("LEADGEN_DATA_DIR", config.data_dir)
+    monkeypatch.setenv("HUGO_BLOG_DIR", config.hugo_blog_dir)
+    monkeypatch.setenv("LEADGEN_BUFFER_SIZE", "2")
+    pushed = []
+    monkeypatch.setattr("leadgen.publishers.git.GitPublishTransaction.finish",
+                        lambda tx: pushed.append([e.path for e in tx.entries]) or True)
+    with patch("leadgen.content_generator.ContentGenerator.generate_blog_post",
+               AsyncMock(side_effect=_fake_post)), \
+         patch("leadgen.content_generator.ContentGenerator.repurpose_to_social",
+               AsyncMock(return_value=SOCIAL)):
+        result = CliRunner().invoke(main, ["buffer", "fill", "--push"])
+    assert result.exit_code == 0, result.output
+    assert [len(paths) for paths in pushed] == [2]
+    assert all(path.endswith(".md") for path in pushed[0])
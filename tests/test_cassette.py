@@ -0,0 +1,76 @@
+import asyncio
+import json
+from unittest.mock import patch
+import httpx
+import pytest
+from leadgen.bench.cassette import CassetteMiss, recording, replaying
+from leadgen.email.convertkit import ConvertKitClient
+from leadgen.publishers.devto import DevtoPublisher
+from leadgen.seo.keywords import KeywordResearcher
+
+
+POST = {"title": "Cassette Post", "body": "Body", "tags": ["ai"]}
+
+
+async def _live(request):
+    await asyncio.sleep(0.05)
+    if request.url.host == "dev.to":
+        return httpx.Response(201, json={"id": 7, "url": "https://dev.to/x/cassette-post"})
+    email = json.loads(request.content)["email"]
+    return httpx.Response(200, json={"subscription": {"subscriber": {"email_address": email}}})
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_without_network(tmp_path):
+    cassette = tmp_path / "api.jsonl"
+    devto = DevtoPublisher(api_key="secret-devto-key")
+    convertkit = ConvertKitClient("secret-ck-key", "secret-ck-secret")
+
+    async with recording(cassette, httpx.MockTransport(_live)) as recorder:
+        recorded = await devto.publish(POST)
+        await convertkit.add_subscriber_to_form("f1", "a@x.com")
+        await convertkit.add_subscriber_to_form("f1", "a@x.com")
+    assert recorder.recorded == 3
+    assert "secret" not in cassette.read_text()
+
+    slept = []
+
+    async def sleep(delay, *args):
+        slept.append(delay)
+
+    with patch("leadgen.bench.cassette.asyncio.sleep", sleep):
+        async with replaying(cassette) as player:
+            assert await devto.publish(POST) == recorded
+            first = await convertkit.add_subscriber_to_form("f1", "a@x.com")
+            second = await convertkit.add_subscriber_to_form("f1", "a@x.com")
+            with pytest.raises(CassetteMiss):
+                await convertkit.add_subscriber_to_form("f1", "a@x.com")  # only two recorded
+            with pytest.raises(CassetteMiss):
+                await convertkit.add_subscriber_to_form("f1", "b@x.com")
+        assert slept == []  # no recorded latency is waited out
+        assert first == second and player.remaining == 0
+
+        async with replaying(cassette, realtime=True):
+            await devto.publish(POST)
+    assert len(slept) == 1 and slept[0] >= 0.045
+
+
+@pytest.mark.asyncio
+async def test_replayed_stream_goes_through_the_streaming_parser(tmp_path):
+    items = [
+        {"keyword": f"kw {i}", "search_volume": i, "keyword_difficulty": i % 100}
+        for i in range(2000)
+    ]
+    body = {"status_code": 20000, "tasks": [{"result": [{"total_count": 2000, "items": items}]}]}
+    researcher = KeywordResearcher("login", "password")
+    cassette = tmp_path / "dataforseo.jsonl"
+
+    async with recording(cassette, httpx.MockTransport(lambda r: httpx.Response(200, json=body))):
+        live = [r async for r in researcher.iter_suggestions("seed")]
+    assert "password" not in cassette.read_text()
+
+    meta = {}
+    async with replaying(cassette):
+        replayed = [r async for r in researcher.iter_suggestions("seed", meta=meta)]
+    assert replayed == live and len(replayed) == 2000
+    assert meta["total_count"] == 2000
@@ -8,3 +8,12 @@ def test_status_command():
     result = runner.invoke(main, ["status"])
     assert result.exit_code == 0
     assert "Leadgen system: OK" in result.output
+
+
+def test_status_cold_start_within_budget():
+    from leadgen.doctor import STARTUP_BUDGET_MS, measure_startup
+
+    report = measure_startup(["status"])
+
+    assert report.heavy_modules == []
+    assert report.elapsed_ms <= STARTUP_BUDGET_MS
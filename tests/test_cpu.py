@@ -0,0 +1,37 @@
+import os
+import pytest
+from leadgen import cpu, tracing
+from leadgen.cpu import CpuPool, use_pool
+
+
+def _square(n):
+    return n * n
+
+
+def _pid(_):
+    return os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_tasks_in_warm_worker_processes(tmp_path):
+    with tracing.trace("test", tmp_path) as run:
+        async with CpuPool(max_workers=2) as pool:
+            assert pool.max_workers == 2
+            with use_pool(pool):
+                assert await cpu.map(_square, range(50)) == [n * n for n in range(50)]
+                pids = set(await cpu.map(_pid, range(16), chunksize=1))
+                assert await cpu.run(_square, 7) == 49
+
+    assert os.getpid() not in pids and len(pids) <= 2
+    names = [s.name for s in run.spans]
+    assert names.count("cpu:pool") == 1
+    span = next(s for s in run.spans if s.name == "cpu:_square")
+    assert span.attrs["workers"] == 2 and span.attrs["wait_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_without_a_pool_work_runs_in_a_thread():
+    assert await cpu.run(_pid, None) == os.getpid()
+    assert await cpu.map(_square, []) == []
+    assert await cpu.map(_square, [1, 2]) == [1, 4]
+    assert cpu.default_workers() >= 1
@@ -0,0 +1,61 @@
+import asyncio
+import os
+import time
+import pytest
+from leadgen import deadline
+from leadgen.content_generator import ContentGenerator
+from leadgen.pipeline import LeadgenPipeline
+
+
+def test_budget_is_capped_by_the_innermost_deadline():
+    assert deadline.remaining() is None and deadline.budget(300) == 300
+    with deadline.deadline(10):
+        assert 9 < deadline.budget(300) <= 10
+        with deadline.deadline(60):  # cannot extend the outer deadline
+            assert deadline.budget() <= 10
+        with deadline.deadline(1):
+            assert deadline.short(5)
+    with deadline.deadline(-1), pytest.raises(deadline.DeadlineExceeded):
+        deadline.budget(5)
+
+
+@pytest.mark.asyncio
+async def test_llm_subprocess_is_killed_when_the_deadline_passes(tmp_path, monkeypatch):
+    pid_file = tmp_path / "pid"
+    script = tmp_path / "claude"
+    script.write_text(f"#!/bin/sh\necho $$ > {pid_file}\nexec sleep 30\n")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    started = time.monotonic()
+    with deadline.deadline(0.5), pytest.raises(deadline.DeadlineExceeded):
+        await ContentGenerator(slots=asyncio.Semaphore(1)).generate_blog_post("hvac", "costs")
+    assert time.monotonic() - started < 5
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
+
+
+@pytest.mark.asyncio
+async def test_optional_stages_are_deferred_not_awaited(tmp_path, monkeypatch):
+    pipeline = LeadgenPipeline("sonnet", str(tmp_path / "blog"))
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def quick():
+        return "done"
+
+    assert await pipeline.optional("quick", quick) == "done"
+    with deadline.deadline(30):
+        assert await pipeline.optional("skipped", quick, reserve=10) is None  # < 60s + reserve
+    monkeypatch.setattr("leadgen.pipeline.MIN_OPTIONAL_SECONDS", 0.1)
+    with deadline.deadline(10.5):
+        started = time.monotonic()
+        assert await pipeline.optional("slow", slow, reserve=10) is None
+        assert time.monotonic() - started < 2 and cancelled == [True]
+        assert deadline.remaining() > 9  # the required stages keep their reserve
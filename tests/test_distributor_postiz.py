@@ -1,5 +1,5 @@
 # tests/test_distributor_postiz.py
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 import pytest
 from leadgen.distributors.postiz import PostizDistributor
 
@@ -17,10 +17,11 @@ async def test_get_integrations(distributor):
         {"id": "int3", "providerIdentifier": "facebook", "name": "My Page"},
     ]
 
-    with patch("leadgen.distributors.postiz.httpx.AsyncClient") as MockClient:
+    with patch("leadgen.http.httpx.AsyncClient") as MockClient:
         mock_client = AsyncMock()
         MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
         MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
+        mock_client.get.return_value = MagicMock()  # httpx responses are sync
         mock_client.get.return_value.json.return_value = mock_integrations
         mock_client.get.return_value.raise_for_status = lambda: None
 
@@ -37,10 +38,11 @@ async def test_schedule_multi_platform_post(distributor):
         {"postId": "post2", "integration": "int2"},
     ]
 
-    with patch("leadgen.distributors.postiz.httpx.AsyncClient") as MockClient:
+    with patch("leadgen.http.httpx.AsyncClient") as MockClient:
         mock_client = AsyncMock()
         MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
         MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
+        mock_client.post.return_value = MagicMock()  # httpx responses are sync
         mock_client.post.return_value.json.return_value = mock_response
         mock_client.post.return_value.raise_for_status = lambda: None
 
@@ -68,10 +70,11 @@ async def test_schedule_multi_platform_post(distributor):
 async def test_post_now(distributor):
     mock_response = [{"postId": "post1", "integration": "int1"}]
 
-    with patch("leadgen.distributors.postiz.httpx.AsyncClient") as MockClient:
+    with patch("leadgen.http.httpx.AsyncClient") as MockClient:
         mock_client = AsyncMock()
         MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
         MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
+        mock_client.post.return_value = MagicMock()  # httpx responses are sync
         mock_client.post.return_value.json.return_value = mock_response
         mock_client.post.return_value.raise_for_status = lambda: None
 
@@ -86,7 +89,7 @@ async def test_post_now(distributor):
 
 @pytest.mark.asyncio
 async def test_check_connection(distributor):
-    with patch("leadgen.distributors.postiz.httpx.AsyncClient") as MockClient:
+    with patch("leadgen.http.httpx.AsyncClient") as MockClient:
         mock_client = AsyncMock()
         MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
         MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
@@ -0,0 +1,93 @@
+import json
+from unittest.mock import patch
+import httpx
+import pytest
+from leadgen.email.bulk import BulkImporter, ImportProgress, RateLimiter, iter_csv_leads
+from leadgen.email.convertkit import ConvertKitClient
+
+
+@pytest.fixture
+def leads_csv(tmp_path):
+    path = tmp_path / "leads.csv"
+    rows = ["Email,First Name,FirstName"]
+    rows += [f"lead{i}@example.com,,Lead{i}" for i in range(20)]
+    rows += ["LEAD3@Example.com ,,Dup", "not-an-email,,Bad"]
+    path.write_text("\n".join(rows) + "\n")
+    return path
+
+
+def _mock_convertkit(calls, fail_first=()):
+    def handler(request):
+        email = json.loads(request.content)["email"]
+        calls.append(email)
+        if email in fail_first and calls.count(email) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"subscription": {"subscriber": {"email_address": email}}})
+
+    real_client = httpx.AsyncClient
+    return patch(
+        "leadgen.email.bulk.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_dedupes_and_retries(leads_csv, tmp_path):
+    calls = []
+    importer = BulkImporter(
+        ConvertKitClient("key", "secret"), "form1", concurrency=4, requests_per_minute=60_000
+    )
+    progress = ImportProgress(tmp_path / "progress.jsonl")
+
+    with _mock_convertkit(calls, fail_first={"lead5@example.com"}):
+        result = await importer.run(iter_csv_leads(leads_csv), progress)
+    progress.close()
+
+    assert result.imported == 20
+    assert result.duplicates == 1
+    assert result.invalid == 1
+    assert calls.count("lead5@example.com") == 2
+    assert len(set(calls)) == 20
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_resumes_from_progress_file(leads_csv, tmp_path):
+    progress_path = tmp_path / "progress.jsonl"
+    progress_path.write_text(
+        "".join(json.dumps({"email": f"lead{i}@example.com", "status": "ok"}) + "\n" for i in range(15))
+        + '{"email": "lead15@exa'  # torn line from a crash
+    )
+    calls = []
+    importer = BulkImporter(
+        ConvertKitClient("key", "secret"), "form1", requests_per_minute=60_000
+    )
+    progress = ImportProgress(progress_path)
+
+    with _mock_convertkit(calls):
+        result = await importer.run(iter_csv_leads(leads_csv), progress)
+    progress.close()
+
+    assert result.already_done == 16  # includes the duplicate of lead3
+    assert sorted(calls) == [f"lead{i}@example.com" for i in range(15, 20)]
+
+
+@pytest.mark.asyncio
+async def test_every_retry_takes_a_rate_limit_token(leads_csv, tmp_path, monkeypatch):
+    calls, tokens = [], []
+    acquire = RateLimiter.acquire
+
+    async def counted(self):
+        tokens.append(1)
+        await acquire(self)
+
+    monkeypatch.setattr(RateLimiter, "acquire", counted)
+    importer = BulkImporter(
+        ConvertKitClient("key", "secret"), "form1", concurrency=2, requests_per_minute=60_000
+    )
+    progress = ImportProgress(tmp_path / "progress.jsonl")
+    with _mock_convertkit(calls, fail_first={"lead1@example.com", "lead2@example.com"}):
+        result = await importer.run(iter_csv_leads(leads_csv), progress)
+    progress.close()
+
+    assert result.imported == 20
+    assert len(calls) == 22 and len(tokens) == len(calls)
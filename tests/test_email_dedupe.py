@@ -0,0 +1,69 @@
+import hashlib
+import httpx
+import pytest
+from leadgen.email.convertkit import ConvertKitClient
+from leadgen.email.dedupe import BloomFilter, DedupeIndex
+from leadgen.email.intake import LeadFlusher, LeadJournal
+from leadgen.email.normalize import canonical_email, normalize_email
+
+
+def test_canonical_email_collapses_variants():
+    assert normalize_email("  Ana.Lopez+Promo@GMail.com ") == "ana.lopez+promo@gmail.com"
+    assert canonical_email("Ana.Lopez+Promo@GMail.com") == "analopez@gmail.com"
+    assert canonical_email("a.n.a.lopez@googlemail.com") == "analopez@gmail.com"
+    assert canonical_email("first.last+crm@lawfirm.com") == "first.last@lawfirm.com"
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    for i in range(10_000):
+        bloom.add_digest(i.to_bytes(16, "little"))
+    assert all(bloom.contains_digest(i.to_bytes(16, "little")) for i in range(10_000))
+
+    misses = [hashlib.blake2b(str(i).encode(), digest_size=16).digest() for i in range(10_000)]
+    false_positives = sum(bloom.contains_digest(d) for d in misses)
+    assert false_positives < 300
+
+
+def test_dedupe_index_persists_and_rebuilds(tmp_path):
+    with DedupeIndex(tmp_path / "dedupe", capacity=1000) as index:
+        assert index.add("Ana.Lopez@gmail.com")
+        assert not index.add("analopez+news@gmail.com")
+        assert index.add_many(["b@x.com", "c@x.com", "B@X.com"]) == 2
+        assert index.seen("a.n.a.lopez@googlemail.com")
+        assert not index.seen("someone@else.com")
+
+    with DedupeIndex(tmp_path / "dedupe", capacity=1000) as index:
+        assert len(index) == 3
+        assert index.seen("c@x.com")
+        index.conn.execute("INSERT INTO emails (digest) VALUES (?)", (b"x" * 16,))
+        index.conn.commit()
+        index._dirty = False  # simulate a crash before the filter was saved
+
+    # Bloom file count no longer matches the exact set: it must be rebuilt.
+    with DedupeIndex(tmp_path / "dedupe", capacity=1000) as index:
+        assert index.bloom.count == 4
+        assert index.seen("b@x.com")
+
+
+@pytest.mark.asyncio
+async def test_flusher_skips_known_and_variant_addresses(tmp_path):
+    journal = LeadJournal(tmp_path / "leads")
+    for email in ("old@x.com", "new.lead@gmail.com", "newlead+roi@gmail.com"):
+        journal.append({"email": email})
+    sent = []
+
+    def handler(request):
+        sent.append(request.read())
+        return httpx.Response(200, json={})
+
+    with DedupeIndex(tmp_path / "dedupe", capacity=1000) as index:
+        index.add("old@x.com")
+        flusher = LeadFlusher(journal, ConvertKitClient("k", "s"), "form1", dedupe=index)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            assert await flusher.flush_once(http) == 3
+
+        assert len(sent) == 1
+        assert flusher.skipped == 2
+        assert index.seen("new.lead@gmail.com")
+    journal.close()
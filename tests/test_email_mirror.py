@@ -0,0 +1,73 @@
+from unittest.mock import patch
+import httpx
+import pytest
+from leadgen.email.convertkit import ConvertKitClient
+from leadgen.email.mirror import SubscriberMirror
+
+
+def _mock_convertkit(pages, requests):
+    def handler(request):
+        requests.append(dict(request.url.params))
+        page = int(request.url.params["page"])
+        return httpx.Response(200, json={
+            "total_subscribers": sum(len(p) for p in pages),
+            "page": page,
+            "total_pages": len(pages),
+            "subscribers": pages[page - 1],
+        })
+
+    real_client = httpx.AsyncClient
+    return patch(
+        "leadgen.email.convertkit.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+
+
+def _subscriber(i, state="active"):
+    return {"id": i, "email_address": f"User{i}@Example.com", "first_name": "", "state": state}
+
+
+@pytest.mark.asyncio
+async def test_sync_pages_through_all_subscribers(tmp_path):
+    requests = []
+    pages = [[_subscriber(1), _subscriber(2)], [_subscriber(3, "cancelled")]]
+
+    with SubscriberMirror(tmp_path / "subs.db") as mirror:
+        with _mock_convertkit(pages, requests):
+            written = await mirror.sync(ConvertKitClient("key", "secret"))
+
+        assert written == 3
+        assert [r["page"] for r in requests] == ["1", "2"]
+        assert "updated_from" not in requests[0]
+        assert mirror.contains("user2@example.com")
+        assert not mirror.contains("user3@example.com")
+        assert not mirror.contains("nobody@example.com")
+
+
+@pytest.mark.asyncio
+async def test_incremental_and_full_sync(tmp_path):
+    requests = []
+    with SubscriberMirror(tmp_path / "subs.db") as mirror:
+        with _mock_convertkit([[_subscriber(1), _subscriber(2)]], requests):
+            await mirror.sync(ConvertKitClient("key", "secret"))
+        with _mock_convertkit([[_subscriber(4)]], requests):
+            await mirror.sync(ConvertKitClient("key", "secret"))
+
+        assert requests[-1]["updated_from"] == mirror.last_sync.date().isoformat()
+        assert len(mirror) == 3
+
+        with _mock_convertkit([[_subscriber(2), _subscriber(4)]], requests):
+            await mirror.sync(ConvertKitClient("key", "secret"), full=True)
+
+        assert "updated_from" not in requests[-1]
+        assert len(mirror) == 2
+        assert not mirror.contains("user1@example.com")
+
+
+def test_an_email_moving_to_a_new_id_replaces_the_old_record(tmp_path):
+    with SubscriberMirror(tmp_path / "subs.db") as mirror:
+        mirror.upsert([_subscriber(1, "cancelled")], "2026-10-18T00:00:00+00:00")
+        mirror.upsert([{**_subscriber(1), "id": 9}], "2026-10-19T00:00:00+00:00")
+
+        assert len(mirror) == 1
+        assert mirror.contains("user1@example.com")
@@ -0,0 +1,76 @@
+import subprocess
+import pytest
+from leadgen.publishers.git import GitPublishTransaction
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repos(tmp_path, monkeypatch):
+    for key in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{key}_NAME", "Bot")
+        monkeypatch.setenv(f"GIT_{key}_EMAIL", "bot@example.com")
+    remote = tmp_path / "remote.git"
+    git(tmp_path, "init", "-q", "--bare", "-b", "main", str(remote))
+    clones = []
+    for name in ("a", "b"):
+        git(tmp_path, "clone", "-q", str(remote), name)
+        clones.append(tmp_path / name)
+    a, b = clones
+    (a / "README.md").write_text("blog\n")
+    git(a, "add", "README.md")
+    git(a, "commit", "-q", "-m", "init")
+    git(a, "push", "-q", "origin", "HEAD:main")
+    git(b, "pull", "-q", "origin", "main")
+    return remote, a, b
+
+
+def _post(repo, slug, niche="hvac"):
+    path = repo / "blog" / "content" / "posts" / f"{slug}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"# {slug}\n")
+    return {"slug": slug, "title": slug.title(), "niche": niche, "local_path": path}
+
+
+def test_batch_lands_as_one_commit_with_only_its_files(repos):
+    remote, a, _ = repos
+    (a / "README.md").write_text("local edit\n")
+    _post(a, "stray-draft")
+    with GitPublishTransaction(a, "content: 3 auto-generated posts") as tx:
+        for slug in ("one", "two", "three"):
+            tx.add_post(_post(a, slug))
+
+    assert tx.committed and tx.pushed
+    log = git(remote, "log", "--format=%s", "main").splitlines()
+    assert log == ["content: 3 auto-generated posts", "init"]
+    files = git(a, "show", "--name-only", "--format=", "HEAD").split()
+    assert sorted(files) == [f"blog/content/posts/{s}.md" for s in ("one", "three", "two")]
+    assert "- two: Two [hvac]" in git(a, "log", "-1", "--format=%b")
+    status = git(a, "status", "--porcelain")
+    assert " M README.md" in status and "stray-draft" in status
+
+
+def test_rejected_push_rebases_and_retries(repos):
+    remote, a, b = repos
+    (b / "other.txt").write_text("from another run\n")
+    git(b, "add", "other.txt")
+    git(b, "commit", "-q", "-m", "other run")
+    git(b, "push", "-q", "origin", "HEAD:main")
+
+    tx = GitPublishTransaction(a, "content: auto-generated post (hvac)")
+    tx.add_post(_post(a, "late"))
+    assert tx.finish() and tx.pushed
+    assert git(remote, "log", "--format=%s", "main").splitlines() == [
+        "content: auto-generated post (hvac)", "other run", "init",
+    ]
+    assert tx.finish() is False  # already done; nothing new
+
+
+def test_nothing_to_commit(repos):
+    _, a, _ = repos
+    tx = GitPublishTransaction(a)
+    assert tx.finish() is False
+    tx.add(a / "README.md")
+    assert tx.finish() is False
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+import pytest
+from leadgen.config import Config
+from leadgen.jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, LeaseLost
+from leadgen.pipeline import LeadgenPipeline
+from leadgen.publishers.git import GitPublishTransaction
+from leadgen.worker import HANDLERS, Worker, handler
+
+
+def test_claim_leases_job_until_it_expires(tmp_path):
+    with JobQueue(tmp_path / "jobs.db") as queue:
+        job_id = queue.enqueue("generate", {"niche": "hvac"})
+        queue.enqueue("sync", delay=60)
+
+        job = queue.claim(visibility_timeout=0.05)
+        assert job.id == job_id and job.payload == {"niche": "hvac"} and job.attempts == 1
+        assert queue.claim(visibility_timeout=0.05) is None  # leased; sync not ready
+
+        time.sleep(0.06)
+        reclaimed = queue.claim(visibility_timeout=60)
+        assert reclaimed.id == job_id and reclaimed.attempts == 2
+
+        # The first worker's lease lapsed: it can no longer finish the job.
+        with pytest.raises(LeaseLost):
+            queue.complete(job)
+        with pytest.raises(LeaseLost):
+            queue.fail(job, "late")
+        assert queue.counts()[RUNNING] == 1
+
+        queue.complete(reclaimed)
+        assert queue.counts()[DONE] == 1
+        assert queue.counts()[QUEUED] == 1
+
+
+def test_fail_retries_with_backoff_then_gives_up(tmp_path):
+    with JobQueue(tmp_path / "jobs.db", backoff=0) as queue:
+        queue.enqueue("cross-post", {"slug": "x"}, max_attempts=2)
+
+        job = queue.claim(60)
+        assert queue.fail(job, "boom") is True
+        job = queue.claim(60)
+        assert job.attempts == 2
+        assert queue.fail(job, "boom again") is False
+
+        assert queue.claim(60) is None
+        assert queue.counts()[FAILED] == 1
+        assert queue.recent_failures()[0]["error"] == "boom again"
+
+
+def test_a_lease_abandoned_max_attempts_times_fails_the_job(tmp_path):
+    with JobQueue(tmp_path / "jobs.db") as queue:
+        job_id = queue.enqueue("generate", max_attempts=3)
+        for attempt in range(1, 4):
+            job = queue.claim(visibility_timeout=-1)  # the worker is killed mid-job
+            assert job.id == job_id and job.attempts == attempt
+
+        assert queue.ready_count() == 0
+        assert queue.claim(visibility_timeout=60) is None
+        assert queue.counts()[FAILED] == 1
+        assert queue.recent_failures() == [
+            {"id": job_id, "kind": "generate", "attempts": 3, "error": "lease expired"}
+        ]
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_handlers_and_follow_ups(tmp_path, monkeypatch):
+    for kind in ("generate", "cross-post"):
+        monkeypatch.setitem(HANDLERS, kind, HANDLERS[kind])  # restored after the test
+    calls = []
+
+    @handler("generate")
+    async def fake_generate(worker, payload):
+        calls.append(("generate", payload["niche"]))
+        worker.queue.enqueue("cross-post", {"slug": payload["niche"]})
+
+    @handler("cross-post")
+    async def flaky_cross_post(worker, payload):
+        calls.append(("cross-post", payload["slug"]))
+        if len(calls) == 2:
+            raise RuntimeError("rate limited")
+
+    with JobQueue(tmp_path / "jobs.db", backoff=0) as queue:
+        queue.enqueue("generate", {"niche": "hvac"})
+        queue.enqueue("mystery")
+        worker = Worker(queue, Config(data_dir=str(tmp_path)), concurrency=2, poll_interval=0.01, echo=lambda _: None)
+        await asyncio.wait_for(worker.run(drain=True), timeout=5)
+
+        assert calls == [("generate", "hvac"), ("cross-post", "hvac"), ("cross-post", "hvac")]
+        assert queue.counts() == {QUEUED: 0, "running": 0, DONE: 2, FAILED: 1}
+        assert queue.recent_failures()[0]["kind"] == "mystery"
+
+
+@pytest.mark.asyncio
+async def test_generate_retry_pushes_the_post_it_already_wrote(tmp_path, monkeypatch):
+    generate = AsyncMock(return_value={"title": "T", "slug": "t", "tags": [],
+                                       "local_path": tmp_path / "t.md"})
+    monkeypatch.setattr(LeadgenPipeline, "generate_and_publish", generate)
+    pushes = []
+
+    def finish(tx):
+        pushes.append(tx.message())
+        if len(pushes) == 1:
+            raise RuntimeError("push rejected")
+
+    monkeypatch.setattr(GitPublishTransaction, "finish", finish)
+
+    with JobQueue(tmp_path / "jobs.db", backoff=0) as queue:
+        queue.enqueue("generate", {"niche": "hvac", "topic": "a", "push": True, "follow_up": False})
+        worker = Worker(queue, Config(data_dir=str(tmp_path)), poll_interval=0.01, echo=lambda _: None)
+        await asyncio.wait_for(worker.run(drain=True), timeout=5)
+
+        assert queue.counts()[DONE] == 1
+    assert generate.await_count == 1
+    assert len(pushes) == 2 and "t: T [hvac]" in pushes[1]
@@ -0,0 +1,80 @@
+import struct
+import zlib
+from unittest.mock import AsyncMock
+import pytest
+from leadgen.cpu import CpuPool, use_pool
+from leadgen.media.cards import HEIGHT, WIDTH, CardSpec, render_card
+from leadgen.media.library import MediaLibrary
+from leadgen.pipeline import LeadgenPipeline
+
+
+class FakePostiz:
+    base_url = "https://postiz.test/public/v1"
+    api_key = "key"
+
+    def __init__(self):
+        self.uploads = []
+
+    async def upload(self, filename, data, content_type="image/png"):
+        self.uploads.append(filename)
+        return {"id": f"m{len(self.uploads)}", "path": f"https://cdn.test/{filename}"}
+
+
+def test_card_is_a_deterministic_png():
+    spec = CardSpec("How AI agents cut no-shows by 40%", "dental offices", "blog.example.com")
+    data = render_card(spec)
+    assert data == render_card(spec)
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height = struct.unpack(">II", data[16:24])
+    assert (width, height) == (WIDTH, HEIGHT)
+    idat_len = struct.unpack(">I", data[33:37])[0]
+    raw = zlib.decompress(data[41:41 + idat_len])
+    assert len(raw) == HEIGHT * (1 + WIDTH * 3)
+    assert render_card(CardSpec(spec.title, "hvac")) != data
+
+
+@pytest.mark.asyncio
+async def test_cards_are_rendered_and_uploaded_once(tmp_path, monkeypatch):
+    specs = [CardSpec(f"Post {i}", "hvac") for i in range(4)] + [CardSpec("Post 0", "hvac")]
+    postiz = FakePostiz()
+    async with CpuPool(max_workers=2) as pool:
+        with use_pool(pool), MediaLibrary(tmp_path / "media") as library:
+            hashes = await library.cards(specs)
+            assert len(hashes) == 4 and all(library.path(h).exists() for h in hashes.values())
+
+            monkeypatch.setattr("leadgen.media.library.render_card", lambda spec: 1 / 0)
+            assert await library.cards(specs) == hashes  # nothing re-rendered
+
+            refs = await library.images(specs + specs, postiz)
+            assert len(postiz.uploads) == 4
+            assert refs[specs[0]] == refs[specs[4]]
+
+    with MediaLibrary(tmp_path / "media") as library:
+        await library.images(specs, postiz)
+    assert len(postiz.uploads) == 4  # upload cache survives restarts
+
+
+@pytest.mark.asyncio
+async def test_distribute_reuses_one_card_per_variant_across_platforms(tmp_path):
+    pipeline = LeadgenPipeline("sonnet", str(tmp_path / "blog"), site_url="https://blog.example.com")
+    platforms = ("linkedin", "x", "threads")
+    variants = [{"id": k, "title": f"Angle {k}", **{p: f"{k} on {p}" for p in platforms}} for k in "ab"]
+    post = {"title": "T", "body": "b", "niche": "hvac", "variants": variants}
+    distributor = AsyncMock()
+    distributor.get_integrations.return_value = [{"id": p, "providerIdentifier": p} for p in platforms]
+    postiz = FakePostiz()
+    distributor.upload.side_effect = postiz.upload
+    distributor.base_url, distributor.api_key = postiz.base_url, postiz.api_key
+
+    with MediaLibrary(tmp_path / "media") as library:
+        await pipeline.distribute(post, distributor, "2026-10-20T09:00:00.000Z", media=library)
+        await pipeline.distribute(post, distributor, "2026-10-27T09:00:00.000Z", media=library)
+
+    assert len(postiz.uploads) == 2
+    sent = [p for call in distributor.schedule_post.await_args_list for p in call.args[0]]
+    assert len(sent) == 12
+    by_variant = {}
+    for p in sent:
+        by_variant.setdefault(p["variant"], set()).add(p["image"][0]["id"])
+    assert all(len(ids) == 1 for ids in by_variant.values())
+    assert by_variant["a"] != by_variant["b"]
@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from click.testing import CliRunner
+from leadgen.cli import main
+from leadgen.profiling import Profiler
+
+
+async def _workload():
+    async def step(n):
+        await asyncio.sleep(0.01)
+        return [str(i) * 10 for i in range(n)]
+
+    return await asyncio.gather(*(step(2000) for _ in range(5)))
+
+
+def test_sample_mode_writes_collapsed_stacks_and_alloc_report(tmp_path):
+    with Profiler("publish", tmp_path, interval=0.001) as profiler:
+        asyncio.run(_workload())
+
+    suffixes = sorted(path.suffix for path in profiler.outputs)
+    assert suffixes == [".collapsed", ".txt"]
+    collapsed = profiler.prefix.with_suffix(".collapsed").read_text().splitlines()
+    assert collapsed
+    for line in collapsed:
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+    report = profiler.prefix.with_suffix(".alloc.txt").read_text()
+    assert "idle in the event loop" in report
+    assert "top 25 allocation sites" in report
+
+
+def test_cprofile_mode_writes_pstats(tmp_path):
+    with Profiler("generate", tmp_path, mode="cprofile") as profiler:
+        asyncio.run(_workload())
+
+    assert profiler.prefix.with_suffix(".prof").stat().st_size > 0
+    assert "function calls" in profiler.prefix.with_suffix(".cpu.txt").read_text()
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Profiler("status", tmp_path, mode="perf")
+
+
+def test_profile_option_wraps_any_command(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEADGEN_DATA_DIR", str(tmp_path / "data"))
+    result = CliRunner().invoke(main, ["--profile", "--profile-dir", str(tmp_path), "status"])
+    assert result.exit_code == 0, result.output
+    assert sorted(p.name.split("-", 1)[0] for p in tmp_path.glob("status-*")) == ["status"] * 2
+    assert "Profile:" in result.output
@@ -15,7 +15,7 @@ async def test_devto_publish(publisher):
         "url": "https://dev.to/username/test-post-abc",
     }
 
-    with patch("leadgen.publishers.devto.httpx.AsyncClient") as MockClient:
+    with patch("leadgen.http.httpx.AsyncClient") as MockClient:
         mock_client = AsyncMock()
         mock_resp = MagicMock()
         mock_resp.json.return_value = mock_response
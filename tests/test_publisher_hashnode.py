@@ -24,7 +24,7 @@ async def test_hashnode_publish(publisher):
         }
     }
 
-    with patch("leadgen.publishers.hashnode.httpx.AsyncClient") as MockClient:
+    with patch("leadgen.http.httpx.AsyncClient") as MockClient:
         mock_client = AsyncMock()
         mock_resp = MagicMock()
         mock_resp.json.return_value = mock_response
@@ -43,3 +43,83 @@ async def test_hashnode_publish(publisher):
 
     assert result["id"] == "abc123"
     assert "url" in result
+
+
+@pytest.mark.asyncio
+async def test_publish_many_batches_aliases_and_maps_errors(publisher, monkeypatch):
+    import json
+    import httpx
+
+    documents = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        documents.append(body["query"])
+        data, errors = {}, []
+        for alias, value in body["variables"].items():
+            if value["title"] == "Broken":
+                data[alias] = None
+                errors.append({"message": "Slug already taken", "path": [alias]})
+            else:
+                post_id = value.get("id", f"new-{value['slug']}")
+                data[alias] = {"post": {"id": post_id, "url": f"https://h.dev/{value['slug']}"}}
+        return httpx.Response(200, json={"data": data, "errors": errors})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "leadgen.http.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+    posts = [
+        {"title": f"Post {i}", "body": "Body", "tags": ["ai"], "slug": f"post-{i}"}
+        for i in range(5)
+    ]
+    posts[2]["title"] = "Broken"
+    posts[4]["remote_id"] = "existing-4"
+
+    results = await publisher.publish_many(posts, max_ops=2)
+
+    assert len(documents) == 3
+    assert "p0: publishPost(input: $p0)" in documents[0]
+    assert "$p0: UpdatePostInput!" in documents[2]
+    assert results[2] == {"error": "Slug already taken"}
+    assert results[0]["id"] == "new-post-0"
+    assert results[4] == {"id": "existing-4", "url": "https://h.dev/post-4"}
+
+    documents.clear()
+    await publisher.publish_many(posts, max_bytes=400)
+    assert len(documents) == 5  # every post is over half the byte budget
+
+
+@pytest.mark.asyncio
+async def test_publish_many_keeps_earlier_batches_when_one_fails(publisher, monkeypatch):
+    import json
+    import httpx
+
+    requests = []
+
+    def handler(request):
+        variables = json.loads(request.content)["variables"]
+        requests.append(variables)
+        if len(requests) == 2:
+            return httpx.Response(400, json={"errors": [{"message": "bad request"}]})
+        return httpx.Response(200, json={"data": {
+            alias: {"post": {"id": f"new-{v['slug']}", "url": f"https://h.dev/{v['slug']}"}}
+            for alias, v in variables.items()
+        }})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "leadgen.http.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+    posts = [
+        {"title": f"Post {i}", "body": "Body", "tags": ["ai"], "slug": f"post-{i}"}
+        for i in range(5)
+    ]
+
+    results = await publisher.publish_many(posts, max_ops=2)
+
+    assert len(requests) == 3
+    assert [r.get("id") for r in results] == ["new-post-0", "new-post-1", None, None, "new-post-4"]
+    assert "HTTPStatusError" in results[2]["error"] and results[3] == results[2]
@@ -0,0 +1,101 @@
+import json
+import httpx
+import pytest
+from leadgen.pipeline import LeadgenPipeline
+from leadgen.publishers.devto import DevtoPublisher
+from leadgen.publishers.hashnode import HashnodePublisher
+from leadgen.publishers.sync import CrossPostSync, SyncStore
+
+
+def _write_post(pipeline, slug, body, draft=False):
+    pipeline.hugo_publisher.publish(
+        {"title": slug.title(), "slug": slug, "meta_description": "", "body": body, "tags": ["ai"]}
+    )
+    if draft:
+        path = pipeline.hugo_publisher.content_dir / f"{slug}.md"
+        path.write_text(path.read_text().replace("draft: false", "draft: true"))
+
+
+class FakeAPIs:
+    """Dev.to REST and Hashnode GraphQL, just enough for sync."""
+
+    def __init__(self):
+        self.calls = []
+        self.devto_existing = []
+        self.next_id = 100
+
+    def __call__(self, request):
+        self.calls.append((request.method, request.url.host, request.url.path))
+        if request.url.host == "dev.to":
+            if request.method == "GET":
+                page = int(request.url.params["page"])
+                return httpx.Response(200, json=self.devto_existing if page == 1 else [])
+            self.next_id += 1
+            article_id = int(request.url.path.rsplit("/", 1)[-1]) if request.method == "PUT" else self.next_id
+            return httpx.Response(200, json={"id": article_id, "url": f"https://dev.to/a/{article_id}"})
+
+        body = json.loads(request.content)
+        if body["query"].lstrip().startswith("query"):
+            page = {"edges": [], "pageInfo": {"hasNextPage": False, "endCursor": None}}
+            return httpx.Response(200, json={"data": {"publication": {"posts": page}}})
+        data = {
+            alias: {"post": {"id": value.get("id", f"h-{value['slug']}"), "url": f"https://h.dev/{value['slug']}"}}
+            for alias, value in body["variables"].items()
+        }
+        return httpx.Response(200, json={"data": data})
+
+
+@pytest.mark.asyncio
+async def test_sync_creates_updates_and_skips_by_hash(tmp_path, monkeypatch):
+    api = FakeAPIs()
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "leadgen.http.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(api), **kw),
+    )
+    pipeline = LeadgenPipeline("sonnet", str(tmp_path / "blog"), site_url="https://blog.example.com")
+    for slug in ("alpha", "beta", "gamma"):
+        _write_post(pipeline, slug, f"Body of {slug}.\n")
+    _write_post(pipeline, "draft-post", "Not yet.\n", draft=True)
+    # gamma went to Dev.to before the store existed.
+    api.devto_existing = [{"id": 7, "url": "https://dev.to/a/7", "title": "Gamma",
+                           "canonical_url": "https://blog.example.com/posts/gamma/"}]
+
+    publishers = {"devto": DevtoPublisher("key"), "hashnode": HashnodePublisher("token", "pub")}
+    with SyncStore(tmp_path / "crosspost.db") as store:
+        sync = CrossPostSync(store, publishers, pipeline)
+        first = await sync.run()
+        assert sorted(first.created) == [
+            "devto:alpha", "devto:beta", "hashnode:alpha", "hashnode:beta", "hashnode:gamma",
+        ]
+        assert first.updated == ["devto:gamma"]
+        assert ("PUT", "dev.to", "/api/articles/7") in api.calls
+        assert sum(host == "gql.hashnode.com" and method == "POST" for method, host, _ in api.calls) == 2
+
+        api.calls.clear()
+        second = await sync.run()
+        assert second.unchanged == 6 and not second.created and not second.updated
+        assert api.calls == []
+
+        _write_post(pipeline, "beta", "Edited body.\n")
+        third = await sync.run()
+        assert sorted(third.updated) == ["devto:beta", "hashnode:beta"]
+        assert store.records("devto")["beta"].remote_id == store.records("devto")["beta"].url.rsplit("/", 1)[-1]
+        put = [c for c in api.calls if c[0] == "PUT"]
+        assert put == [("PUT", "dev.to", f"/api/articles/{store.records('devto')['beta'].remote_id}")]
+
+
+@pytest.mark.asyncio
+async def test_dry_run_and_failures_leave_store_untouched(tmp_path):
+    class Broken:
+        async def publish(self, post):
+            raise RuntimeError("429 Too Many Requests")
+
+    pipeline = LeadgenPipeline("sonnet", str(tmp_path / "blog"))
+    _write_post(pipeline, "alpha", "Body.\n")
+    with SyncStore(tmp_path / "crosspost.db") as store:
+        sync = CrossPostSync(store, {"devto": Broken()}, pipeline)
+        assert (await sync.run(dry_run=True)).created == ["devto:alpha"]
+        report = await sync.run()
+        assert report.failed == {"devto:alpha": "RuntimeError: 429 Too Many Requests"}
+        assert store.records("devto") == {}
@@ -0,0 +1,78 @@
+import pytest
+from leadgen.publishers import transform
+from leadgen.publishers.transform import render
+
+
+BODY = """# Cut Missed Calls
+
+Read [the ROI guide]({{< ref "posts/roi-guide.md" >}}) or [pricing](/pricing/).
+
+# Why it matters
+
+{{< figure src="/img/calls.png" alt="Calls per day" >}}
+
+<div class="cta"><p>Book a <a href="/contact/">free call</a> &amp; save.</p></div>
+
+{{< youtube abc123 >}}
+
+```md
+[untouched](/relative/)
+```
+"""
+
+POST = {
+    "title": "Cut Missed Calls",
+    "body": BODY,
+    "tags": ["AI", "Small Business", "ai", "HVAC", "phones", "extra"],
+    "canonical_url": "https://blog.example.com/posts/cut-missed-calls/",
+}
+
+
+def test_devto_render():
+    post = render(POST, "devto")
+    body = post["body"]
+    assert post["tags"] == ["ai", "smallbusiness", "hvac", "phones"]
+    assert not body.startswith("# Cut Missed Calls")
+    assert "## Why it matters" in body
+    assert "[the ROI guide](https://blog.example.com/posts/roi-guide/)" in body
+    assert "[pricing](https://blog.example.com/pricing/)" in body
+    assert "![Calls per day](https://blog.example.com/img/calls.png)" in body
+    assert "Book a [free call](https://blog.example.com/contact/) & save." in body
+    assert "<div" not in body
+    assert "{% embed https://www.youtube.com/watch?v=abc123 %}" in body
+    assert "[untouched](/relative/)" in body
+
+
+def test_hashnode_render_keeps_html_with_absolute_urls():
+    post = render(POST, "hashnode")
+    assert post["tags"] == ["AI", "Small Business", "HVAC", "phones", "extra"]
+    assert '<a href="https://blog.example.com/contact/">free call</a>' in post["body"]
+    assert "%[https://www.youtube.com/watch?v=abc123]" in post["body"]
+    assert post["canonical_url"] == POST["canonical_url"]
+
+
+def test_headings_shift_below_platform_title():
+    post = render({"title": "Other", "body": "# One\n\nText\n\n## Two\n"}, "devto")
+    assert post["body"] == "## One\n\nText\n\n### Two\n"
+
+
+def test_body_is_parsed_once_per_content_hash(monkeypatch):
+    calls = []
+    real_parse = transform.parse
+    monkeypatch.setattr(transform, "parse", lambda body: calls.append(body) or real_parse(body))
+    monkeypatch.setattr(transform, "_parsed", transform._LRU())
+    monkeypatch.setattr(transform, "_rendered", transform._LRU())
+
+    post = {**POST, "body": BODY + "\nFresh paragraph.\n"}
+    for platform in ("devto", "hashnode", "devto"):
+        render(post, platform)
+    render({**post, "canonical_url": "https://mirror.example.com/posts/x/"}, "hashnode")
+    assert len(calls) == 1
+
+    render({**post, "body": post["body"] + "edit"}, "devto")
+    assert len(calls) == 2
+
+
+def test_unknown_platform():
+    with pytest.raises(KeyError):
+        render(POST, "medium")
@@ -0,0 +1,150 @@
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+import httpx
+import pytest
+from leadgen import deadline, resilience
+from leadgen.http import session
+from leadgen.publishers.devto import DevtoPublisher
+from leadgen.resilience import CircuitOpenError, IdempotencyStore, RetryPolicy, retry_policy
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    resilience.reset_breakers()
+    yield
+    resilience.reset_breakers()
+
+
+def _mock(handler):
+    real_client = httpx.AsyncClient
+    return patch(
+        "leadgen.http.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+
+
+def _flaky(calls, statuses, headers=None):
+    def handler(request):
+        calls.append(request.method)
+        status = statuses[len(calls) - 1] if len(calls) <= len(statuses) else 200
+        return httpx.Response(status, headers=headers or {}, json={"n": len(calls)})
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_until_it_succeeds():
+    calls = []
+    with _mock(_flaky(calls, [502, 503])), retry_policy(RetryPolicy(backoff=0)):
+        async with session() as client:
+            resp = await client.get("https://api.test/items")
+    assert resp.status_code == 200 and resp.json() == {"n": 3}
+
+
+@pytest.mark.asyncio
+async def test_post_is_retried_only_when_the_server_did_not_process_it():
+    calls = []
+    with _mock(_flaky(calls, [502])), retry_policy(RetryPolicy(backoff=0)):
+        async with session() as client:
+            assert (await client.post("https://api.test/articles", json={})).status_code == 502
+    assert len(calls) == 1
+
+    calls.clear()
+    with _mock(_flaky(calls, [429, 503], headers={"Retry-After": "0"})):
+        async with session() as client:
+            assert (await client.post("https://api.test/articles", json={})).status_code == 200
+    assert len(calls) == 3
+
+
+def test_retry_after_accepts_seconds_and_dates():
+    later = datetime.now(timezone.utc) + timedelta(seconds=90)
+    date = httpx.Response(503, headers={"Retry-After": format_datetime(later, usegmt=True)})
+    assert 80 < resilience.retry_after(date) <= 90
+    assert resilience.retry_after(httpx.Response(429, headers={"Retry-After": "7"})) == 7
+    assert RetryPolicy(max_retry_after=60).delay(0, date) is None
+
+
+@pytest.mark.asyncio
+async def test_retry_never_sleeps_past_the_deadline():
+    calls = []
+    with _mock(_flaky(calls, [429], headers={"Retry-After": "30"})), deadline.deadline(5):
+        async with session() as client:
+            assert (await client.get("https://api.test/items")).status_code == 429
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_repeated_failures():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.host)
+        return httpx.Response(503 if request.url.host == "down.test" else 200)
+
+    with _mock(handler), retry_policy(RetryPolicy(max_retries=0)):
+        async with session() as client:
+            for _ in range(resilience.BREAKER_THRESHOLD):
+                assert (await client.get("https://down.test/")).status_code == 503
+            with pytest.raises(CircuitOpenError):
+                await client.get("https://down.test/")
+            assert (await client.get("https://up.test/")).status_code == 200
+    assert len(calls) == resilience.BREAKER_THRESHOLD + 1
+
+    circuit = resilience.breaker("down.test")
+    circuit.opened_at -= resilience.BREAKER_COOLDOWN
+    with _mock(lambda request: httpx.Response(200)):
+        async with session() as client:
+            assert (await client.get("https://down.test/")).status_code == 200
+    assert not circuit.open
+
+
+@pytest.mark.asyncio
+async def test_retried_publish_never_creates_a_second_article(tmp_path):
+    created = []
+
+    def handler(request):
+        if request.method == "POST":
+            created.append(json.loads(request.content)["article"])
+            if len(created) == 1:
+                return httpx.Response(502)  # created, but the response was lost
+            return httpx.Response(201, json={"id": len(created), "url": "https://dev.to/x"})
+        return httpx.Response(200, json=[
+            {"id": 1, "url": "https://dev.to/a/first", "title": a["title"], "slug": "first",
+             "canonical_url": a["canonical_url"]}
+            for a in created[:1]
+        ])
+
+    post = {"title": "First", "body": "b", "tags": ["ai"], "canonical_url": "https://blog.test/posts/first/"}
+    with IdempotencyStore(tmp_path / "idempotency.db") as ledger, _mock(handler):
+        publisher = DevtoPublisher("key", ledger=ledger)
+        with pytest.raises(httpx.HTTPStatusError):
+            await publisher.publish(post)
+        assert await publisher.publish(post) == {"id": 1, "url": "https://dev.to/a/first"}
+        assert await publisher.publish(post) == {"id": 1, "url": "https://dev.to/a/first"}
+        other = await publisher.publish({**post, "title": "Second", "canonical_url": ""})
+    assert len(created) == 2 and other["id"] == 2
+
+
+@pytest.mark.asyncio
+async def test_recovery_does_not_adopt_an_article_that_only_shares_the_title(tmp_path):
+    created = []
+
+    def handler(request):
+        if request.method == "POST":
+            created.append(json.loads(request.content)["article"])
+            if len(created) == 1:
+                return httpx.Response(502)
+            return httpx.Response(201, json={"id": 2, "url": "https://dev.to/a/new"})
+        return httpx.Response(200, json=[
+            {"id": 1, "url": "https://dev.to/a/old", "title": "First", "slug": "first",
+             "canonical_url": "https://blog.test/posts/old-first/"}
+        ])
+
+    post = {"title": "First", "body": "b", "tags": ["ai"], "canonical_url": "https://blog.test/posts/first/"}
+    with IdempotencyStore(tmp_path / "idempotency.db") as ledger, _mock(handler):
+        publisher = DevtoPublisher("key", ledger=ledger)
+        with pytest.raises(httpx.HTTPStatusError):
+            await publisher.publish(post)
+        assert await publisher.publish(post) == {"id": 2, "url": "https://dev.to/a/new"}
@@ -0,0 +1,94 @@
+import json
+import sqlite3
+from unittest.mock import patch
+import httpx
+import pytest
+from leadgen.seo.crawler import KeywordCrawler
+from leadgen.seo.keyword_store import KeywordStore
+from leadgen.seo.keywords import KeywordResearcher
+
+
+def _page(offset, size, total):
+    items = [
+        {"keyword": f"kw {i}", "search_volume": i, "keyword_difficulty": i % 60}
+        for i in range(offset, min(offset + size, total))
+    ]
+    # Overlap with the previous page to exercise deduplication.
+    if offset:
+        items.append({"keyword": f"KW {offset - 1}", "search_volume": 0, "keyword_difficulty": 0})
+    return {"tasks": [{"result": [{"total_count": total, "offset": offset, "items": items}]}]}
+
+
+@pytest.fixture
+def mock_dataforseo():
+    calls = []
+
+    def handler(request):
+        task = json.loads(request.content)[0]
+        offset = task["offset"]
+        calls.append(offset)
+        if offset == 20 and calls.count(20) == 1:
+            return httpx.Response(502)
+        if offset == 30:
+            return httpx.Response(503)
+        return httpx.Response(200, json=_page(offset, task["limit"], total=45))
+
+    real_client = httpx.AsyncClient
+    with patch(
+        "leadgen.http.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    ):
+        yield calls
+
+
+@pytest.mark.asyncio
+async def test_crawl_fetches_all_pages_with_retries(mock_dataforseo):
+    crawler = KeywordCrawler(
+        KeywordResearcher("login", "password"),
+        page_size=10,
+        max_retries=2,
+        backoff=0,
+    )
+
+    records = [r async for r in crawler.crawl("ai agents")]
+    keywords = {r["keyword"] for r in records}
+
+    assert crawler.total_count == 45
+    assert crawler.failed_offsets == [30]
+    assert mock_dataforseo.count(30) == 3
+    assert len(records) == len(keywords) == 36
+    assert "kw 25" in keywords and "kw 35" not in keywords
+
+
+@pytest.mark.asyncio
+async def test_crawl_into_store(mock_dataforseo, tmp_path):
+    crawler = KeywordCrawler(
+        KeywordResearcher("login", "password"), page_size=10, max_retries=0, backoff=0
+    )
+
+    with KeywordStore(tmp_path / "keywords.db") as store:
+        written = await crawler.crawl_into(store, "restaurants", "ai agents", batch_size=7)
+        top = store.top("restaurants", max_difficulty=50, limit=3)
+
+    assert written == 26
+    assert [kw["keyword"] for kw in top] == ["kw 44", "kw 43", "kw 42"]
+
+
+def test_keyword_store_keeps_one_row_per_niche(tmp_path):
+    path = tmp_path / "keywords.db"
+    old = sqlite3.connect(path)
+    old.executescript(
+        "CREATE TABLE keywords (keyword TEXT PRIMARY KEY, niche TEXT NOT NULL,"
+        " search_volume INTEGER NOT NULL DEFAULT 0, keyword_difficulty INTEGER NOT NULL DEFAULT 0,"
+        " updated_at TEXT NOT NULL);"
+        "CREATE INDEX keywords_niche_difficulty ON keywords (niche, keyword_difficulty);"
+        "INSERT INTO keywords VALUES ('ai receptionist', 'dental', 900, 20, '2026-01-01');"
+    )
+    old.close()
+
+    with KeywordStore(path) as store:
+        store.upsert("law firms", [{"keyword": "ai receptionist", "search_volume": 400, "keyword_difficulty": 30}])
+        store.upsert("dental", [{"keyword": "ai receptionist", "search_volume": 1000, "keyword_difficulty": 20}])
+        assert store.top("dental") == [{"keyword": "ai receptionist", "search_volume": 1000, "keyword_difficulty": 20}]
+        assert store.top("law firms")[0]["search_volume"] == 400
+        assert store.count() == 2
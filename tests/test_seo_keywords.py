@@ -1,5 +1,5 @@
 # tests/test_seo_keywords.py
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 import pytest
 from leadgen.seo.keywords import KeywordResearcher
 
@@ -37,10 +37,11 @@ async def test_get_keyword_suggestions(researcher):
         ]
     }
 
-    with patch("leadgen.seo.keywords.httpx.AsyncClient") as MockClient:
+    with patch("leadgen.http.httpx.AsyncClient") as MockClient:
         mock_client = AsyncMock()
         MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
         MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
+        mock_client.post.return_value = MagicMock()  # httpx responses are sync
         mock_client.post.return_value.json.return_value = mock_response
         mock_client.post.return_value.raise_for_status = lambda: None
 
@@ -60,3 +61,34 @@ def test_filter_low_competition(researcher):
     filtered = researcher.filter_low_competition(keywords, max_difficulty=50)
     assert len(filtered) == 2
     assert all(k["keyword_difficulty"] <= 50 for k in filtered)
+
+
+@pytest.mark.asyncio
+async def test_iter_suggestions_streams_records(researcher):
+    import json
+    import httpx
+
+    body = json.dumps({
+        "tasks": [{"result": [{"items": [
+            {"keyword": f"kw {i}", "search_volume": i, "keyword_difficulty": i % 100}
+            for i in range(500)
+        ]}]}]
+    }).encode()
+
+    def handler(request):
+        assert json.loads(request.content)[0]["limit"] == 1000
+        return httpx.Response(200, content=body)
+
+    real_client = httpx.AsyncClient
+    with patch(
+        "leadgen.http.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    ):
+        matched, top = await researcher.top_low_competition(
+            researcher.iter_suggestions("ai agents for restaurants"),
+            max_difficulty=50,
+            top_n=3,
+        )
+
+    assert matched == 255
+    assert [kw["keyword"] for kw in top] == ["kw 450", "kw 449", "kw 448"]
@@ -0,0 +1,79 @@
+import json
+from collections import Counter
+from datetime import date
+from click.testing import CliRunner
+from leadgen.cli import main
+from leadgen.config import Config
+from leadgen.publishers.hugo import HugoPublisher
+from leadgen.seo.selection import Arm, Candidate, Outcome, TopicSelector, load_outcomes, next_topics
+
+
+def test_bandit_favours_the_niche_that_converts():
+    outcomes = [Outcome("hvac", "streamlining operations", 6.0) for _ in range(8)]
+    outcomes += [Outcome(n, "streamlining operations", 0.2) for n in ("restaurants", "accounting") for _ in range(8)]
+    picks = Counter()
+    for seed in range(200):
+        selector = TopicSelector(seed=seed)
+        selector.observe(outcomes)
+        picks[selector.rank(selector.candidates())[0].niche] += 1
+    assert picks.most_common(1)[0][0] == "hvac"
+    assert picks["hvac"] > 100
+    # Untried niches are still explored.
+    assert picks["law firms"] + picks["real estate"] + picks["dental offices"] > 0
+
+
+def test_used_keywords_are_skipped_and_batches_spread_out():
+    selector = TopicSelector(["hvac"], ["a", "b"], seed=1)
+    keywords = {"hvac": [
+        {"keyword": "hvac ai", "search_volume": 5000, "keyword_difficulty": 10},
+        {"keyword": "hvac bots", "search_volume": 100, "keyword_difficulty": 40},
+    ]}
+    candidates = selector.candidates(keywords, used={"hvac ai"})
+    assert {c.keyword for c in candidates} == {"hvac bots"}
+    choices = selector.rank(candidates, count=5)
+    assert sorted((c.niche, c.topic) for c in choices) == [("hvac", "a"), ("hvac", "b")]
+
+
+def test_ranking_thousands_of_candidates_samples_each_arm_once(monkeypatch):
+    niches = [f"niche-{i}" for i in range(50)]
+    selector = TopicSelector(niches, ["a", "b", "c", "d"], seed=3)
+    candidates = [
+        Candidate(n, t, f"{n} {t} {k}", k * 10, k % 80)
+        for n in niches for t in "abcd" for k in range(25)
+    ]
+    assert len(candidates) == 5000
+    draws = []
+    sample = Arm.sample
+    monkeypatch.setattr(Arm, "sample", lambda arm, rng: draws.append(arm) or sample(arm, rng))
+    choices = selector.rank(candidates, count=10)
+    assert len(draws) == 50 + 4  # per niche and topic, not per candidate
+    assert len({(c.niche, c.topic) for c in choices}) == 10
+
+
+def test_next_topics_reads_the_blog_archive(tmp_path):
+    hugo = HugoPublisher(str(tmp_path / "blog"))
+    hugo.publish({"title": "Old", "slug": "old", "meta_description": "", "body": "x",
+                  "niche": "hvac", "topic": "a", "keyword": "hvac ai"})
+    config = Config(data_dir=str(tmp_path / "data"), hugo_blog_dir=str(tmp_path / "blog"))
+    [choice] = next_topics(config, niches=["hvac"], topics=["a"], seed=0)
+    assert (choice.niche, choice.topic) == ("hvac", "a")
+
+
+def test_drafts_earn_no_reward_but_keep_their_keyword(tmp_path):
+    hugo = HugoPublisher(str(tmp_path / "blog"))
+    for slug, draft in (("live", False), ("queued", True)):
+        hugo.publish({"title": slug, "slug": slug, "meta_description": "", "body": "x", "draft": draft,
+                      "niche": "hvac", "topic": "a", "keyword": f"hvac {slug}"})
+    outcomes, used = load_outcomes(tmp_path / "blog", None, today=date(2099, 1, 1))
+    assert outcomes == [Outcome("hvac", "a", 0.0)]
+    assert used == {"hvac live", "hvac queued"}
+
+
+def test_next_topic_command_prints_json(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEADGEN_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("HUGO_BLOG_DIR", str(tmp_path / "blog"))
+    result = CliRunner().invoke(main, ["next-topic", "--count", "3", "--seed", "7", "--json"])
+    assert result.exit_code == 0, result.output
+    picks = json.loads(result.output)
+    assert len(picks) == 3
+    assert len({(p["niche"], p["topic"]) for p in picks}) == 3
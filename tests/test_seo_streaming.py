@@ -0,0 +1,43 @@
+import json
+import pytest
+from leadgen.seo.streaming import JsonItemStream
+
+PATH = ("tasks", "*", "result", "*", "items")
+
+DOCUMENT = json.dumps({
+    "status_code": 20000,
+    "tasks": [
+        {
+            "status_code": 20000,
+            "result": [
+                {
+                    "total_count": 3,
+                    "items": [
+                        {"keyword": "a", "search_volume": 10, "keyword_difficulty": 1},
+                        {"keyword": "b \"quoted\" ]}", "search_volume": 20, "keyword_difficulty": 2},
+                    ],
+                }
+            ],
+        },
+        {"status_code": 20000, "result": [{"items": [{"keyword": "c", "search_volume": 30}]}]},
+    ],
+}, indent=1)
+
+
+def test_stream_yields_items_across_any_chunk_boundary():
+    for size in (1, 2, 7, 64, len(DOCUMENT)):
+        parser = JsonItemStream(PATH, capture=("total_count",))
+        items = []
+        for i in range(0, len(DOCUMENT), size):
+            items.extend(parser.feed(DOCUMENT[i:i + size]))
+        items.extend(parser.close())
+
+        assert [item["keyword"] for item in items] == ["a", 'b "quoted" ]}', "c"]
+        assert parser.captured["total_count"] == 3
+
+
+def test_stream_rejects_truncated_document():
+    parser = JsonItemStream(PATH)
+    parser.feed(DOCUMENT[: len(DOCUMENT) // 2])
+    with pytest.raises(ValueError):
+        parser.close()
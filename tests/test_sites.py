@@ -0,0 +1,91 @@
+import asyncio
+import httpx
+import pytest
+from leadgen.config import Config
+from leadgen.content_generator import ContentGenerator
+from leadgen.sites import SiteOrchestrator, load_sites
+
+
+SITES_YAML = """
+defaults:
+  content_model: haiku
+  topics: [saving money, missed appointments]
+sites:
+  - name: smile-dental
+    niches: [dental offices]
+    site_url: https://blog.smile.example
+    devto_api_key: ${SMILE_DEVTO_KEY}
+  - name: fix-hvac
+    hugo_blog_dir: hvac/blog
+    niches: [hvac, plumbing]
+"""
+
+
+@pytest.fixture
+def sites_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("SMILE_DEVTO_KEY", "dk-123")
+    path = tmp_path / "sites.yaml"
+    path.write_text(SITES_YAML)
+    return path
+
+
+def test_load_sites_resolves_per_site_config(sites_file, tmp_path):
+    base = Config(data_dir=str(tmp_path / "state"), devto_api_key="owner-key")
+    dental, hvac = load_sites(sites_file, base)
+
+    assert dental.config.devto_api_key == "dk-123"
+    assert hvac.config.devto_api_key == ""  # never inherited from the environment
+    assert dental.config.content_model == "haiku"
+    assert hvac.config.hugo_blog_dir == str(tmp_path / "hvac" / "blog")
+    assert dental.config.data_dir == str(tmp_path / "state" / "sites" / "smile-dental")
+    assert hvac.niches == ["hvac", "plumbing"]
+    assert hvac.topics == ["saving money", "missed appointments"]
+
+
+def test_load_sites_rejects_unknown_keys(tmp_path):
+    path = tmp_path / "sites.yaml"
+    path.write_text("sites:\n  - name: a\n    niches: [x]\n    topics: [y]\n    devto_key: k\n")
+    with pytest.raises(ValueError, match="devto_key"):
+        load_sites(path, Config())
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_round_robins_sites_under_a_shared_llm_limit(
+    sites_file, tmp_path, monkeypatch
+):
+    sites = load_sites(sites_file, Config(data_dir=str(tmp_path)))
+    order, active, peak, devto_posts = [], [0], [0], []
+
+    async def fake_claude(self, prompt, schema):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        order.append("dental" if "dental offices" in prompt else "hvac")
+        n = len(order)
+        return {"title": f"Post {n}", "slug": f"post-{n}", "meta_description": "d",
+                "body": "Body", "tags": ["ai"]}
+
+    def handler(request):
+        devto_posts.append(request.headers["api-key"])
+        return httpx.Response(201, json={"id": 1, "url": "https://dev.to/smile/post"})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(ContentGenerator, "_run_claude", fake_claude)
+    monkeypatch.setattr(
+        "leadgen.http.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+    orchestrator = SiteOrchestrator(sites, llm_concurrency=1, echo=lambda _: None)
+    runs = await orchestrator.run(posts_per_site=2)
+
+    assert peak[0] == 1
+    assert order == ["dental", "hvac", "dental", "hvac"]
+    assert all(run.slug and not run.error for run in runs)
+    for site in sites:  # picked by the selection engine, one pair per post
+        pairs = [(run.niche, run.topic) for run in runs if run.site == site.name]
+        assert len(set(pairs)) == 2 and {n for n, _ in pairs} <= set(site.niches)
+    assert [run.cross_posts for run in runs if run.site == "smile-dental"] == [
+        {"devto": "https://dev.to/smile/post"}
+    ] * 2
+    assert devto_posts == ["dk-123", "dk-123"]
@@ -0,0 +1,73 @@
+import asyncio
+import httpx
+import pytest
+from leadgen import tracing
+from leadgen.http import session
+
+
+def test_span_outside_a_trace_records_nothing(tmp_path):
+    with tracing.span("orphan") as span:
+        span.set(size=3)
+    assert span.duration_ms >= 0
+    assert not (tmp_path / "traces").exists()
+
+
+@pytest.mark.asyncio
+async def test_trace_exports_nested_spans_http_and_metrics(tmp_path):
+    def handler(request):
+        return httpx.Response(503 if request.url.path == "/fail" else 200, json={"ok": True})
+
+    real_client = httpx.AsyncClient
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "leadgen.http.httpx.AsyncClient",
+            lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+        )
+        with tracing.trace("cli:publish", tmp_path, niche="hvac"):
+            with tracing.span("generate"):
+                await asyncio.sleep(0.01)
+            async with session() as client:
+                await client.post("https://dev.to/api/articles", json={"title": "x"})
+                await client.get("https://dev.to/fail")
+
+        with pytest.raises(RuntimeError):
+            with tracing.trace("cli:publish", tmp_path):
+                with tracing.span("git:push"):
+                    raise RuntimeError("rejected")
+
+    spans = tracing.load_spans(tmp_path / "traces")
+    first = [s for s in spans if s["trace_id"] == spans[0]["trace_id"]]
+    root = next(s for s in first if s["parent_id"] is None)
+    assert root["name"] == "cli:publish" and root["attrs"] == {"niche": "hvac"}
+    by_name = {s["name"]: s for s in first}
+    assert by_name["generate"]["parent_id"] == root["span_id"]
+    assert by_name["generate"]["duration_ms"] >= 10
+    http_spans = [s for s in first if s["name"] == "http:dev.to"]
+    assert [s["attrs"]["status"] for s in http_spans] == [200, 503]
+    assert http_spans[0]["attrs"]["request_bytes"] == len(b'{"title":"x"}')
+    assert http_spans[1]["outcome"] == "error"
+
+    summary = tracing.summarize(spans)
+    assert summary["runs"] == 2 and summary["failed_runs"] == 1
+    assert summary["spans"]["git:push"]["errors"] == 1
+
+    prom = (tmp_path / "traces" / "leadgen.prom").read_text()
+    assert 'leadgen_span_duration_seconds_count{span="cli:publish"} 2' in prom
+    assert 'leadgen_span_errors_total{span="http:dev.to"} 1' in prom
+    assert 'leadgen_last_run_success{command="cli:publish"} 0' in prom
+
+
+def test_metrics_accumulate_across_runs_and_tolerate_torn_logs(tmp_path):
+    for _ in range(3):
+        with tracing.trace("job:sync", tmp_path):
+            pass
+    with open(tmp_path / "traces" / "spans.jsonl", "a") as f:
+        f.write('{"name": "torn')
+
+    textfile = tmp_path / "collector" / "leadgen.prom"
+    with tracing.trace("job:sync", tmp_path, textfile=textfile):
+        pass
+
+    assert 'leadgen_span_duration_seconds_count{span="job:sync"} 4' in textfile.read_text()
+    assert tracing.summarize(tracing.load_spans(tmp_path / "traces"), runs=2)["runs"] == 2
+    assert [s["name"] for s in tracing.load_spans(tmp_path / "traces")] == ["job:sync"] * 4
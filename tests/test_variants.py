@@ -0,0 +1,71 @@
+from collections import Counter
+from datetime import date
+from unittest.mock import AsyncMock, patch
+import pytest
+from leadgen.analytics.store import AnalyticsStore
+from leadgen.content_generator import ContentGenerator, blog_post_schema
+from leadgen.pipeline import LeadgenPipeline, variant_rounds
+
+
+PLATFORMS = ["linkedin", "x", "facebook", "instagram", "threads"]
+
+
+def _variant(angle):
+    return {"title": f"{angle} title", "meta_description": angle,
+            **{p: f"{angle} on {p}" for p in PLATFORMS}}
+
+
+@pytest.mark.asyncio
+async def test_variants_come_from_one_structured_call():
+    generator = ContentGenerator()
+    response = {"title": "T", "slug": "t", "meta_description": "d", "body": "b", "tags": [],
+                "variants": [_variant("savings"), _variant("time"), _variant("risk")]}
+    with patch.object(generator, "_call_claude", new_callable=AsyncMock) as call:
+        call.return_value = response
+        post = await generator.generate_blog_post("hvac", "costs", variants=3)
+
+    call.assert_awaited_once()
+    prompt, schema = call.await_args.args
+    assert "exactly 3 alternative angles" in prompt
+    assert schema["properties"]["variants"]["minItems"] == 3
+    assert [v["id"] for v in post["variants"]] == ["a", "b", "c"]
+    assert blog_post_schema(0) == blog_post_schema()
+
+
+def test_rounds_rotate_every_variant_across_platforms_and_slots():
+    variants = [{"id": k, **_variant(k)} for k in "abc"]
+    integrations = [{"id": f"i-{p}", "providerIdentifier": p} for p in ("linkedin", "x", "bluesky", "threads")]
+    rounds = variant_rounds(variants, integrations, "2026-10-20T09:00:00.000Z")
+
+    assert [d for d, _ in rounds] == [
+        "2026-10-20T09:00:00.000Z", "2026-10-21T09:00:00.000Z", "2026-10-22T09:00:00.000Z",
+    ]
+    for _, posts in rounds:
+        assert {p["platform"] for p in posts} == {"linkedin", "x", "threads"}
+        assert len({p["variant"] for p in posts}) > 1
+    per_platform = Counter((p["platform"], p["variant"]) for _, posts in rounds for p in posts)
+    assert set(per_platform.values()) == {1} and len(per_platform) == 9
+    first = rounds[0][1][0]
+    assert first["content"] == f"{first['variant']} on {first['platform']}"
+
+
+@pytest.mark.asyncio
+async def test_distribute_skips_repurposing_and_variants_are_scored(tmp_path):
+    pipeline = LeadgenPipeline("sonnet", str(tmp_path / "blog"), variants=2)
+    post = {"title": "T", "body": "b", "variants": [{"id": k, **_variant(k)} for k in "ab"]}
+    distributor = AsyncMock()
+    distributor.get_integrations.return_value = [
+        {"id": "1", "providerIdentifier": "linkedin"}, {"id": "2", "providerIdentifier": "x"},
+    ]
+    with patch.object(pipeline.generator, "repurpose_to_social", new_callable=AsyncMock) as repurpose:
+        scheduled = await pipeline.distribute(post, distributor, "2026-10-20T09:00:00.000Z")
+    repurpose.assert_not_awaited()
+    assert distributor.schedule_post.await_count == 2
+    assert len(scheduled) == 4
+
+    with AnalyticsStore(tmp_path / "analytics.db") as store:
+        store.set_variants("t", [(f"postiz:{s['platform']}", s["date"][:10], s["variant"]) for s in scheduled])
+        store.set_daily("postiz:linkedin", [("2026-10-20", "", "impressions", 90), ("2026-10-21", "", "impressions", 30)])
+        store.set_daily("postiz:x", [("2026-10-20", "", "impressions", 10), ("2026-10-21", "", "impressions", 50)])
+        rows = store.variant_totals(days=30, today=date(2026, 10, 21))
+    assert [(r["variant"], r["impressions"], r["slots"]) for r in rows] == [("a", 140, 2), ("b", 40, 2)]